@@ -1,9 +1,21 @@
 import logging
 from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Iterable, Iterator
+
+from MathGenerator.history import HistoryIndex
+from MathGenerator.unique import HashIndex, BitsetIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bounds of the number of exercises drawn at once by generate_unique: rejected duplicates cost few calls
+# of generate, and a level running out of exercises is noticed without drawing the whole amount again
+UNIQUE_MIN_BATCH, UNIQUE_MAX_BATCH = 256, 10_000
+# Rounds of generate_unique without a new exercise, after which the level is considered exhausted.
+# Used only by factories which do not know their capacity, or with indexes which are not exact.
+UNIQUE_ATTEMPTS = 10
+
 
 class ExerciseFactory(ABC):
 
@@ -18,3 +30,132 @@ class ExerciseFactory(ABC):
     @abstractmethod
     def solve(self, exercises: list):
         pass
+
+    def canonical_form(self, exercise) -> str:
+        """
+        Key of exercise independent of its notation, e.g. of the order of terms.
+        Exercises with the same key have the same solution, see MathGenerator.cache.
+        By default it is the text of exercise.
+        """
+        return str(exercise)
+
+    def capacity(self, level: int, **kwargs) -> int | None:
+        """
+        Number of distinct exercises generate can return for the level, None if it is not known.
+        Keyword arguments are the ones passed to generate.
+        """
+        return None
+
+    def unique_index(self, level: int, amount: int, **kwargs) -> HashIndex | BitsetIndex:
+        """Index of exercises already generated, used by generate_unique. Texts are kept in a set by default."""
+        return HashIndex()
+
+    def _check_capacity(self, level: int, amount: int, taken: int = 0, **kwargs) -> int | None:
+        capacity = self.capacity(level, **kwargs)
+        if capacity is not None and taken + amount > capacity:
+            raise ValueError(f"Level {level} of {self.__class__.__name__} has only {capacity} distinct exercises, "
+                             f"{taken + amount} requested")
+        return capacity
+
+    def generate_unique(self, level: int, amount: int, index: HashIndex | BitsetIndex | HistoryIndex | None = None,
+                        **kwargs) -> list:
+        """
+        Generates amount exercises different from each other and from the ones already in index,
+        so none of them collapses in the dictionary returned by solve. Keyword arguments are passed to generate.
+
+        Raises ValueError at once when the level has fewer distinct exercises than requested,
+        or, for factories not knowing their capacity, when no new exercise comes up for UNIQUE_ATTEMPTS rounds.
+        Index may be kept between calls, e.g. a MathGenerator.history index of exercises handed out before.
+        """
+        index = self.unique_index(level, amount, **kwargs) if index is None else index
+        capacity = self._check_capacity(level, amount, len(index), **kwargs)
+
+        exercises, stalled = [], 0
+        while len(exercises) < amount:
+            missing = amount - len(exercises)
+            size = min(max(missing, UNIQUE_MIN_BATCH), UNIQUE_MAX_BATCH)
+            candidates = self._generate_candidates(level=level, amount=size, **kwargs)
+            added = [exercise for exercise, fresh in zip(candidates, index.add(candidates, limit=missing)) if fresh]
+            exercises.extend(added)
+
+            # Known capacity guarantees that the remaining exercises exist, unless index has false positives
+            stalled = 0 if added else stalled + 1
+            if (capacity is None or not index.exact) and stalled == UNIQUE_ATTEMPTS:
+                raise ValueError(f"No new exercise of level {level} of {self.__class__.__name__} found in "
+                                 f"{UNIQUE_ATTEMPTS} rounds, only {len(index)} distinct exercises generated")
+        return exercises
+
+    def _generate_candidates(self, level: int, amount: int, **kwargs) -> list:
+        """Exercises checked by generate_unique, factories may draw them faster than generate does."""
+        return self.generate(level=level, amount=amount, **kwargs)
+
+    def iter_generate(self, level: int, chunk_size: int = 10_000, amount: int | None = None,
+                      unique: bool = False, index: HashIndex | BitsetIndex | HistoryIndex | None = None,
+                      **kwargs) -> Iterator[list]:
+        """
+        Yields generated exercises in chunks of at most chunk_size, so only one chunk
+        is kept in memory. Generation is endless when amount is not given.
+        With unique, no exercise is repeated in any of the chunks, see generate_unique.
+        Given index (e.g. a history of exercises) implies unique.
+        Keyword arguments are passed to generate.
+        """
+        unique = unique or index is not None
+        if unique:
+            self._check_capacity(level, amount or 0, 0 if index is None else len(index), **kwargs)
+            index = self.unique_index(level, amount or chunk_size, **kwargs) if index is None else index
+
+        remaining = amount
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            if unique:
+                yield self.generate_unique(level=level, amount=size, index=index, **kwargs)
+            else:
+                yield self.generate(level=level, amount=size, **kwargs)
+            if remaining is not None:
+                remaining -= size
+
+    def iter_solve(self, exercises: Iterable, chunk_size: int = 10_000) -> Iterator[dict]:
+        """
+        Consumes exercises from any iterable (also an endless one) and yields
+        solutions of every chunk_size exercises, as returned by solve.
+        """
+        iterator = iter(exercises)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield self.solve(chunk)
+
+
+class ExerciseRecord(ABC):
+    """
+    Compact representation of a single exercise, carrying its numbers and operator
+    instead of text. Factories return records from generate(..., structured=True)
+    and consume them in solve without parsing. Text is rendered lazily on first str().
+    """
+    __slots__ = ('_text',)
+
+    def __init__(self):
+        self._text = None
+
+    @property
+    @abstractmethod
+    def fields(self) -> tuple:
+        """Numbers and operator which identify the exercise."""
+        pass
+
+    @abstractmethod
+    def render(self) -> str:
+        """Renders the exercise in the same format as string exercises."""
+        pass
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.render()
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.fields == other.fields
+
+    def __hash__(self) -> int:
+        return hash((self.__class__.__name__, self.fields))
@@ -1,7 +1,19 @@
 import random
-import re
 
-from MathGenerator.abstracts import ExerciseFactory
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory, ExerciseRecord
+from MathGenerator.algebra import parser
+
+# Result of SingleLinearFactory.solve_batch, one row per exercise.
+# Relation is the code (index in parser.RELATIONS) of relation in 'x {relation} {x}'.
+SOLUTION_DTYPE = np.dtype([
+    ('identity', '?'),
+    ('no_solution', '?'),
+    ('x', 'f8'),
+    ('relation', 'i1'),
+])
+
 
 def format_terms(a, b, variable='x'):
     term_a = format_variable_term(a, variable)
@@ -31,32 +43,8 @@ def format_constant_term(b):
 
 
 def extract_coefficients(expression: str):
-    # Normalize expression by removing spaces and splitting at the relational operator
-    expression = expression.replace(' ', '')
-
-    # Enhanced regex to capture terms with x (including default coefficients) and constants
-    coeffs = re.findall(r'([+-]?\d*\.?\d*)x|([+-]?\d+\.?\d*)', expression)
-
-    a = 0
-    b = 0
-
-    # Aggregate coefficients for x and constant terms
-    found_x = False
-    for coeff_pair in coeffs:
-        if 'x' in expression and coeff_pair[0] != '':
-            if coeff_pair[0] == '-':
-                a -= 1
-            else:
-                a += float(coeff_pair[0])
-            found_x = True
-        if coeff_pair[1]:  # Constant term
-            b += float(coeff_pair[1])
-
-    # If 'x' is present in the expression but no coefficient has been assigned
-    if 'x' in expression and not found_x:
-        a = 1
-
-    return a, b
+    """Returns coefficients (a, b) of a single side of linear exercise: ax + b"""
+    return parser.coefficients(parser.parse_polynomial(expression), degree=1)
 
 
 def reverse_operator(operator):
@@ -72,6 +60,32 @@ def reverse_operator(operator):
     return operator
 
 
+def solution_string(solution) -> str:
+    """Renders a single row returned by SingleLinearFactory.solve_batch like solve does"""
+    if solution['identity']:
+        return 'identity (all x)'
+    if solution['no_solution']:
+        return 'no solution'
+    return f"x {parser.RELATIONS[solution['relation']]} {float(solution['x'])}"
+
+
+class LinearExercise(ExerciseRecord):
+    """Single linear exercise record: ax + b {operator} cx + d"""
+    __slots__ = ('a', 'b', 'c', 'd', 'operator')
+
+    def __init__(self, a, b, c, d, operator: str):
+        super().__init__()
+        self.a, self.b, self.c, self.d = a, b, c, d
+        self.operator = operator
+
+    @property
+    def fields(self) -> tuple:
+        return self.a, self.b, self.c, self.d, self.operator
+
+    def render(self) -> str:
+        return f"{format_terms(self.a, self.b)} {self.operator} {format_terms(self.c, self.d)}"
+
+
 class LinearFactory(ExerciseFactory):
     """Class for managing Linear exercises"""
 
@@ -88,20 +102,23 @@ class LinearFactory(ExerciseFactory):
 class SingleLinearFactory(LinearFactory):
     """Base class for generating and solving single linear equations and inequalities"""
 
-    number_generator = staticmethod(lambda x: random.randint(-x * 3, x * 3))
+    number_generator = staticmethod(lambda rng, x: rng.randint(-x * 3, x * 3))
 
-    def __init__(self, operator_symbol: str | None = None):
+    def __init__(self, operator_symbol: str | None = None, seed: int | None = None):
         super().__init__()
+        # Configuration only, generate and solve never modify instance state,
+        # so one instance can serve many threads at once
         self.operator = operator_symbol
         self.random_operator = True if self.operator is None else False
+        self.random = random.Random(seed)
 
     # TODO: Consider fractions for higher levels
 
-    def generate(self, level: int, amount: int):
+    def generate(self, level: int, amount: int, structured: bool = False):
         exercises = []
         for _ in range(amount):
-            self.operator = random.choice(['=', '>', '<', '>=', '<=']) if self.random_operator else self.operator
-            task_type = self._choose_task_type()
+            operator = self.random.choice(parser.RELATIONS) if self.random_operator else self.operator
+            task_type = self._choose_task_type(operator)
 
             if task_type == 'precise':
                 a, b, c, d = self._generate_precise(level)
@@ -112,101 +129,301 @@ class SingleLinearFactory(LinearFactory):
             else:
                 raise ValueError("Invalid task type")
 
-            exercises.append(f"{format_terms(a, b)} {self.operator} {format_terms(c, d)}")
+            exercise = LinearExercise(a, b, c, d, operator)
+            exercises.append(exercise if structured else exercise.render())
         return exercises
 
     def _generate_precise(self, level):
-        a = self.number_generator(level)
-        b = self.number_generator(level)
-        c = self.number_generator(level)
-        d = self.number_generator(level)
+        a = self.number_generator(self.random, level)
+        b = self.number_generator(self.random, level)
+        c = self.number_generator(self.random, level)
+        d = self.number_generator(self.random, level)
         while a == c:  # Avoid identity cases
-            c = self.number_generator(level)
+            c = self.number_generator(self.random, level)
         return a, b, c, d
 
     def _generate_identity(self, level):
-        a = self.number_generator(level)
-        b = self.number_generator(level)
+        a = self.number_generator(self.random, level)
+        b = self.number_generator(self.random, level)
         return a, b, a, b
 
     def _generate_no_solution(self, level):
-        a = self.number_generator(level)
-        b = self.number_generator(level)
+        a = self.number_generator(self.random, level)
+        b = self.number_generator(self.random, level)
         c = a
-        d = self.number_generator(level)
+        d = self.number_generator(self.random, level)
         while d == b:  # Ensure no solution
-            d = self.number_generator(level)
+            d = self.number_generator(self.random, level)
         return a, b, c, d
 
-    def _choose_task_type(self):
-        if self.operator == '=':
-            return random.choices(['precise', 'identity', 'no solution'], weights=[70, 10, 20])[0]
+    def _choose_task_type(self, operator):
+        if operator == '=':
+            return self.random.choices(['precise', 'identity', 'no solution'], weights=[70, 10, 20])[0]
         return 'precise'
 
+    def canonical_form(self, exercise: str | LinearExercise) -> str:
+        return parser.canonical_form(str(exercise))
+
     def solve(self, exercises):
         solutions = {}
         for exercise in exercises:
-            self.operator = re.search(r"(<=|>=|<|>|=)", exercise).group(0)
-            left_side, right_side = exercise.split(f" {self.operator} ")
+            if isinstance(exercise, LinearExercise):
+                operator = exercise.operator
+                a1, b1, a2, b2 = exercise.fields[:4]
+            else:
+                left_side, operator, right_side = parser.parse_exercise(exercise)
 
-            a1, b1 = extract_coefficients(left_side)
-            a2, b2 = extract_coefficients(right_side)
+                a1, b1 = parser.coefficients(left_side, degree=1)
+                a2, b2 = parser.coefficients(right_side, degree=1)
 
             a = a1 - a2
             b = b2 - b1
 
-            solutions[exercise] = self._solve_linear(a, b)
+            solutions[exercise] = self._solve_linear(a, b, operator)
         return solutions
 
-    def _solve_linear(self, a, b):
+    @staticmethod
+    def _solve_linear(a, b, operator):
         if a == 0:
             return 'identity (all x)' if b == 0 else 'no solution'
 
         x_solution = b / a if b / a != -0.0 else 0.0
-        operator = reverse_operator(self.operator) if a < 0 else self.operator
-        return f'x {operator} {x_solution}' if self.operator != '=' else f'x = {x_solution}'
+        solution_operator = reverse_operator(operator) if a < 0 else operator
+        return f'x {solution_operator} {x_solution}' if operator != '=' else f'x = {x_solution}'
+
+    def parse_coefficients(self, exercises: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Converts exercises (strings or records) into a coefficients array of shape (n, 4)
+        with columns a, b, c, d of 'ax + b {relation} cx + d' and an array of relation codes.
+        """
+        coefficients = np.empty((len(exercises), 4))
+        relations = []
+        for row, exercise in enumerate(exercises):
+            if isinstance(exercise, LinearExercise):
+                coefficients[row] = exercise.fields[:4]
+                relations.append(exercise.operator)
+            else:
+                left_side, operator, right_side = parser.parse_exercise(exercise)
+                coefficients[row, :2] = parser.coefficients(left_side, degree=1)
+                coefficients[row, 2:] = parser.coefficients(right_side, degree=1)
+                relations.append(operator)
+        return coefficients, parser.relation_codes(relations)
+
+    def solve_batch(self, coefficients: np.ndarray | list, relations: np.ndarray | None = None) -> np.ndarray:
+        """
+        Vectorized solve. Takes coefficients array (n, 4) with relation codes, or a list
+        of exercises, and returns a SOLUTION_DTYPE array. Use solution_string to render rows.
+        """
+        if relations is None:
+            coefficients, relations = self.parse_coefficients(coefficients)
+        coefficients = np.asarray(coefficients, dtype=float)
+        relations = np.asarray(relations)
+
+        # Both sides are moved into 'ax {relation} b'
+        a = coefficients[:, 0] - coefficients[:, 2]
+        b = coefficients[:, 3] - coefficients[:, 1]
+        without_x = a == 0
+
+        solutions = np.empty(len(a), dtype=SOLUTION_DTYPE)
+        solutions['identity'] = without_x & (b == 0)
+        solutions['no_solution'] = without_x & (b != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Adding 0.0 turns -0.0 into 0.0
+            solutions['x'] = np.where(without_x, np.nan, b / a) + 0.0
+        # Dividing by negative a flips the relation
+        solutions['relation'] = np.where(a < 0, parser.REVERSED_RELATIONS[relations], relations)
+        return solutions
 
 
 class SingleLinearEquationFactory(SingleLinearFactory):
     """Class for generating and solving single linear equations"""
 
-    def __init__(self):
-        super().__init__(operator_symbol="=")
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol="=", seed=seed)
 
 
 class SingleLinearInequalityLessFactory(SingleLinearFactory):
     """Class for generating and solving single linear inequalities with 'less than' condition"""
 
-    def __init__(self):
-        super().__init__(operator_symbol="<")
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol="<", seed=seed)
 
 
 class SingleLinearInequalityGreaterFactory(SingleLinearFactory):
     """Class for generating and solving single linear inequalities with 'greater than' condition"""
 
-    def __init__(self):
-        super().__init__(operator_symbol=">")
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol=">", seed=seed)
 
 
 class SingleLinearEqualLessFactory(SingleLinearFactory):
     """Class for generating and solving single linear inequalities with 'greater than' condition"""
 
-    def __init__(self):
-        super().__init__(operator_symbol="<=")
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol="<=", seed=seed)
 
 
 class SingleLinearEqualGreaterFactory(SingleLinearFactory):
     """Class for generating and solving single linear inequalities with 'greater than' condition"""
 
-    def __init__(self):
-        super().__init__(operator_symbol=">=")
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol=">=", seed=seed)
+
+
+# Statuses of systems returned by LinearSystemFactory.solve_batch
+UNIQUE, INCONSISTENT, INFINITE = range(3)
+
+
+def system_variables(size: int) -> tuple:
+    """Names of unknowns: x, y, z, w for small systems, x1 ... xn for bigger ones"""
+    return ('x', 'y', 'z', 'w')[:size] if size <= 4 else tuple(f"x{i}" for i in range(1, size + 1))
+
+
+def format_equation(coefficients, constant, variables) -> str:
+    """Formats a single equation of system, e.g. '2x - y + 3z = 4'"""
+    terms = []
+    for coefficient, variable in zip(coefficients, variables):
+        term = format_variable_term(coefficient, variable)
+        if not term:
+            continue
+        if terms:
+            term = f"- {term[1:]}" if term.startswith('-') else f"+ {term}"
+        terms.append(term)
+    return f"{' '.join(terms) or '0'} = {constant}"
+
+
+class LinearSystemExercise(ExerciseRecord):
+    """System of linear equations record: matrix @ variables = constants"""
+    __slots__ = ('matrix', 'constants')
+
+    def __init__(self, matrix: tuple, constants: tuple):
+        super().__init__()
+        self.matrix = matrix
+        self.constants = constants
+
+    @property
+    def fields(self) -> tuple:
+        return self.matrix, self.constants
+
+    def render(self) -> str:
+        variables = system_variables(len(self.constants))
+        return ', '.join(format_equation(row, constant, variables)
+                         for row, constant in zip(self.matrix, self.constants))
 
 
 class LinearSystemFactory(LinearFactory):
-    """Class for generating and solving systems of linear equations"""
+    """
+    Class for generating and solving systems of linear equations.
 
-    def __init__(self):
+    Systems of `size` equations are built from a chosen integer solution as
+    A = P @ L @ U, where L is unit lower triangular and U upper triangular with
+    +-1 on diagonal, so det(A) = +-1 and every system is uniquely solvable.
+    Exercises look like '2x - y = 3, x + y = 3'.
+    """
+
+    def __init__(self, size: int = 2, seed: int | None = None):
         super().__init__()
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+
+    def generate_systems(self, level: int, amount: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Generates a batch of systems at once. Returns matrices (amount, size, size),
+        constants (amount, size) and the integer solutions (amount, size).
+        """
+        n = self.size
+        # Entries of triangular factors grow with level, solutions as in single linear exercises
+        lower = np.tril(self.rng.integers(-level, level, size=(amount, n, n), endpoint=True), k=-1)
+        lower += np.eye(n, dtype=int)
+        upper = np.triu(self.rng.integers(-level, level, size=(amount, n, n), endpoint=True), k=1)
+        upper += np.eye(n, dtype=int) * self.rng.choice([-1, 1], size=(amount, n, 1))
+        matrices = lower @ upper
+
+        # Shuffle equations, so the first one is not always the simplest
+        order = np.argsort(self.rng.random((amount, n)), axis=1)
+        matrices = np.take_along_axis(matrices, order[:, :, None], axis=1)
+
+        solutions = self.rng.integers(-3 * level, 3 * level, size=(amount, n), endpoint=True)
+        constants = (matrices @ solutions[:, :, None])[:, :, 0]
+        return matrices, constants, solutions
+
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
+        matrices, constants, _ = self.generate_systems(level=level, amount=amount)
+        exercises = [LinearSystemExercise(tuple(map(tuple, matrix)), tuple(constant))
+                     for matrix, constant in zip(matrices.tolist(), constants.tolist())]
+        return exercises if structured else [exercise.render() for exercise in exercises]
+
+    def parse_systems(self, exercises: list) -> tuple[np.ndarray, np.ndarray]:
+        """Converts exercises (strings or records) of this factory's size into matrices and constants."""
+        matrices = np.zeros((len(exercises), self.size, self.size))
+        constants = np.zeros((len(exercises), self.size))
+        variables = {variable: column for column, variable in enumerate(system_variables(self.size))}
+
+        for index, exercise in enumerate(exercises):
+            if isinstance(exercise, LinearSystemExercise):
+                matrices[index], constants[index] = exercise.matrix, exercise.constants
+                continue
+            equations = exercise.split(', ')
+            if len(equations) != self.size:
+                raise ValueError(f"Invalid linear system format: {exercise}")
+            try:
+                for row, equation in enumerate(equations):
+                    left_side, _, right_side = equation.replace(' ', '').partition('=')
+                    constants[index, row] = float(right_side)
+                    for term in left_side.replace('-', '+-').split('+'):
+                        if not term:
+                            continue
+                        # Coefficient ends where name of variable starts, terms without variable are constants
+                        start = next((i for i, char in enumerate(term) if char.isalpha()), len(term))
+                        if start == len(term):
+                            constants[index, row] -= float(term)
+                            continue
+                        if term[start:] not in variables:
+                            raise ValueError(f"Unknown variable {term[start:]!r}")
+                        number = term[:start]
+                        coefficient = 1.0 if number == '' else -1.0 if number == '-' else float(number)
+                        matrices[index, row, variables[term[start:]]] += coefficient
+            except ValueError:
+                raise ValueError(f"Invalid linear system format: {exercise}")
+        return matrices, constants
+
+    @staticmethod
+    def solve_batch(matrices: np.ndarray, constants: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Solves stacked systems with a single numpy.linalg.solve call.
+        Returns solutions (NaN rows for singular systems) and statuses:
+        UNIQUE, INCONSISTENT or INFINITE (many solutions).
+        """
+        matrices = np.asarray(matrices, dtype=float)
+        constants = np.asarray(constants, dtype=float)
+        solutions = np.full(constants.shape, np.nan)
+        statuses = np.full(len(constants), UNIQUE, dtype=np.int8)
+
+        # Determinant (LU) is much cheaper than rank (SVD), which is left for singular systems only
+        scale = np.abs(matrices).max(axis=(1, 2), initial=0) ** constants.shape[1]
+        regular = np.abs(np.linalg.det(matrices)) > 1e-9 * scale
+        solutions[regular] = np.round(np.linalg.solve(matrices[regular], constants[regular][:, :, None])[:, :, 0], 5)
+        solutions[regular] += 0.0
+
+        # Singular system has solutions only if constants do not increase the rank
+        singular = np.flatnonzero(~regular)
+        if len(singular):
+            augmented = np.concatenate((matrices[singular], constants[singular][:, :, None]), axis=2)
+            consistent = np.linalg.matrix_rank(augmented) == np.linalg.matrix_rank(matrices[singular])
+            statuses[singular] = np.where(consistent, INFINITE, INCONSISTENT)
+        return solutions, statuses
+
+    def solve(self, exercises: list) -> dict:
+        solutions, statuses = self.solve_batch(*self.parse_systems(exercises))
+        variables = system_variables(self.size)
+
+        results = {}
+        for exercise, solution, status in zip(exercises, solutions.tolist(), statuses.tolist()):
+            if status == UNIQUE:
+                results[exercise] = dict(zip(variables, solution))
+            else:
+                results[exercise] = 'no solution' if status == INCONSISTENT else 'infinitely many solutions'
+        return results
 
 
 class LinearFunctionFactory(LinearFactory):
@@ -222,3 +439,8 @@ if __name__ == "__main__":
     sol = factory.solve(exe)
     print(f"Exercises: {exe}")
     print(f"Sol: {sol}")
+
+    factory = LinearSystemFactory(size=3)
+    exe = factory.generate(level=2, amount=3)
+    print(f"Systems: {exe}")
+    print(f"Sol: {factory.solve(exe)}")
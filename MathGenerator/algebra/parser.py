@@ -0,0 +1,127 @@
+"""
+Single-pass tokenizer and parser for polynomial exercises like '2x^2 - 3x + 1.5 >= x - 4'.
+
+Shared by linear and quadratic factories and by PDFGenerator.utils, so an exercise
+string is scanned once and the cached result is reused everywhere.
+"""
+from functools import lru_cache
+from itertools import repeat
+from typing import Tuple
+
+import numpy as np
+
+Number = int | float
+Polynomial = Tuple[Number, ...]
+
+# Relations of exercises, batch solvers refer to them by index in this tuple
+RELATIONS = ('=', '>', '<', '>=', '<=')
+EQUAL, GREATER, LESS, GREATER_EQUAL, LESS_EQUAL = range(len(RELATIONS))
+# Relation code after multiplying both sides by -1, e.g. '<' -> '>'
+REVERSED_RELATIONS = np.array([EQUAL, LESS, GREATER, LESS_EQUAL, GREATER_EQUAL], dtype=np.int8)
+# Checked in this order, so that '<=' is not taken for '<'
+_RELATIONS_SEARCH_ORDER = ('<=', '>=', '<', '>', '=')
+
+
+@lru_cache(maxsize=2 ** 16)
+def parse_exercise(exercise: str) -> Tuple[Polynomial, str | None, Polynomial]:
+    """
+    Parses exercise into (left, relation, right), where sides are tuples of
+    coefficients indexed by degree, e.g. '3x^2 - x + 2 < 5' -> ((2, -1, 3), '<', (5,)).
+    Relation and right side are (None, ()) for a bare expression.
+    Integer literals stay int, decimal ones are float.
+    """
+    # Tokenizing relies on str methods only, which run in C without building match objects
+    compact = exercise.replace(' ', '')
+    for relation in _RELATIONS_SEARCH_ORDER:
+        if relation in compact:
+            left, _, right = compact.partition(relation)
+            return _parse_side(left, exercise), relation, _parse_side(right, exercise)
+    return _parse_side(compact, exercise), None, ()
+
+
+def _parse_side(side: str, exercise: str) -> Polynomial:
+    terms = {}
+    sign = 1
+    # Every term starts with its own sign, '3x-2+-1' -> ['3x', '-2', '', '-1']
+    for term in side.replace('-', '+-').split('+'):
+        if not term:
+            continue
+        if term == '-':
+            # Repeated signs like '- -8' are multiplied
+            sign = -sign
+            continue
+
+        number, variable, power = term.partition('x')
+        if not variable:
+            degree = 0
+        elif not power:
+            degree = 1
+        elif power[0] == '^' and power[1:].isdigit():
+            degree = int(power[1:])
+        else:
+            raise ValueError(f"Invalid term {term!r} in expression: {exercise}")
+
+        if number == '':
+            coefficient = sign
+        elif number == '-':
+            coefficient = -sign
+        else:
+            try:
+                coefficient = sign * (float(number) if '.' in number else int(number))
+            except ValueError:
+                raise ValueError(f"Invalid term {term!r} in expression: {exercise}") from None
+
+        terms[degree] = terms.get(degree, 0) + coefficient
+        sign = 1
+
+    if sign != 1:
+        raise ValueError(f"Sign without term in expression: {exercise}")
+    return _to_polynomial(terms)
+
+
+def _to_polynomial(terms: dict) -> Polynomial:
+    size = max(terms, default=0) + 1
+    return tuple(map(terms.get, range(size), repeat(0, size)))
+
+
+def canonical_form(exercise: str) -> str:
+    """
+    Text of parsed exercise, the same for every order of terms and spacing,
+    e.g. '3 + 2x = 5' and '2x + 3 = 5' -> '3.0,2.0 = 5.0'.
+    """
+    left, relation, right = parse_exercise(exercise)
+    sides = (','.join(repr(float(coefficient)) for coefficient in side) for side in (left, right))
+    return f" {relation} ".join(sides) if relation is not None else next(sides)
+
+
+def relation_codes(relations) -> np.ndarray:
+    """Converts relation symbols into their indices in RELATIONS."""
+    return np.array([RELATIONS.index(relation) for relation in relations], dtype=np.int8)
+
+
+def parse_polynomial(expression: str) -> Polynomial:
+    """Parses a single side of exercise into coefficients indexed by degree."""
+    left, relation, _ = parse_exercise(expression)
+    if relation is not None:
+        raise ValueError(f"Expected expression without relation: {expression}")
+    return left
+
+
+def coefficients(polynomial: Polynomial, degree: int) -> Polynomial:
+    """Returns coefficients from the highest degree down to constant term, padded with zeros."""
+    if len(polynomial) > degree + 1 and any(polynomial[degree + 1:]):
+        raise ValueError(f"Polynomial of degree higher than {degree}: {polynomial}")
+    padded = polynomial[:degree + 1] + (0,) * (degree + 1 - len(polynomial))
+    return padded[::-1]
+
+
+def subtract(left: Polynomial, right: Polynomial) -> Polynomial:
+    """Moves right side of exercise to the left one: left - right."""
+    size = max(len(left), len(right))
+    left, right = left + (0,) * (size - len(left)), right + (0,) * (size - len(right))
+    return tuple(a - b for a, b in zip(left, right))
+
+
+if __name__ == "__main__":
+    print(parse_exercise('-2x^2 + 10x + -8 = 0'))
+    print(parse_exercise('3x + 1 <= 2x - 2'))
@@ -0,0 +1,195 @@
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory, ExerciseRecord
+from MathGenerator.algebra import parser
+
+# Root of multiplicity k is split into eigenvalues scattered by about eps ** (1 / k),
+# so eigenvalues closer than ROOT_TOLERANCE * eps ** (1 / degree) make a single root.
+ROOT_TOLERANCE = 10
+
+
+def format_polynomial(coefficients: tuple) -> str:
+    """Formats coefficients (highest degree first), e.g. (1, 0, -2, 3) -> 'x^3 - 2x + 3'"""
+    degree = len(coefficients) - 1
+    terms = []
+    for power, coefficient in zip(range(degree, -1, -1), coefficients):
+        if coefficient == 0:
+            continue
+        variable = '' if power == 0 else 'x' if power == 1 else f'x^{power}'
+        value = abs(coefficient)
+        number = str(value) if value != 1 or power == 0 else ''
+        if terms:
+            terms.append(f"{'-' if coefficient < 0 else '+'} {number}{variable}")
+        else:
+            terms.append(f"{'-' if coefficient < 0 else ''}{number}{variable}")
+    return ' '.join(terms) or '0'
+
+
+class PolynomialExercise(ExerciseRecord):
+    """Polynomial equation record: coefficients (highest degree first) of the left side = 0"""
+    __slots__ = ('coefficients',)
+
+    def __init__(self, coefficients: tuple):
+        super().__init__()
+        self.coefficients = coefficients
+
+    @property
+    def fields(self) -> tuple:
+        return self.coefficients
+
+    def render(self) -> str:
+        return f"{format_polynomial(self.coefficients)} = 0"
+
+
+class PolynomialFactory(ExerciseFactory):
+    """
+    Class for generating and solving polynomial equations of higher degree (cubic, quartic, ...).
+
+    Exercises are built from chosen integer roots, so their difficulty is set by level:
+    roots come from [-level, level] and the leading coefficient from [1, level // 2 + 1] with random sign.
+    Roots may repeat, which gives roots of higher multiplicity.
+    """
+    def __init__(self, degree: int = 3, seed: int | None = None):
+        super().__init__()
+        if degree < 1:
+            raise ValueError(f"Degree of polynomial must be positive, got {degree}")
+        self.degree = degree
+        self.rng = np.random.default_rng(seed)
+
+    def generate_coefficients(self, level: int, amount: int,
+                              real_roots: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generates a batch of polynomials, returns integer coefficients (amount, degree + 1)
+        and the real roots used to build them (amount, real_roots).
+
+        With real_roots smaller than degree, the remaining degree is made of quadratic
+        factors x^2 + px + q without real roots (p^2 < 4q).
+        """
+        if level < 1:
+            raise ValueError(f"Level of polynomial must be positive, got {level}")
+        real_roots = self.degree if real_roots is None else real_roots
+        if not 0 <= real_roots <= self.degree or (self.degree - real_roots) % 2:
+            raise ValueError(f"Polynomial of degree {self.degree} cannot have {real_roots} real roots")
+
+        roots = self.rng.integers(-level, level, size=(amount, real_roots), endpoint=True)
+        leading = self.rng.integers(1, level // 2 + 1, size=amount, endpoint=True)
+        leading *= self.rng.choice([-1, 1], size=amount)
+        coefficients = leading[:, None]
+
+        # Multiplying all polynomials of the batch by (x - root) at once
+        for root in roots.T:
+            coefficients = self._multiply(coefficients, np.column_stack((np.ones(amount, dtype=int), -root)))
+        for _ in range((self.degree - real_roots) // 2):
+            p = self.rng.integers(-level, level, size=amount, endpoint=True)
+            q = p ** 2 // 4 + self.rng.integers(1, level, size=amount, endpoint=True)
+            coefficients = self._multiply(coefficients, np.column_stack((np.ones(amount, dtype=int), p, q)))
+        return coefficients, roots
+
+    @staticmethod
+    def _multiply(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Row-wise product of polynomials given as coefficients arrays (highest degree first)."""
+        result = np.zeros((len(left), left.shape[1] + right.shape[1] - 1), dtype=left.dtype)
+        for shift in range(right.shape[1]):
+            result[:, shift:shift + left.shape[1]] += left * right[:, shift:shift + 1]
+        return result
+
+    def generate(self, level: int, amount: int, structured: bool = False,
+                 real_roots: int | None = None) -> list[str | PolynomialExercise]:
+        coefficients, _ = self.generate_coefficients(level=level, amount=amount, real_roots=real_roots)
+        exercises = [PolynomialExercise(tuple(row)) for row in coefficients.tolist()]
+        return exercises if structured else [exercise.render() for exercise in exercises]
+
+    def parse_coefficients(self, exercises: list) -> np.ndarray:
+        """Converts exercises (strings or records) into coefficients array (n, degree + 1)."""
+        coefficients = np.empty((len(exercises), self.degree + 1))
+        for row, exercise in enumerate(exercises):
+            if isinstance(exercise, PolynomialExercise):
+                coefficients[row] = exercise.coefficients
+                continue
+            left, _, right = parser.parse_exercise(exercise)
+            try:
+                coefficients[row] = parser.coefficients(parser.subtract(left, right), self.degree)
+            except ValueError:
+                raise ValueError(f"Invalid polynomial equation format: {exercise}")
+            if coefficients[row, 0] == 0:
+                raise ValueError(f"Not a polynomial of degree {self.degree}: {exercise}")
+        return coefficients
+
+    def solve_batch(self, coefficients: np.ndarray | list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized solve. Takes coefficients array (n, degree + 1) or a list of exercises.
+        Roots of all polynomials are eigenvalues of their stacked companion matrices,
+        computed by a single numpy.linalg.eigvals call.
+
+        Returns distinct real roots (n, degree) in ascending order padded with NaN,
+        and their multiplicities (n, degree) padded with 0.
+        """
+        if not isinstance(coefficients, np.ndarray) or coefficients.dtype == object:
+            coefficients = self.parse_coefficients(coefficients)
+        coefficients = np.asarray(coefficients, dtype=float)
+        amount, degree = len(coefficients), coefficients.shape[1] - 1
+
+        # Companion matrix of monic polynomial, the same as numpy.roots builds for a single one
+        companion = np.zeros((amount, degree, degree))
+        companion[:, 0, :] = -coefficients[:, 1:] / coefficients[:, :1]
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+        eigenvalues = np.linalg.eigvals(companion) if amount else np.zeros((0, degree), dtype=complex)
+
+        # Every eigenvalue is labeled by the first one close to it. Errors of a multiple root
+        # cancel out, so the mean of its eigenvalues is accurate.
+        tolerance = ROOT_TOLERANCE * np.finfo(float).eps ** (1 / max(degree, 1))
+        scale = np.maximum(1, np.abs(eigenvalues))
+        close = np.abs(eigenvalues[:, :, None] - eigenvalues[:, None, :]) <= tolerance * scale[:, :, None]
+        labels = (np.argmax(close, axis=2) + degree * np.arange(amount)[:, None]).ravel()
+        counts = np.bincount(labels, minlength=amount * degree).reshape(amount, degree)
+        with np.errstate(invalid='ignore'):
+            sums = (np.bincount(labels, eigenvalues.real.ravel(), amount * degree)
+                    + 1j * np.bincount(labels, eigenvalues.imag.ravel(), amount * degree))
+            means = sums.reshape(amount, degree) / counts
+
+        real = (counts > 0) & (np.abs(means.imag) <= tolerance * np.maximum(1, np.abs(means.real)))
+        roots = np.where(real, np.round(means.real, 5) + 0.0, np.inf)
+        order = np.argsort(roots, axis=1, kind='stable')
+        roots = np.take_along_axis(roots, order, axis=1)
+        multiplicities = np.take_along_axis(np.where(real, counts, 0), order, axis=1)
+        roots[np.isinf(roots)] = np.nan
+        return roots, multiplicities
+
+    def canonical_form(self, exercise: str | PolynomialExercise) -> str:
+        return parser.canonical_form(str(exercise))
+
+    def solve(self, exercises: List[str | PolynomialExercise]) -> Dict[str, Dict[str, tuple | str]]:
+        roots, multiplicities = self.solve_batch(self.parse_coefficients(exercises))
+        solutions = {}
+        for exercise, row_roots, row_multiplicities in zip(exercises, roots.tolist(), multiplicities.tolist()):
+            found = [(root, multiplicity) for root, multiplicity in zip(row_roots, row_multiplicities) if multiplicity]
+            if found:
+                solutions[exercise] = {
+                    "roots": tuple(root for root, _ in found),
+                    "multiplicities": tuple(multiplicity for _, multiplicity in found),
+                }
+            else:
+                solutions[exercise] = {"roots": "No real roots, complex roots present", "multiplicities": ()}
+        return solutions
+
+
+class CubicFactory(PolynomialFactory):
+    """Cubic Equations"""
+    def __init__(self, seed: int | None = None):
+        super().__init__(degree=3, seed=seed)
+
+
+class QuarticFactory(PolynomialFactory):
+    """Quartic Equations"""
+    def __init__(self, seed: int | None = None):
+        super().__init__(degree=4, seed=seed)
+
+
+if __name__ == "__main__":
+    factory = QuarticFactory()
+    exe = factory.generate(level=3, amount=10)
+    sol = factory.solve(exercises=exe)
+    print(f"exercises: {exe}")
+    print(f"solutions: {sol}")
@@ -1,68 +1,152 @@
-import math
 import random
-import re
 from typing import List, Dict, Union, Tuple
 
-from MathGenerator.abstracts import ExerciseFactory
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory, ExerciseRecord
+from MathGenerator.algebra import parser, tables
+
+
+# Kinds of solution sets of QuadraticFactory.solve_batch, between x1 and x2 or outside of them
+EMPTY, ALL, POINTS, BETWEEN, OUTSIDE, ALL_EXCEPT_POINT = range(6)
+
+# Result of QuadraticFactory.solve_batch, one row per exercise.
+# Roots are sorted (x1 <= x2), missing ones are NaN. Direction is 1 (up) or -1 (down).
+SOLUTION_DTYPE = np.dtype([
+    ('delta', 'f8'),
+    ('roots', 'i1'),
+    ('x1', 'f8'),
+    ('x2', 'f8'),
+    ('direction', 'i1'),
+    ('solution_set', 'i1'),
+    ('closed', '?'),
+])
+
+
+def solution_set_string(solution) -> str:
+    """Renders solution set of a single row returned by QuadraticFactory.solve_batch"""
+    kind, x1, x2 = solution['solution_set'], round(float(solution['x1']), 5), round(float(solution['x2']), 5)
+    less, greater = ('<=', '>=') if solution['closed'] else ('<', '>')
+    if kind == EMPTY:
+        return 'no solution'
+    if kind == ALL:
+        return 'all x'
+    if kind == POINTS:
+        return f'x = {x1}' if solution['roots'] == 1 else f'x = {x1} or x = {x2}'
+    if kind == BETWEEN:
+        return f'{x1} {less} x {less} {x2}'
+    if kind == OUTSIDE:
+        return f'x {less} {x1} or x {greater} {x2}'
+    return f'x != {x1}'
+
+
+class QuadraticExercise(ExerciseRecord):
+    """Quadratic exercise record: ax^2 + bx + c {operator} 0"""
+    __slots__ = ('a', 'b', 'c', 'operator')
+
+    def __init__(self, a, b, c, operator: str):
+        super().__init__()
+        self.a, self.b, self.c = a, b, c
+        self.operator = operator
+
+    @property
+    def fields(self) -> tuple:
+        return self.a, self.b, self.c, self.operator
+
+    @property
+    def coefficients(self) -> Tuple[float, float, float]:
+        return self.a, self.b, self.c
+
+    def render(self, number_format=str) -> str:
+        """Renders the exercise, number_format allows e.g. fractions instead of decimal constant term"""
+        a, b, c = self.coefficients
+        a_str = f"{'-' if a == -1 else '' if a == 1 else a}x^2"
+        b_str = f" + {b}x" if b >= 0 else f" - {-b}x"
+        c_str = f" + {number_format(c)}" if c >= 0 else f" - {number_format(-c)}"
+        return f"{a_str}{b_str}{c_str} {self.operator} 0"
 
 
 class QuadraticFactory(ExerciseFactory):
     """Class for managing Quadratic exercises"""
-    def __init__(self, operator_symbol: str | None = None):
+    def __init__(self, operator_symbol: str | None = None, seed: int | None = None):
         super().__init__()
+        # Configuration only, generate and solve never modify instance state
         self.operator = operator_symbol
         self.random_operator = self.operator is None
+        self.random = random.Random(seed)
+
+    def generate(self, level: int, amount: int, structured: bool = False,
+                 roots: str | None = None) -> list[str | QuadraticExercise]:
+        """
+        Generates quadratic exercises. With roots='integer' or roots='rational' only
+        exercises with such roots are drawn, see tables.roots_table.
+        """
+        if roots is not None and roots not in tables.ROOT_KINDS:
+            raise ValueError(f"Unknown kind of roots: {roots}, expected one of {tables.ROOT_KINDS}")
+        if roots is None:
+            exercises = [self._generate_single_exercise(level) for _ in range(amount)]
+        else:
+            exercises = [self._generate_nice_exercise(level, roots) for _ in range(amount)]
+        return exercises if structured else [exercise.render() for exercise in exercises]
 
-    def generate(self, level: int, amount: int) -> list[str]:
-        return [self._generate_single_exercise(level) for _ in range(amount)]
-
-    def _generate_single_exercise(self, level: int) -> str:
+    def _generate_single_exercise(self, level: int) -> QuadraticExercise:
         operator = self._choose_operator()
         a = self._generate_a(level)
         b = self._generate_b(level)
         delta = self._generate_delta(level)
         c = self._calculate_c(a, b, delta)
-        return self._format_equation(a, b, c, operator)
+        return QuadraticExercise(a, b, c, operator)
+
+    def _generate_nice_exercise(self, level: int, roots: str) -> QuadraticExercise:
+        if roots == 'rational':
+            # Every a, b and square delta give rational roots, so they are drawn directly
+            a, b, s = self._generate_a(level), self._generate_b(level), self.random.randint(0, level + 2)
+        else:
+            table = tables.roots_table(level)
+            a, b, s = table[self.random.randrange(len(table))].tolist()
+        return QuadraticExercise(a, b, self._calculate_c(a, b, s ** 2), self._choose_operator())
 
     def _choose_operator(self) -> str:
-        return random.choice(['=', '>', '<', '>=', '<=']) if self.random_operator else self.operator
+        return self.random.choice(parser.RELATIONS) if self.random_operator else self.operator
 
-    @staticmethod
-    def _generate_a(level: int) -> int:
+    def _generate_a(self, level: int) -> int:
         a = 0
         while a == 0:
-            a = random.randint(-level, level)
+            a = self.random.randint(-level, level)
         return a
 
-    @staticmethod
-    def _generate_b(level: int) -> int:
-        return random.randint(-3 * level, 3 * level)
+    def _generate_b(self, level: int) -> int:
+        return self.random.randint(-3 * level, 3 * level)
 
-    @staticmethod
-    def _generate_delta(level: int) -> int:
+    def _generate_delta(self, level: int) -> int:
         if level >= 5:
-            return random.choice([d for d in range(1, level ** 2 + 1) if int(math.sqrt(d)) ** 2 != d])
-        delta = random.choice([d ** 2 for d in range(level, level + 3)])
-        if random.choice([True, False]):
-            delta *= -1 if random.choice([True, False]) else 0
+            # Table is built once per level, so a draw is O(1)
+            return self.random.choice(tables.delta_table(level))
+        delta = self.random.choice([d ** 2 for d in range(level, level + 3)])
+        if self.random.choice([True, False]):
+            delta *= -1 if self.random.choice([True, False]) else 0
         return delta
 
     @staticmethod
     def _calculate_c(a: int, b: int, delta: int) -> float:
-        return (b ** 2 - delta) / (4 * a)
+        # Adding 0.0 turns -0.0 into 0.0, which would be rendered as '+ -0.0'
+        return (b ** 2 - delta) / (4 * a) + 0.0
 
     @staticmethod
     def _format_equation(a: int, b: int, c: float, operator: str) -> str:
-        a_str = f"{'-' if a == -1 else '' if a == 1 else a}x^2"
-        b_str = f" + {b}x" if b >= 0 else f" - {-b}x"
-        c_str = f" + {c}" if c >= 0 else f" - {-c}"
-        return f"{a_str}{b_str}{c_str} {operator} 0"
+        return QuadraticExercise(a, b, c, operator).render()
+
+    def canonical_form(self, exercise: str | QuadraticExercise) -> str:
+        return parser.canonical_form(str(exercise))
 
-    def solve(self, exercises: List[str]) -> Dict[str, Dict[str, Union[Tuple, str, float]]]:
+    def solve(self, exercises: List[str | QuadraticExercise]) -> Dict[str, Dict[str, Union[Tuple, str, float]]]:
         solutions = {}
         for exercise in exercises:
             try:
-                a, b, c = self._extract_coefficients(exercise)
+                if isinstance(exercise, QuadraticExercise):
+                    a, b, c = exercise.coefficients
+                else:
+                    a, b, c = self._extract_coefficients(exercise)
                 delta = self._calculate_delta(a, b, c)
                 roots = self._calculate_roots(a, b, delta)
                 parabola_direction = "up" if a > 0 else "down"
@@ -78,28 +162,18 @@ class QuadraticFactory(ExerciseFactory):
         return solutions
 
     def _extract_coefficients(self, exercise: str) -> Tuple[float, float, float]:
-        clean_exercise = exercise.replace(" ", "").replace(f"{self.operator}0", "")
-        coeffs = re.findall(r'(-?\d*\.?\d+|[-+]?)x\^2|(-?\d*\.?\d+|[-+]?)x|(-?\d*\.?\d+)', clean_exercise)
-
-        if len(coeffs) != 3:
+        # Operator is read from the exercise itself, factory configuration is not needed
+        left, _, right = parser.parse_exercise(exercise)
+        try:
+            a, b, c = (float(coefficient) for coefficient in parser.coefficients(parser.subtract(left, right), 2))
+        except ValueError:
             raise ValueError(f"Invalid quadratic equation format: {exercise}")
 
-        a = self._parse_coefficient(coeffs[0][0])
-        b = self._parse_coefficient(coeffs[1][1])
-        c = float(coeffs[2][2]) if coeffs[2][2] else 0.0
-
         if a == 0:
             raise ValueError(f"Not a quadratic equation (a=0): {exercise}")
 
         return a, b, c
 
-    def _parse_coefficient(self, value: str) -> float:
-        if value in ['', '+']:
-            return 1.0
-        elif value == '-':
-            return -1.0
-        return float(value)
-
     def _calculate_delta(self, a: float, b: float, c: float) -> float:
         delta = b ** 2 - 4 * a * c
         return int(delta) if delta == int(delta) else delta
@@ -115,35 +189,96 @@ class QuadraticFactory(ExerciseFactory):
         else:
             return "No real roots, complex roots present"
 
+    def parse_coefficients(self, exercises: list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts exercises (strings or records) into a coefficients array of shape (n, 3)
+        with columns a, b, c and an array of relation codes (indices in parser.RELATIONS).
+        """
+        coefficients = np.empty((len(exercises), 3))
+        relations = []
+        for row, exercise in enumerate(exercises):
+            if isinstance(exercise, QuadraticExercise):
+                coefficients[row] = exercise.coefficients
+                relations.append(exercise.operator)
+            else:
+                coefficients[row] = self._extract_coefficients(exercise)
+                relations.append(parser.parse_exercise(exercise)[1])
+        return coefficients, parser.relation_codes(relations)
+
+    def solve_batch(self, coefficients: np.ndarray | list, relations: np.ndarray | None = None) -> np.ndarray:
+        """
+        Vectorized solve. Takes coefficients array (n, 3) with relation codes, or a list
+        of exercises, and returns a SOLUTION_DTYPE array with deltas, sorted roots,
+        parabola directions and solution sets of inequalities.
+        """
+        if relations is None:
+            coefficients, relations = self.parse_coefficients(coefficients)
+        a, b, c = np.asarray(coefficients, dtype=float).T
+        relations = np.asarray(relations)
+
+        solutions = np.zeros(len(a), dtype=SOLUTION_DTYPE)
+        delta = b ** 2 - 4 * a * c
+        # Float coefficients like c = 10.0357142857 leave tiny residues of zero delta
+        delta[np.isclose(delta, 0, rtol=0, atol=1e-9)] = 0.0
+        solutions['delta'] = delta
+        solutions['direction'] = np.where(a > 0, 1, -1)
+
+        root = np.sqrt(np.where(delta >= 0, delta, np.nan))
+        x1 = np.round((-b - root * np.sign(a)) / (2 * a), 5)
+        x2 = np.round((-b + root * np.sign(a)) / (2 * a), 5)
+        solutions['roots'] = np.select([delta > 0, delta == 0], [2, 1], 0)
+        solutions['x1'] = x1
+        solutions['x2'] = np.where(delta > 0, x2, np.nan)
+
+        # Inequality is multiplied by -1 for parabolas facing down, so only a > 0 is considered
+        relation = np.where(a > 0, relations, parser.REVERSED_RELATIONS[relations])
+        less = (relation == parser.LESS) | (relation == parser.LESS_EQUAL)
+        greater = (relation == parser.GREATER) | (relation == parser.GREATER_EQUAL)
+        positive, zero = delta > 0, delta == 0
+        solutions['solution_set'] = np.select(
+            [
+                (relation == parser.EQUAL) & (delta >= 0),
+                less & positive,
+                (relation == parser.LESS_EQUAL) & zero,
+                greater & positive,
+                (relation == parser.GREATER) & zero,
+                greater,
+            ],
+            [POINTS, BETWEEN, POINTS, OUTSIDE, ALL_EXCEPT_POINT, ALL],
+            EMPTY
+        )
+        solutions['closed'] = (relation != parser.LESS) & (relation != parser.GREATER)
+        return solutions
+
 
 class QuadraticEquationFactory(QuadraticFactory):
     """Quadratic Equations"""
-    def __init__(self):
-        super().__init__(operator_symbol='=')
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol='=', seed=seed)
 
 
 class QuadraticInequalityLessFactory(QuadraticFactory):
     """Quadratic Inequalities (less)"""
-    def __init__(self):
-        super().__init__(operator_symbol='<')
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol='<', seed=seed)
 
 
 class QuadraticInequalityGreaterFactory(QuadraticFactory):
     """Quadratic Inequalities (greater)"""
-    def __init__(self):
-        super().__init__(operator_symbol='>')
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol='>', seed=seed)
 
 
 class QuadraticEqualLessFactory(QuadraticFactory):
     """Quadratic Inequalities (less) or equal"""
-    def __init__(self):
-        super().__init__(operator_symbol='<=')
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol='<=', seed=seed)
 
 
 class QuadraticEqualGreaterFactory(QuadraticFactory):
     """Quadratic Inequalities (less) or equal"""
-    def __init__(self):
-        super().__init__(operator_symbol='>=')
+    def __init__(self, seed: int | None = None):
+        super().__init__(operator_symbol='>=', seed=seed)
 
 
 if __name__ == "__main__":
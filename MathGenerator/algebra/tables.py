@@ -0,0 +1,57 @@
+"""
+Precomputed per-level sampling tables for quadratic exercises.
+
+Tables are built once per level and cached in memory, so drawing an exercise is O(1)
+regardless of level. Set CACHE_DIR to also keep the (a, b, sqrt(delta)) tables of integer
+roots on disk between runs.
+"""
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Directory for tables saved on disk, None keeps them in memory only
+CACHE_DIR: str | None = None
+
+ROOT_KINDS = ('integer', 'rational')
+
+
+@lru_cache(maxsize=None)
+def delta_table(level: int) -> tuple:
+    """Positive non-square deltas up to level ** 2, used for levels >= 5."""
+    return tuple(d for d in range(1, level ** 2 + 1) if math.isqrt(d) ** 2 != d)
+
+
+@lru_cache(maxsize=None)
+def roots_table(level: int) -> np.ndarray:
+    """
+    All (a, b, s) combinations of the level which give integer roots (-b +- s) / 2a,
+    where delta = s ** 2. Coefficients keep the ranges of QuadraticFactory: a in [-level, level]
+    without 0, b in [-3 * level, 3 * level] and s in [0, level + 2].
+
+    Both roots are integers exactly when s is a multiple of |a| and b = s (mod 2|a|),
+    so only those pairs are listed for every a, about 10 * level ** 2 rows in total.
+    Rational roots need no table, every combination gives them.
+    """
+    path = os.path.join(CACHE_DIR, f"quadratic_integer_level{level}.npy") if CACHE_DIR else None
+    if path and os.path.exists(path):
+        return np.load(path)
+
+    rows = []
+    for a in range(-level, level + 1):
+        if a == 0:
+            continue
+        step = 2 * abs(a)
+        for s in range(0, level + 3, abs(a)):
+            # Smallest b of the range congruent to s
+            b = np.arange(-3 * level + (s + 3 * level) % step, 3 * level + 1, step)
+            rows.append(np.column_stack((np.full(len(b), a), b, np.full(len(b), s))))
+    table = np.concatenate(rows)
+    # Sorted by a, b and s, like the combinations are listed in the original table
+    table = table[np.lexsort(table.T[::-1])]
+
+    if path:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.save(path, table)
+    return table
@@ -0,0 +1,277 @@
+"""
+Mixed-operator arithmetic expressions like '(12 + 7) * 3 - 48 / 6'.
+
+Every expression is compiled once into a flat postfix Program: a tuple of opcodes
+and a tuple of constants pushed on the stack. Batches of Programs run together
+on a NumPy stack machine, one opcode of every Program per step.
+"""
+import itertools
+import operator
+import random
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory, ExerciseRecord
+from MathGenerator.arithmetic.factories import round_array
+
+PUSH, ADD, SUB, MUL, DIV, NEG, NOP = range(7)
+
+SYMBOLS = {ADD: '+', SUB: '-', MUL: '*', DIV: '/'}
+OPCODES = {symbol: opcode for opcode, symbol in SYMBOLS.items()}
+# Numbers and parenthesized expressions bind the strongest
+PRECEDENCE = {ADD: 1, SUB: 1, MUL: 2, DIV: 2, NEG: 3, PUSH: 4}
+
+# A token is either a number or any other single character, whitespace is skipped
+_TOKENS = re.compile(r'(\d+(?:\.\d*)?|\.\d+)|(\S)')
+
+_FUNCTIONS = {ADD: operator.add, SUB: operator.sub, MUL: operator.mul, DIV: operator.truediv}
+
+
+class Program(NamedTuple):
+    """Compiled expression: opcodes in postfix order and constants of PUSH opcodes"""
+    code: tuple
+    constants: tuple
+
+
+@lru_cache(maxsize=2 ** 16)
+def compile_expression(expression: str) -> Program:
+    """
+    Compiles expression into postfix Program with the shunting-yard algorithm,
+    e.g. '2 * (3 + 4)' -> Program((PUSH, PUSH, PUSH, ADD, MUL), (2, 3, 4)).
+    Integer literals stay int, decimal ones are float.
+    """
+    code, constants, pending = [], [], []
+    # Minus is unary at the start, after an operator and after '('
+    expect_operand = True
+
+    for number, char in _TOKENS.findall(expression):
+        if number:
+            if not expect_operand:
+                raise ValueError(f"Missing operator before {number!r} in expression: {expression}")
+            constants.append(float(number) if '.' in number else int(number))
+            code.append(PUSH)
+            expect_operand = False
+        elif char == '(':
+            if not expect_operand:
+                raise ValueError(f"Missing operator before '(' in expression: {expression}")
+            pending.append(char)
+        elif char == ')':
+            while pending and pending[-1] != '(':
+                code.append(pending.pop())
+            if not pending or expect_operand:
+                raise ValueError(f"Unbalanced parentheses in expression: {expression}")
+            pending.pop()
+        elif char in OPCODES:
+            opcode = NEG if expect_operand and char == '-' else OPCODES[char]
+            if expect_operand and opcode != NEG:
+                raise ValueError(f"Missing operand before {char!r} in expression: {expression}")
+            # Binary operators are left associative, unary minus is right associative
+            while (pending and pending[-1] != '(' and opcode != NEG
+                   and PRECEDENCE[pending[-1]] >= PRECEDENCE[opcode]):
+                code.append(pending.pop())
+            pending.append(opcode)
+            expect_operand = True
+        else:
+            raise ValueError(f"Invalid character {char!r} in expression: {expression}")
+
+    if expect_operand:
+        raise ValueError(f"Missing operand at the end of expression: {expression}")
+    while pending:
+        opcode = pending.pop()
+        if opcode == '(':
+            raise ValueError(f"Unbalanced parentheses in expression: {expression}")
+        code.append(opcode)
+    return Program(tuple(code), tuple(constants))
+
+
+def render(program: Program) -> str:
+    """Renders Program back into infix expression with the parentheses it needs."""
+    constants = iter(program.constants)
+    stack = []
+    for opcode in program.code:
+        if opcode == PUSH:
+            stack.append((str(next(constants)), PRECEDENCE[PUSH]))
+        elif opcode == NEG:
+            text, precedence = stack.pop()
+            stack.append((f"-{text}" if precedence >= PRECEDENCE[NEG] else f"-({text})", PRECEDENCE[NEG]))
+        else:
+            (right, right_precedence), (left, left_precedence) = stack.pop(), stack.pop()
+            precedence = PRECEDENCE[opcode]
+            # Right operand of the same precedence keeps its parentheses, so the order of evaluation is preserved
+            left = left if left_precedence >= precedence else f"({left})"
+            right = right if right_precedence > precedence else f"({right})"
+            stack.append((f"{left} {SYMBOLS[opcode]} {right}", precedence))
+    return stack[0][0]
+
+
+def evaluate(program: Program) -> float:
+    """Evaluates a single Program, NaN is returned for division by zero."""
+    constants = iter(program.constants)
+    stack = []
+    try:
+        for opcode in program.code:
+            if opcode == PUSH:
+                stack.append(next(constants))
+            elif opcode == NEG:
+                stack.append(-stack.pop())
+            else:
+                right = stack.pop()
+                stack.append(_FUNCTIONS[opcode](stack.pop(), right))
+    except ZeroDivisionError:
+        return float('nan')
+    return stack[0]
+
+
+def _stack_rows(rows: list, width: int, fill, dtype) -> np.ndarray:
+    """Stacks tuples into a 2-D array, padding shorter ones with fill."""
+    if all(len(row) == width for row in rows):
+        # Rows of the same length, typical for a generated worksheet, are read without copying tuples
+        values = np.fromiter(itertools.chain.from_iterable(rows), dtype=dtype, count=len(rows) * width)
+        return values.reshape(len(rows), width)
+    return np.array([row + (fill,) * (width - len(row)) for row in rows], dtype=dtype).reshape(len(rows), width)
+
+
+def evaluate_batch(programs: list) -> np.ndarray:
+    """
+    Evaluates many Programs at once on a stack machine working on all of them together:
+    the stack is a 2-D array with a stack pointer per Program, and every step executes
+    the current opcode of all Programs. NaN is returned for division by zero.
+
+    The stack holds float64, which loses integers above 2 ** 53 that evaluate keeps exact.
+    Programs which may reach them are evaluated again by evaluate, and the results are
+    then an array of Python objects instead of float64.
+    """
+    amount = len(programs)
+    length = max((len(program.code) for program in programs), default=0)
+    size = max((len(program.constants) for program in programs), default=0)
+    # Shorter Programs are padded with opcode doing nothing
+    codes = _stack_rows([program.code for program in programs], length, NOP, np.int8)
+    constants = _stack_rows([program.constants for program in programs], size, 0, float)
+
+    stack = np.zeros((amount, size + 1))
+    pointers = np.zeros(amount, dtype=np.intp)
+    pushed = np.zeros(amount, dtype=np.intp)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for opcodes in codes.T:
+            rows = np.flatnonzero(opcodes == PUSH)
+            stack[rows, pointers[rows]] = constants[rows, pushed[rows]]
+            pushed[rows] += 1
+            pointers[rows] += 1
+
+            rows = np.flatnonzero(opcodes == NEG)
+            stack[rows, pointers[rows] - 1] *= -1
+
+            rows = np.flatnonzero((opcodes >= ADD) & (opcodes <= DIV))
+            left, right = stack[rows, pointers[rows] - 2], stack[rows, pointers[rows] - 1]
+            operators = opcodes[rows]
+            stack[rows, pointers[rows] - 2] = np.select(
+                [operators == ADD, operators == SUB, operators == MUL],
+                [left + right, left - right, left * right],
+                left / right
+            )
+            pointers[rows] -= 1
+
+    results = stack[:, 0]
+    results[~np.isfinite(results)] = np.nan
+    # No value of a Program exceeds the product of max(2, |constant|) of its non-zero constants
+    bits = np.log2(np.maximum(2, np.abs(constants)), out=np.zeros_like(constants), where=constants != 0).sum(axis=1)
+    inexact = np.flatnonzero(bits > 53)
+    if len(inexact):
+        results = results.astype(object)
+        results[inexact] = [evaluate(programs[row]) for row in inexact.tolist()]
+    return results
+
+
+def round_results(results: np.ndarray, decimals: int) -> np.ndarray:
+    """Rounds results of evaluate_batch like the built-in round, also the exact ones of object arrays."""
+    if results.dtype == object:
+        return np.array([round(result, decimals) for result in results.tolist()], dtype=object)
+    return round_array(results, decimals)
+
+
+class ExpressionExercise(ExerciseRecord):
+    """Expression record holding its compiled Program, so it is solved without parsing"""
+    __slots__ = ('program',)
+
+    def __init__(self, program: Program):
+        super().__init__()
+        self.program = program
+
+    @property
+    def fields(self) -> tuple:
+        return self.program
+
+    def render(self) -> str:
+        return render(self.program)
+
+
+class ExpressionFactory(ExerciseFactory):
+    """
+    Class for generating and solving mixed-operator expressions with parentheses.
+
+    Level sets both the number of operands (level + 1) and their range (1 to 10 * level).
+    Divisors are single numbers from 1 to 9, so there is never division by zero.
+    """
+    # Rounding results to three decimal places, like DivisionFactory
+    result_format = staticmethod(lambda x: round(x, 3))
+    batch_result_format = staticmethod(lambda x: round_results(x, 3))
+
+    def __init__(self, operators: str = '+-*/', seed: int | None = None):
+        super().__init__()
+        self.operators = tuple(OPCODES[symbol] for symbol in operators)
+        self.random = random.Random(seed)
+
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
+        exercises = []
+        for _ in range(amount):
+            code, constants = [], []
+            self._generate_tree(level + 1, 10 * level, code, constants)
+            record = ExpressionExercise(Program(tuple(code), tuple(constants)))
+            exercises.append(record if structured else record.render())
+        return exercises
+
+    def _generate_tree(self, operands: int, max_number: int, code: list, constants: list) -> None:
+        """Appends postfix code of a random expression tree with the given number of operands."""
+        if operands == 1:
+            code.append(PUSH)
+            constants.append(self.random.randint(1, max_number))
+            return
+
+        opcode = self.random.choice(self.operators)
+        left = operands - 1 if opcode == DIV else self.random.randint(1, operands - 1)
+        self._generate_tree(left, max_number, code, constants)
+        if opcode == DIV:
+            code.append(PUSH)
+            constants.append(self.random.randint(1, 9))
+        else:
+            self._generate_tree(operands - left, max_number, code, constants)
+        code.append(opcode)
+
+    @staticmethod
+    def parse_programs(exercises: list) -> list:
+        """Compiles exercises (strings or records) into Programs, records are not parsed."""
+        return [exercise.program if isinstance(exercise, ExpressionExercise) else compile_expression(exercise)
+                for exercise in exercises]
+
+    def canonical_form(self, exercise: str | ExpressionExercise) -> str:
+        # Spacing and redundant parentheses do not change the compiled Program
+        return repr(self.parse_programs([exercise])[0])
+
+    def solve(self, exercises: list) -> dict:
+        return {exercise: self.result_format(evaluate(program))
+                for exercise, program in zip(exercises, self.parse_programs(exercises))}
+
+    def solve_batch(self, exercises: list) -> np.ndarray:
+        """Vectorized solve, returns an array of results aligned with exercises."""
+        return self.batch_result_format(evaluate_batch(self.parse_programs(exercises)))
+
+
+if __name__ == "__main__":
+    factory = ExpressionFactory()
+    exe = factory.generate(level=3, amount=10)
+    sol = factory.solve(exercises=exe)
+    print(f"Exercises: {exe}")
+    print(f"Solutions: {sol}")
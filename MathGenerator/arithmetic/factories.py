@@ -1,7 +1,48 @@
+import functools
+import math
 import operator
 import random
 
-from MathGenerator.abstracts import ExerciseFactory
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory, ExerciseRecord
+from MathGenerator.unique import create_index
+
+
+def round_array(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    Rounds an array like the built-in round does for every single float.
+    np.round scales values before rounding, which breaks ties like 490.1625 differently,
+    so the few candidates for a tie are rounded again in Python.
+    """
+    rounded = np.round(values, decimals)
+    scaled = np.abs(values) * 10.0 ** decimals
+    ties = np.flatnonzero(np.isclose(scaled - np.floor(scaled), 0.5, rtol=0, atol=1e-6))
+    rounded[ties] = [round(value, decimals) for value in values[ties].tolist()]
+    return rounded
+
+
+# Result of RemainderDivisionFactory.solve_batch, one row per exercise
+REMAINDER_DTYPE = np.dtype([('quotient', 'i8'), ('remainder', 'i8')])
+
+
+class ArithmeticExercise(ExerciseRecord):
+    """Arithmetic exercise record: components joined by a single operator"""
+    __slots__ = ('operands', 'operator', 'suffix')
+
+    def __init__(self, operands: tuple, operator: str, suffix: str = ''):
+        super().__init__()
+        self.operands = operands
+        self.operator = operator
+        # Unit written after every component, e.g. '%'
+        self.suffix = suffix
+
+    @property
+    def fields(self) -> tuple:
+        return self.operands, self.operator
+
+    def render(self) -> str:
+        return f" {self.operator} ".join(f"{component}{self.suffix}" for component in self.operands)
 
 
 class ArithmeticFactory(ExerciseFactory):
@@ -25,25 +66,63 @@ class ArithmeticFactory(ExerciseFactory):
         __init__(self, operator_symbol):
             Initializes the ArithmeticFactory with the specified operator symbol.
 
-        generate(self, level: int, amount: int) -> list:
+        generate(self, level: int, amount: int, structured: bool = False) -> list:
             Generates a list of arithmetic exercises. The complexity and quantity of
             exercises are determined by the `level` and `amount` parameters.
             - level (int): The difficulty level of the exercises, affecting the maximum
                            numbers used in exercises.
             - amount (int): The number of exercises to generate.
+            - structured (bool): Return ArithmeticExercise records instead of strings.
 
         solve(self, exercises: list) -> dict:
             Solves a list of arithmetic exercises provided in `exercises`. Returns a
             dictionary where keys are the exercises and values are the solutions.
-            - exercises (list): A list of string expressions representing the arithmetic
-                                problems to solve.
+            - exercises (list): A list of string expressions or ArithmeticExercise
+                                records representing the arithmetic problems to solve.
+
+        generate_operands(self, level: int, amount: int, rng=None) -> np.ndarray:
+            Batch counterpart of `generate`. Draws the operands of all exercises at once
+            and returns them as an array of shape (amount, components).
+            - rng (np.random.Generator): Optional source of randomness.
+
+        format_exercises(self, operands: np.ndarray) -> list:
+            Renders an operands array into exercise strings.
+
+        generate_batch(self, level: int, amount: int, rng=None, structured=False) -> list:
+            Vectorized `generate`, producing the same exercises as a list of strings
+            (or records).
+
+        parse_operands(self, exercises: list) -> np.ndarray:
+            Parses a whole list of exercises at once into a 2-D operands array.
+
+        solve_batch(self, exercises) -> np.ndarray:
+            Vectorized `solve`. Accepts an operands array (or a list of exercises, which
+            is parsed with `parse_operands`) and returns an array of results aligned
+            with its rows.
+
+        operand_space(self, level: int) -> tuple:
+            Inclusive bounds of the integers drawn for every component of exercises.
+
+        exercise_codes(self, level: int, exercises: list) -> np.ndarray:
+            Numbers exercises by their position in the operand space of the level,
+            used by the bitset index of `generate_unique`.
     """
     # Describes types of numbers in exercises
     number_type: type = int
     # Format results of solve method
     result_format = staticmethod(lambda x: x)
+    # Vectorized counterpart of result_format used by solve_batch
+    batch_result_format = staticmethod(lambda x: x)
+    # Unit written after every component of exercise
+    component_suffix = ''
 
     number_generator = random.randint
+    # Vectorized counterpart of number_generator, draws a whole array of operands at once
+    batch_generator = staticmethod(lambda rng, low, high, size: rng.integers(low, high, size=size, endpoint=True))
+    # Inclusive bounds of integers drawn by number_generator for a level, lower bound is drawn from [2, 9]
+    operand_bounds = staticmethod(lambda level: (2, 10 ** level))
+    # Components are the drawn integers divided by operand_scale
+    operand_scale = staticmethod(lambda level: 1)
 
     def __init__(self, operator_symbol):
         super().__init__()
@@ -54,8 +133,15 @@ class ArithmeticFactory(ExerciseFactory):
             '*': operator.mul,
             '/': operator.truediv
         }[operator_symbol]
+        # Vectorized counterpart of operator_function
+        self.operator_ufunc = {
+            '+': np.add,
+            '-': np.subtract,
+            '*': np.multiply,
+            '/': np.divide
+        }[operator_symbol]
 
-    def generate(self, level: int, amount: int) -> list:
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
         # Initialize an empty list of exercises
         exercises = []
         max_number = 10 ** level
@@ -63,21 +149,38 @@ class ArithmeticFactory(ExerciseFactory):
         # Process of generating a single exercise
         for _ in range(amount):
             components_count = 3 if level > 4 else 2
-            components = [str(
-                self.number_generator(random.randint(2, 9), max_number)
-            ) for _ in range(components_count)]
-            exercise = self.operator_symbol.join(components)
-            exercises.append(exercise)
+            components = [
+                self.number_generator(random.randint(2, 9), max_number) for _ in range(components_count)
+            ]
+            exercises.append(self._create_exercise(components, structured))
 
         return exercises
 
+    def _create_exercise(self, components: list, structured: bool) -> ArithmeticExercise | str:
+        record = ArithmeticExercise(tuple(components), self.operator_symbol.strip(), self.component_suffix)
+        return record if structured else record.render()
+
+    def _split_exercise(self, exercise: ArithmeticExercise | str) -> list:
+        """Returns components of exercise, parsing is needed only for strings."""
+        if isinstance(exercise, ArithmeticExercise):
+            return list(exercise.operands)
+        return exercise.replace(self.component_suffix, '').split(self.operator_symbol) \
+            if self.component_suffix else exercise.split(self.operator_symbol)
+
+    def canonical_form(self, exercise: ArithmeticExercise | str) -> str:
+        components = [str(component) for component in self._split_exercise(exercise)]
+        # Results of integer and fixed-point factories do not depend on the order of summands or factors
+        if self.operator_function in (operator.add, operator.mul):
+            components.sort()
+        return self.operator_symbol.join(components)
+
     def solve(self, exercises: list) -> dict:
         # Initialize an empty dict of solutions {'exercise': solution}
         solutions = {}
 
         # Process of solving a single exercise
         for exercise in exercises:
-            components = [self.number_type(component) for component in exercise.split(self.operator_symbol)]
+            components = [self.number_type(component) for component in self._split_exercise(exercise)]
 
             result = components[0]
             for component in components[1:]:
@@ -87,6 +190,54 @@ class ArithmeticFactory(ExerciseFactory):
 
         return solutions
 
+    def generate_operands(self, level: int, amount: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        rng = np.random.default_rng() if rng is None else rng
+        components_count = 3 if level > 4 else 2
+        size = (amount, components_count)
+
+        # Lower bound of every component is drawn the same way as in generate
+        lows = rng.integers(2, 9, size=size, endpoint=True)
+        return self.batch_generator(rng, lows, 10 ** level, size)
+
+    def format_exercises(self, operands: np.ndarray, structured: bool = False) -> list:
+        # tolist() converts to Python scalars, so numbers are rendered exactly like in generate
+        return [self._create_exercise(row, structured) for row in operands.tolist()]
+
+    def generate_batch(self, level: int, amount: int, rng: np.random.Generator | None = None,
+                       structured: bool = False) -> list:
+        return self.format_exercises(self.generate_operands(level=level, amount=amount, rng=rng),
+                                     structured=structured)
+
+    def parse_operands(self, exercises: list) -> np.ndarray:
+        # NumPy converts the split strings itself, so the whole list is parsed in one call
+        return np.array([self._split_exercise(exercise) for exercise in exercises], dtype=self.number_type)
+
+    def solve_batch(self, exercises: np.ndarray | list) -> np.ndarray:
+        operands = exercises if isinstance(exercises, np.ndarray) else self.parse_operands(exercises)
+        # Fold the operator over the components of every row, like functools.reduce in solve
+        return self.batch_result_format(self.operator_ufunc.reduce(operands, axis=1))
+
+    def operand_space(self, level: int) -> tuple:
+        return (self.operand_bounds(level),) * (3 if level > 4 else 2)
+
+    def _generate_candidates(self, level: int, amount: int, structured: bool = False) -> list:
+        # The same exercises as generate would give, drawn at once
+        return self.generate_batch(level=level, amount=amount, structured=structured)
+
+    def capacity(self, level: int, **kwargs) -> int:
+        # Different integers are rendered differently, so every point of the space is a distinct exercise
+        return math.prod(high - low + 1 for low, high in self.operand_space(level))
+
+    def exercise_codes(self, level: int, exercises: list) -> np.ndarray:
+        space = self.operand_space(level)
+        integers = np.rint(self.parse_operands(exercises) * self.operand_scale(level)).astype(np.int64)
+        return np.ravel_multi_index(tuple((integers - [low for low, _ in space]).T),
+                                    tuple(high - low + 1 for low, high in space))
+
+    def unique_index(self, level: int, amount: int, **kwargs):
+        size = math.prod(high - low + 1 for low, high in self.operand_space(level))
+        return create_index(amount, size, lambda exercises: self.exercise_codes(level, exercises))
+
 
 class AdditionFactory(ArithmeticFactory):
     """Class for managing Addition exercises"""
@@ -105,6 +256,9 @@ class MultiplicationFactory(ArithmeticFactory):
 
     # Set other generator to adjust difficulty
     number_generator = staticmethod(lambda a, b: random.randint(a, round((b / 5) + a)))
+    batch_generator = staticmethod(
+        lambda rng, low, high, size: rng.integers(low, np.round(high / 5 + low), size=size, endpoint=True))
+    operand_bounds = staticmethod(lambda level: (2, round(10 ** level / 5) + 9))
 
     def __init__(self):
         super().__init__(operator_symbol="*")
@@ -112,35 +266,216 @@ class MultiplicationFactory(ArithmeticFactory):
 
 class DivisionFactory(ArithmeticFactory):
     """Class for managing Division exercises"""
-    # TODO: Consider implementing modulo in solutions
     # Rounding results to three decimal places
     result_format = staticmethod(lambda x: round(x, 3))
+    batch_result_format = staticmethod(lambda x: round_array(x, 3))
 
     def __init__(self):
         super().__init__(operator_symbol="/")
 
+    @staticmethod
+    def _divisor_bounds(level: int) -> tuple:
+        # Smaller divisors than dividends keep exercises solvable by hand
+        return (1, 9) if level < 4 else (11, 99)
+
+    def operand_space(self, level: int) -> tuple:
+        return (1, 10 ** level), self._divisor_bounds(level)
+
     # Override generate method to achieve smaller divisor
-    def generate(self, level: int, amount: int) -> list:
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
         exercises = []
         max_number = 10 ** level
 
         # Process of generating a single division exercise
         for _ in range(amount):
             dividend = self.number_generator(1, max_number)
-            divisor = self.number_generator(1, 9) if level < 4 else self.number_generator(11, 99)
-            exercise = f"{dividend}{self.operator_symbol}{divisor}"
-            exercises.append(exercise)
+            divisor = self.number_generator(*self._divisor_bounds(level))
+            exercises.append(self._create_exercise([dividend, divisor], structured))
 
         return exercises
 
+    def generate_operands(self, level: int, amount: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        rng = np.random.default_rng() if rng is None else rng
+        dividends = self.batch_generator(rng, 1, 10 ** level, amount)
+        divisors = self.batch_generator(rng, *self._divisor_bounds(level), amount)
+        return np.column_stack((dividends, divisors))
 
-class FractionFactory(ArithmeticFactory):
-    """Subclass for managing Fractions operations"""
+
+class ExactDivisionFactory(DivisionFactory):
+    """
+    Division exercises with integer results. Divisor and quotient are drawn first
+    and dividend is derived from them, so no exercise has to be rejected.
+    Dividends stay in the range of DivisionFactory, up to 10 ** level.
+    """
+    result_format = staticmethod(round)
+    batch_result_format = staticmethod(lambda x: np.rint(x).astype(int))
+
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
+        exercises = []
+        max_number = 10 ** level
+
+        for _ in range(amount):
+            divisor = self.number_generator(*self._divisor_bounds(level))
+            quotient = self.number_generator(1, max(1, max_number // divisor))
+            exercises.append(self._create_exercise(self._dividend(quotient, divisor, max_number) + [divisor],
+                                                   structured))
+
+        return exercises
+
+    def _dividend(self, quotient: int, divisor: int, max_number: int) -> list:
+        return [quotient * divisor]
+
+    def capacity(self, level: int, **kwargs) -> int:
+        # Every divisor has its own range of dividends
+        return sum(self._dividends(divisor, 10 ** level)
+                   for divisor in range(self._divisor_bounds(level)[0], self._divisor_bounds(level)[1] + 1))
+
+    @staticmethod
+    def _dividends(divisor: int, max_number: int) -> int:
+        return max(1, max_number // divisor)
+
+    def generate_operands(self, level: int, amount: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        rng = np.random.default_rng() if rng is None else rng
+        divisors = self.batch_generator(rng, *self._divisor_bounds(level), amount)
+        # Upper bound of quotient depends on divisor of the same exercise
+        quotients = self.batch_generator(rng, 1, np.maximum(1, 10 ** level // divisors), amount)
+        return np.column_stack((self._batch_dividends(rng, quotients, divisors, 10 ** level), divisors))
+
+    def _batch_dividends(self, rng: np.random.Generator, quotients: np.ndarray, divisors: np.ndarray,
+                         max_number: int) -> np.ndarray:
+        return quotients * divisors
+
+
+class RemainderDivisionFactory(ExactDivisionFactory):
+    """
+    Division with remainder, e.g. '17 / 5' is solved as '3 r 2'.
+    Remainder is drawn from [0, divisor - 1] and added to the exact dividend,
+    except for the highest quotient, whose dividends would exceed 10 ** level.
+    """
+    result_format = staticmethod(lambda result: f"{result[0]} r {result[1]}")
+
+    def __init__(self):
+        super().__init__()
+        self.operator_function = divmod
+        # np.divmod has two outputs and cannot be reduced, solve_batch is overridden instead
+        self.operator_ufunc = None
+
+    def _dividend(self, quotient: int, divisor: int, max_number: int) -> list:
+        return [quotient * divisor + self.number_generator(0, min(divisor - 1, max_number - quotient * divisor))]
+
+    @staticmethod
+    def _dividends(divisor: int, max_number: int) -> int:
+        # Every dividend from divisor to max_number
+        return max(1, max_number - divisor + 1)
+
+    def _batch_dividends(self, rng: np.random.Generator, quotients: np.ndarray, divisors: np.ndarray,
+                         max_number: int) -> np.ndarray:
+        remainders = np.minimum(divisors - 1, max_number - quotients * divisors)
+        return quotients * divisors + self.batch_generator(rng, 0, remainders, len(divisors))
+
+    def solve_batch(self, exercises: np.ndarray | list) -> np.ndarray:
+        """Returns a REMAINDER_DTYPE array of quotients and remainders."""
+        operands = exercises if isinstance(exercises, np.ndarray) else self.parse_operands(exercises)
+        solutions = np.empty(len(operands), dtype=REMAINDER_DTYPE)
+        solutions['quotient'], solutions['remainder'] = np.divmod(operands[:, 0], operands[:, 1])
+        return solutions
+
+
+def round_ratio(numerators: np.ndarray, denominators: np.ndarray) -> np.ndarray:
+    """
+    Exact integer division rounded half to even, like the built-in round of a Fraction.
+    Denominators have to be positive. Works on Python ints, int64 and object arrays.
+    """
+    quotients = numerators // denominators
+    remainders = numerators - quotients * denominators
+    up = (2 * remainders > denominators) | ((2 * remainders == denominators) & (quotients % 2 == 1))
+    return quotients + up
+
+
+class FixedPointFactory(ArithmeticFactory):
+    """
+    Base of factories with decimal components (fractions and percentages).
+
+    Exercises are solved exactly on integers: components are scaled by a common power
+    of ten, parsed from their text in solve and from the operands array in solve_batch.
+    Results are rounded half to even only once, to result_decimal_places.
+    """
     number_type = float
+    result_format = staticmethod(lambda x: x)
+    # Highest precision considered when counting decimal places of operands
+    max_decimal_places = 15
+
+    @staticmethod
+    def result_decimal_places(operand_decimal_places):
+        """Decimal places of results, given the maximal decimal places of operands (int or array)."""
+        # Fractions are rounded to three decimal places, like results of DivisionFactory
+        return np.full_like(operand_decimal_places, 3) if isinstance(operand_decimal_places, np.ndarray) else 3
+
+    def exact_ratio(self, components: list, scale: int) -> tuple:
+        """
+        Exact result as a numerator and a positive denominator. Components are integers
+        equal to operands * 10 ** scale: Python ints of a single exercise, or columns of a batch.
+        """
+        if self.operator_function is operator.truediv:
+            # a / b / c = a * 10 ** scale / (b * c) for scaled components
+            numerator = components[0] * 10 ** (scale * (len(components) - 2))
+            denominator = functools.reduce(operator.mul, components[1:])
+            sign = 1 - 2 * (denominator < 0)
+            return numerator * sign, denominator * sign
+        result = functools.reduce(self.operator_function, components)
+        return result, 10 ** (scale * len(components) if self.operator_function is operator.mul else scale)
 
-    # Situations like 1 + 2 = 2.9999999997 avoidance
-    result_format = staticmethod(lambda x: round(x, 3))
+    def solve(self, exercises: list) -> dict:
+        solutions = {}
+
+        # Process of solving a single exercise
+        for exercise in exercises:
+            # Text of a component is its exact decimal value, floats of records are printed the same way
+            components = [str(component).partition('.') for component in self._split_exercise(exercise)]
+            scale = max(len(decimals) for _, _, decimals in components)
+            # e.g. '6.91' and '2.5' -> 691 and 250 for scale 2
+            numerator, denominator = self.exact_ratio(
+                [int(whole + decimals) * 10 ** (scale - len(decimals)) for whole, _, decimals in components], scale)
+            dp = self.result_decimal_places(scale)
+            solutions[exercise] = self.result_format(round_ratio(numerator * 10 ** dp, denominator) / 10 ** dp)
+
+        return solutions
+
+    def decimal_places(self, operands: np.ndarray) -> np.ndarray:
+        """Returns the maximal number of decimal places of the operands in every row."""
+        dp = np.full(operands.shape, self.max_decimal_places)
+        unresolved = np.ones(operands.shape, dtype=bool)
+        for decimals in range(self.max_decimal_places):
+            exact = unresolved & (np.round(operands, decimals) == operands)
+            dp[exact] = decimals
+            unresolved &= ~exact
+            if not unresolved.any():
+                break
+        return dp.max(axis=1, initial=0)
+
+    def solve_batch(self, exercises: np.ndarray | list) -> np.ndarray:
+        operands = exercises if isinstance(exercises, np.ndarray) else self.parse_operands(exercises)
+        operand_dp = self.decimal_places(operands)
+        scale = int(operand_dp.max(initial=0))
+        dp = self.result_decimal_places(operand_dp)
+        components = np.rint(operands * 10.0 ** scale).astype(np.int64)
+
+        # Batches which could overflow int64 are estimated in floats first, and computed with Python ints if needed
+        numerators, denominators = self.exact_ratio(list(components.T.astype(float)), scale)
+        estimate = np.abs(np.append(numerators * 10.0 ** dp, np.asarray(denominators, dtype=float)))
+        if estimate.max(initial=0) >= 2 ** 62:
+            components, dp = components.astype(object), dp.astype(object)
+
+        numerators, denominators = self.exact_ratio(list(components.T), scale)
+        return (round_ratio(numerators * 10 ** dp, denominators) / 10 ** dp).astype(float)
+
+
+class FractionFactory(FixedPointFactory):
+    """Subclass for managing Fractions operations"""
+    # Operands are integers scaled by 100, so they have two decimal places
     number_generator = staticmethod(lambda a, b: random.randint(a, b) / 100)
+    batch_generator = staticmethod(lambda rng, low, high, size: rng.integers(low, high, size=size, endpoint=True) / 100)
+    operand_scale = staticmethod(lambda level: 100)
 
 
 """ These are self-explanatory"""
@@ -156,52 +491,48 @@ class FractionSubtractionFactory(FractionFactory, SubtractionFactory):
 
 class FractionMultiplicationFactory(FractionFactory, MultiplicationFactory):
     number_generator = staticmethod(lambda a, b: random.randint(a, b) / 10)
+    batch_generator = staticmethod(lambda rng, low, high, size: rng.integers(low, high, size=size, endpoint=True) / 10)
+    operand_bounds = staticmethod(lambda level: (2, 10 ** level))
+    operand_scale = staticmethod(lambda level: 10)
 
 
 class FractionDivisionFactory(FractionFactory, DivisionFactory):
     number_generator = staticmethod(lambda a, b: random.randint(a, b) / 10)
-
-
-class PercentFactory(ArithmeticFactory):
-    number_type = float
-    # Set range of generating percentages to 1-100. Level of exercises will increase precision
-    number_generator = staticmethod(lambda precision: round(random.uniform(1, 100), precision))
-    # Parametrize rounding due to different decimals
-    result_format = staticmethod(lambda x, dp: round(x, dp))
-
-    def generate(self, level: int, amount: int) -> list:
+    batch_generator = staticmethod(lambda rng, low, high, size: rng.integers(low, high, size=size, endpoint=True) / 10)
+    operand_scale = staticmethod(lambda level: 10)
+
+
+class PercentFactory(FixedPointFactory):
+    # Set range of generating percentages to 1-100. Level of exercises will increase precision,
+    # percentages are integers in [10 ** precision, 100 * 10 ** precision) scaled by 10 ** precision
+    number_generator = staticmethod(
+        lambda precision: random.randrange(10 ** precision, 100 * 10 ** precision) / 10 ** precision)
+    batch_generator = staticmethod(
+        lambda rng, precision, size: rng.integers(10 ** precision, 100 * 10 ** precision, size=size) / 10 ** precision)
+    operand_bounds = staticmethod(lambda level: (10 ** (level - 1), 100 * 10 ** (level - 1) - 1))
+    operand_scale = staticmethod(lambda level: 10 ** (level - 1))
+    result_format = staticmethod(lambda x: f"{x}%")
+    component_suffix = '%'
+
+    @staticmethod
+    def result_decimal_places(operand_decimal_places):
+        # Sum or difference has the precision of the most precise operand
+        return operand_decimal_places
+
+    def generate(self, level: int, amount: int, structured: bool = False) -> list:
         exercises = []
 
         # Process of generating single exercise
         for _ in range(amount):
             components_count = 3 if level > 4 else 2
-            components = [
-                f"{self.number_generator(precision=level - 1)}%"
-                for _ in range(components_count)
-            ]
-            exercise = self.operator_symbol.join(components)
-            exercises.append(exercise)
+            components = [self.number_generator(precision=level - 1) for _ in range(components_count)]
+            exercises.append(self._create_exercise(components, structured))
         return exercises
 
-    def solve(self, exercises: list) -> dict:
-        solutions = {}
-
-        # Process of solving a single exercise
-        for exercise in exercises:
-            # Remove the '%' sign
-            components = [component.replace('%', '') for component in
-                          exercise.split(self.operator_symbol)]
-            # Check max number of decimal places for components
-            dp = max((component[::-1].find('.') for component in components if '.' in component), default=0)
-            # Convert components to numeric type
-            components = [self.number_type(component) for component in components]
-            result = components[0]
-            for component in components[1:]:
-                result = self.operator_function(result, component)
-            # Format the result to add the '%' sign and store it in the solutions dictionary
-            solutions[exercise] = f"{self.result_format(result, dp)}%"
-
-        return solutions
+    def generate_operands(self, level: int, amount: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        rng = np.random.default_rng() if rng is None else rng
+        components_count = 3 if level > 4 else 2
+        return self.batch_generator(rng, level - 1, (amount, components_count))
 
 
 class PercentAdditionFactory(PercentFactory, AdditionFactory):
@@ -213,9 +544,16 @@ class PercentSubtractionFactory(PercentFactory, SubtractionFactory):
 
 
 class PercentMultiplicationFactory(PercentFactory, MultiplicationFactory):
-    # TODO: Adjust generate method by new 'level mechanism' due to difficulty
-    # TODO: Implement solve method adjusted to percentages.
-    pass
+    """Product of percentages in percents, e.g. 50% * 50% = 25%"""
+
+    @staticmethod
+    def result_decimal_places(operand_decimal_places):
+        # Every division by 100 moves the point by two places, one of them is kept
+        return operand_decimal_places + 2
+
+    def exact_ratio(self, components: list, scale: int) -> tuple:
+        numerator, denominator = super().exact_ratio(components, scale)
+        return numerator, denominator * 100 ** (len(components) - 1)
 
 
 if __name__ == "__main__":
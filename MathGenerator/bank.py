@@ -0,0 +1,270 @@
+"""
+On-disk banks of pre-generated exercises with their solutions.
+
+A bank of a factory and level is a directory of .npy files, one per column: the numbers
+of exercises (operands, coefficients, ...) and the rows returned by solve_batch.
+Columns are memory-mapped, so a worksheet is a sample of row indices: only the sampled
+rows are read, and neither generating nor solving happens. Banks grow by appending
+chunks to the end of every column.
+
+    bank = ExerciseBank('banks', AdditionFactory(), level=3)
+    bank.fill(10_000_000)
+    exercises, solutions = bank.sample(30)
+"""
+import copy
+import os
+import random
+
+import numpy as np
+from numpy.lib import format as npy
+
+from MathGenerator.abstracts import ExerciseFactory
+from MathGenerator.algebra import parser
+from MathGenerator.algebra.linear import SingleLinearFactory, LinearExercise, solution_string
+from MathGenerator.algebra.quadratic import QuadraticFactory, QuadraticExercise
+from MathGenerator.arithmetic.expressions import ExpressionFactory, ExpressionExercise, Program, evaluate_batch
+from MathGenerator.arithmetic.factories import ArithmeticFactory
+
+
+def _read_header(file) -> tuple:
+    version = npy.read_magic(file)
+    read = npy.read_array_header_1_0 if version == (1, 0) else npy.read_array_header_2_0
+    shape, fortran_order, dtype = read(file)
+    if fortran_order:
+        raise ValueError(f"Columns of exercise bank have to be in C order: {file.name}")
+    return version, shape, dtype, file.tell()
+
+
+def _write_shape(file, version: tuple, shape: tuple, dtype: np.dtype, offset: int) -> None:
+    """Rewrites the shape in header. Header written by numpy keeps spare space for the growing first dimension."""
+    file.seek(0)
+    write = npy.write_array_header_1_0 if version == (1, 0) else npy.write_array_header_2_0
+    write(file, {'descr': npy.dtype_to_descr(dtype), 'fortran_order': False, 'shape': shape})
+    if file.tell() != offset:
+        raise ValueError(f"Header of {file.name} has no space left to grow")
+
+
+def append_npy(path: str, array: np.ndarray) -> None:
+    """Appends rows to the .npy file in place, creating it if needed."""
+    if not os.path.exists(path):
+        np.save(path, array)
+        return
+
+    with open(path, 'r+b') as file:
+        version, shape, dtype, offset = _read_header(file)
+        if dtype != array.dtype or shape[1:] != array.shape[1:]:
+            raise ValueError(f"Cannot append {array.dtype} rows {array.shape[1:]} "
+                             f"to {dtype} rows {shape[1:]} of {path}")
+        file.seek(0, os.SEEK_END)
+        file.write(np.ascontiguousarray(array).tobytes())
+        _write_shape(file, version, (shape[0] + len(array),) + shape[1:], dtype, offset)
+
+
+def truncate_npy(path: str, rows: int) -> None:
+    """Keeps only the first rows of the .npy file, without reading it."""
+    with open(path, 'r+b') as file:
+        version, shape, dtype, offset = _read_header(file)
+        file.truncate(offset + rows * int(np.prod(shape[1:], dtype=int)) * dtype.itemsize)
+        _write_shape(file, version, (rows,) + shape[1:], dtype, offset)
+
+
+def _seeded(factory: ExerciseFactory, rng: np.random.Generator) -> ExerciseFactory:
+    """
+    Copy of a factory drawing from its own random.Random, seeded from rng so a seeded bank is reproducible.
+    The factory of the caller keeps its random stream, so it can be used meanwhile by other threads.
+    """
+    factory = copy.copy(factory)
+    factory.random = random.Random(int(rng.integers(2 ** 63)))
+    return factory
+
+
+class ArithmeticColumns:
+    """Operands of arithmetic exercises, solved by ArithmeticFactory.solve_batch"""
+
+    @staticmethod
+    def generate(factory: ArithmeticFactory, level: int, amount: int, rng: np.random.Generator) -> dict:
+        operands = factory.generate_operands(level=level, amount=amount, rng=rng)
+        return {'operands': operands, 'solutions': factory.solve_batch(operands)}
+
+    @staticmethod
+    def exercises(factory: ArithmeticFactory, columns: dict, structured: bool) -> list:
+        return factory.format_exercises(columns['operands'], structured=structured)
+
+    @staticmethod
+    def solutions(factory: ArithmeticFactory, columns: dict) -> list:
+        # Rows of REMAINDER_DTYPE become (quotient, remainder) tuples, as divmod returns
+        return [factory.result_format(solution) for solution in columns['solutions'].tolist()]
+
+
+class QuadraticColumns:
+    """Coefficients a, b, c and relation codes of quadratic exercises"""
+
+    @staticmethod
+    def generate(factory: QuadraticFactory, level: int, amount: int, rng: np.random.Generator) -> dict:
+        factory = _seeded(factory, rng)
+        coefficients, relations = factory.parse_coefficients(
+            factory.generate(level=level, amount=amount, structured=True))
+        return {'coefficients': coefficients, 'relations': relations,
+                'solutions': factory.solve_batch(coefficients, relations)}
+
+    @staticmethod
+    def exercises(factory: QuadraticFactory, columns: dict, structured: bool) -> list:
+        # a and b are generated as integers, c is a float
+        records = [QuadraticExercise(int(a), int(b), c, parser.RELATIONS[relation])
+                   for (a, b, c), relation in zip(columns['coefficients'].tolist(), columns['relations'].tolist())]
+        return records if structured else [record.render() for record in records]
+
+    @staticmethod
+    def solutions(factory: QuadraticFactory, columns: dict) -> list:
+        """Rows of solve_batch in the format of QuadraticFactory.solve"""
+        solutions = []
+        for row in columns['solutions']:
+            delta = float(row['delta'])
+            x1, x2 = float(row['x1']), float(row['x2'])
+            # solve gives (-b + sqrt(delta)) / 2a first, which is the greater root for parabolas facing up
+            roots = ((x2, x1) if row['direction'] > 0 else (x1, x2)) if row['roots'] == 2 \
+                else (x1,) if row['roots'] == 1 else "No real roots, complex roots present"
+            solutions.append({
+                "roots": roots,
+                "parabola_direction": "up" if row['direction'] > 0 else "down",
+                "delta": int(delta) if delta == int(delta) else delta,
+            })
+        return solutions
+
+
+class LinearColumns:
+    """Integer coefficients a, b, c, d of 'ax + b {relation} cx + d' and relation codes"""
+
+    @staticmethod
+    def generate(factory: SingleLinearFactory, level: int, amount: int, rng: np.random.Generator) -> dict:
+        factory = _seeded(factory, rng)
+        coefficients, relations = factory.parse_coefficients(
+            factory.generate(level=level, amount=amount, structured=True))
+        return {'coefficients': coefficients.astype(np.int64), 'relations': relations,
+                'solutions': factory.solve_batch(coefficients, relations)}
+
+    @staticmethod
+    def exercises(factory: SingleLinearFactory, columns: dict, structured: bool) -> list:
+        records = [LinearExercise(*row, parser.RELATIONS[relation])
+                   for row, relation in zip(columns['coefficients'].tolist(), columns['relations'].tolist())]
+        return records if structured else [record.render() for record in records]
+
+    @staticmethod
+    def solutions(factory: SingleLinearFactory, columns: dict) -> list:
+        return [solution_string(row) for row in columns['solutions']]
+
+
+class ExpressionColumns:
+    """Opcodes and constants of compiled expressions, all Programs of a level have the same length"""
+
+    @staticmethod
+    def generate(factory: ExpressionFactory, level: int, amount: int, rng: np.random.Generator) -> dict:
+        factory = _seeded(factory, rng)
+        programs = factory.parse_programs(factory.generate(level=level, amount=amount, structured=True))
+        return {'code': np.array([program.code for program in programs], dtype=np.int8).reshape(amount, -1),
+                'constants': np.array([program.constants for program in programs], dtype=np.int64).reshape(amount, -1),
+                # Columns have a fixed type, so exact results beyond 2 ** 53 are kept as float64 too
+                'solutions': factory.batch_result_format(evaluate_batch(programs)).astype(float)}
+
+    @staticmethod
+    def exercises(factory: ExpressionFactory, columns: dict, structured: bool) -> list:
+        records = [ExpressionExercise(Program(tuple(code), tuple(constants)))
+                   for code, constants in zip(columns['code'].tolist(), columns['constants'].tolist())]
+        return records if structured else [record.render() for record in records]
+
+    @staticmethod
+    def solutions(factory: ExpressionFactory, columns: dict) -> list:
+        return columns['solutions'].tolist()
+
+
+# Checked in this order, subclasses first
+COLUMNS = (
+    (ArithmeticFactory, ArithmeticColumns),
+    (QuadraticFactory, QuadraticColumns),
+    (SingleLinearFactory, LinearColumns),
+    (ExpressionFactory, ExpressionColumns),
+)
+
+
+class ExerciseBank:
+    """
+    Memory-mapped bank of exercises of a single factory and level.
+
+    Parameters:
+    - root (str): Directory of all banks, this one is kept in root/FactoryName/level-N.
+    - factory (ExerciseFactory): Factory generating exercises of the bank.
+    - level (int): Difficulty level of the exercises.
+    - seed (int): Seed of the random numbers of fill and sample.
+    """
+
+    def __init__(self, root: str, factory: ExerciseFactory, level: int, seed: int | None = None):
+        self.factory = factory
+        self.level = level
+        self.path = os.path.join(root, factory.__class__.__name__, f"level-{level}")
+        self.rng = np.random.default_rng(seed)
+        self.columns = next((columns for factory_class, columns in COLUMNS if isinstance(factory, factory_class)), None)
+        if self.columns is None:
+            raise TypeError(f"{factory.__class__.__name__} has no exercise bank")
+        self._arrays = None
+
+    def _files(self) -> dict:
+        if not os.path.isdir(self.path):
+            return {}
+        return {name[:-len('.npy')]: os.path.join(self.path, name) for name in sorted(os.listdir(self.path))
+                if name.endswith('.npy')}
+
+    def arrays(self) -> dict:
+        """Memory-mapped columns, nothing is read until rows are accessed."""
+        if self._arrays is None:
+            arrays = {name: np.load(path, mmap_mode='r') for name, path in self._files().items()}
+            # Fill interrupted between columns leaves some of them longer, the extra rows are ignored
+            rows = min((len(array) for array in arrays.values()), default=0)
+            self._arrays = {name: array[:rows] for name, array in arrays.items()}
+        return self._arrays
+
+    def __len__(self) -> int:
+        return len(next(iter(self.arrays().values()), ()))
+
+    def fill(self, amount: int, chunk_size: int = 100_000) -> None:
+        """Generates, solves and appends amount exercises, chunk_size of them at once."""
+        os.makedirs(self.path, exist_ok=True)
+        # Rows written by an interrupted fill are dropped from longer columns first
+        rows = len(self)
+        self._arrays = None
+        for path in self._files().values():
+            truncate_npy(path, rows)
+
+        for start in range(0, amount, chunk_size):
+            columns = self.columns.generate(self.factory, self.level, min(chunk_size, amount - start), self.rng)
+            for name, array in columns.items():
+                append_npy(os.path.join(self.path, f"{name}.npy"), array)
+
+    def rows(self, indices: np.ndarray | slice) -> dict:
+        """Reads the rows of every column, e.g. a slice for partial loading."""
+        return {name: np.asarray(array[indices]) for name, array in self.arrays().items()}
+
+    def exercises(self, columns: dict, structured: bool = False) -> list:
+        return self.columns.exercises(self.factory, columns, structured)
+
+    def sample(self, amount: int, structured: bool = False) -> tuple[list, dict]:
+        """
+        Draws amount different rows of the bank. Returns exercises and their solutions
+        in the format of factory.solve.
+        """
+        if amount > len(self):
+            raise ValueError(f"Bank {self.path} has only {len(self)} exercises, {amount} requested")
+        # Sorted indices read the file sequentially, rows of the bank are in random order anyway
+        columns = self.rows(np.sort(self.rng.choice(len(self), size=amount, replace=False)))
+        exercises = self.exercises(columns, structured)
+        return exercises, dict(zip(exercises, self.columns.solutions(self.factory, columns)))
+
+
+if __name__ == "__main__":
+    import tempfile
+    from MathGenerator.arithmetic.factories import DivisionFactory
+
+    bank = ExerciseBank(tempfile.mkdtemp(), DivisionFactory(), level=2)
+    bank.fill(1000)
+    exe, sol = bank.sample(10)
+    print(f"Bank of {len(bank)} exercises in {bank.path}")
+    print(f"Solutions: {sol}")
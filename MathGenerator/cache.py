@@ -0,0 +1,166 @@
+"""
+Content-addressed cache of solutions in front of ExerciseFactory.solve.
+
+Solutions are keyed by the factory class and the canonical form of exercise
+(ExerciseFactory.canonical_form), so the same exercise written differently is solved
+once. Recently used solutions are kept in memory, and optionally all of them in
+a SQLite database shared between sessions.
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Iterable, NamedTuple
+
+from MathGenerator.abstracts import ExerciseFactory
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    disk_hits: int
+    misses: int
+    size: int
+
+
+def _loads(text: str):
+    """Solution stored as JSON, which has no tuples, solutions hold no lists so its arrays are tuples."""
+    def tuples(value):
+        if isinstance(value, list):
+            return tuple(tuples(item) for item in value)
+        if isinstance(value, dict):
+            return {key: tuples(item) for key, item in value.items()}
+        return value
+
+    return tuples(json.loads(text))
+
+
+class SolutionCache:
+    """
+    Wraps a factory, solve returns the same solutions as factory.solve but reuses
+    the ones already computed. Other attributes are taken from the factory.
+
+    Parameters:
+    - factory (ExerciseFactory): Factory solving exercises which are not cached yet.
+    - maxsize (int): Number of solutions kept in memory, the least recently used are dropped.
+    - path (str): SQLite database keeping all solutions on disk, memory only if not given.
+    """
+    # SQLite limits the number of parameters of a single query
+    _QUERY_SIZE = 500
+
+    def __init__(self, factory: ExerciseFactory, maxsize: int = 2 ** 16, path: str | None = None):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = self.disk_hits = self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, solution TEXT)")
+            self._connection.commit()
+
+    def __getattr__(self, name):
+        return getattr(self.factory, name)
+
+    def key(self, exercise) -> str:
+        try:
+            canonical = self.factory.canonical_form(exercise)
+        except ValueError:
+            # Invalid exercises are solved by factory (e.g. into an error message) under their own text
+            canonical = str(exercise)
+        return f"{self.factory.__class__.__name__}:{canonical}"
+
+    def solve(self, exercises: list) -> dict:
+        keys = [self.key(exercise) for exercise in exercises]
+        found, memory, disk = {}, set(), set()
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    memory.add(key)
+
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing and self._connection is not None:
+                for key, solution in self._load(missing):
+                    found[key] = _loads(solution)
+                    self._remember(key, found[key])
+                    disk.add(key)
+
+        # Solving runs outside of the lock, other threads may use the cache meanwhile.
+        # Exercises with the same key are solved once.
+        unsolved = {}
+        for key, exercise in zip(keys, exercises):
+            if key not in found:
+                unsolved.setdefault(key, exercise)
+        if unsolved:
+            solutions = self.factory.solve(list(unsolved.values()))
+            computed = {key: solutions[exercise] for key, exercise in unsolved.items()}
+            found.update(computed)
+
+        with self._lock:
+            # Counters are per exercise, like calls of a function wrapped by functools.lru_cache,
+            # so repeated exercise is a hit after its first occurrence
+            counted = set()
+            for key in keys:
+                if key in memory or key in counted:
+                    self.hits += 1
+                elif key in disk:
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                counted.add(key)
+            if unsolved:
+                for key, solution in computed.items():
+                    self._remember(key, solution)
+                if self._connection is not None:
+                    self._connection.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                                                 [(key, json.dumps(solution)) for key, solution in computed.items()])
+                    self._connection.commit()
+
+        return {exercise: found[key] for key, exercise in zip(keys, exercises)}
+
+    # Chunked solving works the same way as for factories
+    iter_solve = ExerciseFactory.iter_solve
+
+    def _load(self, keys: list) -> Iterable[tuple]:
+        for start in range(0, len(keys), self._QUERY_SIZE):
+            chunk = keys[start:start + self._QUERY_SIZE]
+            yield from self._connection.execute(
+                f"SELECT key, solution FROM solutions WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
+
+    def _remember(self, key: str, solution) -> None:
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        """Counters of exercises found in memory, on disk and solved by factory, like functools.lru_cache."""
+        return CacheInfo(self.hits, self.disk_hits, self.misses, len(self._memory))
+
+    def clear(self) -> None:
+        """Drops solutions kept in memory and resets counters, the database is left untouched."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    from MathGenerator.algebra.linear import SingleLinearEquationFactory
+
+    cache = SolutionCache(SingleLinearEquationFactory())
+    print(cache.solve(['3 + 2x = 5', '2x + 3 = 5', 'x - 1 = 4']))
+    print(cache.cache_info())
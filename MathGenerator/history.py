@@ -0,0 +1,236 @@
+"""
+Persistent history of exercises handed out to students, so nobody gets the same exercise twice.
+
+Exercises are kept as 64-bit hashes of their canonical form (ExerciseFactory.canonical_form),
+so e.g. '3 + 2' counts as handed out after '2 + 3', separately for every student (or class),
+factory and level. History indexes are used like the indexes of MathGenerator.unique:
+
+    with ExerciseHistory('history.db') as history:
+        exercises = factory.generate_unique(level=2, amount=30, index=history.index(factory, 2, 'class-4b'))
+
+Exercises drawn are pending until commit, so ones of a worksheet which failed to build are
+not counted as handed out. Leaving the with block commits them, unless it raised.
+
+By default hashes are stored in SQLite and looked up exactly. With bloom=True every scope
+is a Bloom filter in a memory-mapped file: lookups are O(1) and the file size is fixed
+by the expected number of exercises, at the cost of error_rate of new exercises
+being mistaken for repeats (repeats themselves are never missed).
+"""
+import hashlib
+import math
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Callable
+from urllib.parse import quote
+
+import numpy as np
+
+
+def exercise_keys(exercises: list) -> np.ndarray:
+    """64-bit hashes of texts of exercises, stable between sessions unlike the built-in hash."""
+    return np.array([int.from_bytes(hashlib.blake2b(str(exercise).encode(), digest_size=8).digest(), 'little')
+                     for exercise in exercises], dtype=np.uint64)
+
+
+class HistoryIndex(ABC):
+    """
+    Index of exercises of a single scope, accepted by ExerciseFactory.generate_unique.
+    Subclasses look up and store arrays of keys of canonical forms of exercises.
+    Added exercises are kept pending in memory until commit.
+    """
+    # Equivalent exercises share a key, so capacity of a level only bounds the number of keys.
+    # Lookups of Bloom filter may also give false positives.
+    exact = False
+
+    def __init__(self, count: int, canonical_form: Callable = str):
+        self.count = count
+        self.canonical_form = canonical_form
+        self._pending = set()
+
+    def keys(self, exercises: list) -> np.ndarray:
+        """Keys of canonical forms of exercises, equivalent exercises share a key."""
+        canonical = []
+        for exercise in exercises:
+            try:
+                canonical.append(self.canonical_form(exercise))
+            except ValueError:
+                # Invalid exercises are kept under their own text, like in MathGenerator.cache
+                canonical.append(str(exercise))
+        return exercise_keys(canonical)
+
+    def __len__(self) -> int:
+        return self.count + len(self._pending)
+
+    def add(self, exercises: list, limit: int | None = None) -> np.ndarray:
+        """Stores at most limit exercises not handed out yet, returns flags of the stored ones."""
+        added = np.zeros(len(exercises), dtype=bool)
+        if not exercises:
+            return added
+        keys = self.keys(exercises)
+        distinct, first = np.unique(keys, return_index=True)
+        pending = np.array([key in self._pending for key in distinct.tolist()], dtype=bool)
+        fresh = ~self._contains(distinct) & ~pending
+
+        positions = np.sort(first[fresh])[:limit]
+        self._pending.update(keys[positions].tolist())
+        added[positions] = True
+        return added
+
+    def commit(self) -> None:
+        """Stores the pending exercises, they count as handed out from now on."""
+        if self._pending:
+            keys = np.array(sorted(self._pending), dtype=np.uint64)
+            self._store(keys)
+            self.count += len(keys)
+            self._pending.clear()
+
+    def rollback(self) -> None:
+        """Drops the pending exercises."""
+        self._pending.clear()
+
+    @abstractmethod
+    def _contains(self, keys: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def _store(self, keys: np.ndarray) -> None:
+        pass
+
+
+class SQLiteIndex(HistoryIndex):
+    # SQLite limits the number of parameters of a single query
+    _QUERY_SIZE = 500
+
+    def __init__(self, connection: sqlite3.Connection, scope: str, canonical_form: Callable = str):
+        self.connection = connection
+        self.scope = scope
+        count, = connection.execute("SELECT COUNT(*) FROM history WHERE scope = ?", (scope,)).fetchone()
+        super().__init__(count, canonical_form)
+
+    def _contains(self, keys: np.ndarray) -> np.ndarray:
+        # SQLite integers are signed
+        keys = keys.view(np.int64).tolist()
+        found = set()
+        for start in range(0, len(keys), self._QUERY_SIZE):
+            chunk = keys[start:start + self._QUERY_SIZE]
+            found.update(key for key, in self.connection.execute(
+                f"SELECT key FROM history WHERE scope = ? AND key IN ({', '.join('?' * len(chunk))})",
+                [self.scope, *chunk]))
+        return np.array([key in found for key in keys], dtype=bool)
+
+    def _store(self, keys: np.ndarray) -> None:
+        self.connection.executemany("INSERT INTO history VALUES (?, ?)",
+                                    [(self.scope, key) for key in keys.view(np.int64).tolist()])
+        self.connection.commit()
+
+
+class BloomIndex(HistoryIndex):
+    """
+    Bloom filter in a memory-mapped file: a header of three uint64 (count, bits, hashes)
+    followed by the bits. Positions of a key are h1 + i * h2 for its two 32-bit halves.
+    """
+
+    def __init__(self, path: str, capacity: int, error_rate: float, canonical_form: Callable = str):
+        if os.path.exists(path):
+            count, self.size, self.hashes = np.fromfile(path, dtype=np.uint64, count=3).tolist()
+        else:
+            # Optimal number of bits and hash functions for capacity keys
+            self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            self.hashes = max(1, round(self.size / capacity * math.log(2)))
+            count = 0
+            header = np.memmap(path, dtype=np.uint64, mode='w+', shape=(3 + (self.size + 63) // 64,))
+            header[:3] = (0, self.size, self.hashes)
+            header.flush()
+            del header
+        self.header = np.memmap(path, dtype=np.uint64, mode='r+', shape=(3,))
+        self.bits = np.memmap(path, dtype=np.uint8, mode='r+', offset=24, shape=((self.size + 63) // 64 * 8,))
+        super().__init__(count, canonical_form)
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        low, high = keys & np.uint64(0xFFFFFFFF), (keys >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return (low[:, None] + steps * high[:, None]) % np.uint64(self.size)
+
+    def _contains(self, keys: np.ndarray) -> np.ndarray:
+        positions = self._positions(keys)
+        return ((self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1).all(axis=1)
+
+    def _store(self, keys: np.ndarray) -> None:
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+        self.header[0] = self.count + len(keys)
+
+    def flush(self) -> None:
+        self.bits.flush()
+        self.header.flush()
+
+
+class ExerciseHistory:
+    """
+    History of exercises handed out, persisted between sessions.
+
+    Parameters:
+    - path (str): SQLite database, or a directory of Bloom filter files with bloom.
+    - bloom (bool): Keep every scope in a Bloom filter instead of SQLite.
+    - capacity (int): Expected number of exercises of a single scope, sets the size of new Bloom filters.
+    - error_rate (float): Probability of new exercise taken for a repeat at full capacity of Bloom filter.
+    """
+
+    def __init__(self, path: str, bloom: bool = False, capacity: int = 10 ** 6, error_rate: float = 1e-3):
+        self.path = path
+        self.bloom = bloom
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._indexes = {}
+        self._connection = None
+        if bloom:
+            os.makedirs(path, exist_ok=True)
+        else:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS history (scope TEXT, key INTEGER, PRIMARY KEY (scope, key)) WITHOUT ROWID")
+            self._connection.commit()
+
+    def index(self, factory, level: int, student: str = 'default') -> HistoryIndex:
+        """Index of exercises of factory and level handed out to student."""
+        scope = f"{student}/{factory.__class__.__name__}/{level}"
+        if scope not in self._indexes:
+            if self.bloom:
+                path = os.path.join(self.path, f"{quote(scope, safe='')}.bloom")
+                self._indexes[scope] = BloomIndex(path, self.capacity, self.error_rate, factory.canonical_form)
+            else:
+                self._indexes[scope] = SQLiteIndex(self._connection, scope, factory.canonical_form)
+        return self._indexes[scope]
+
+    def commit(self) -> None:
+        """Stores the pending exercises of all indexes."""
+        for index in self._indexes.values():
+            index.commit()
+
+    def close(self) -> None:
+        """Closes files of the history, pending exercises which were not committed are dropped."""
+        for index in self._indexes.values():
+            if isinstance(index, BloomIndex):
+                index.flush()
+        self._indexes.clear()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+
+if __name__ == "__main__":
+    from MathGenerator.arithmetic.factories import AdditionFactory
+
+    factory = AdditionFactory()
+    with ExerciseHistory(':memory:') as history:
+        for day in range(3):
+            print(factory.generate_unique(level=1, amount=20, index=history.index(factory, 1, 'class-4b')))
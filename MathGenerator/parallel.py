@@ -0,0 +1,137 @@
+"""
+Parallel generation and solving of large exercise banks.
+
+The request is split into shards of fixed size. Every shard gets its own random
+stream spawned from a single seed, so the same seed gives the same bank
+regardless of the number of workers. Workers write operands and solutions straight
+into shared memory buffers instead of returning pickled lists of strings.
+
+Factories without batch generation (linear and quadratic ones) draw from their own
+random.Random, so every shard creates its factory with a seed taken from its stream,
+generates records and solves their coefficients with solve_batch.
+"""
+import inspect
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Tuple, Type
+
+import numpy as np
+
+from MathGenerator.abstracts import ExerciseFactory
+
+
+def _attach(name: str, shape: tuple, dtype: np.dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _batch_mode(factory_class: Type[ExerciseFactory]) -> bool:
+    return hasattr(factory_class, 'generate_operands') and hasattr(factory_class, 'solve_batch')
+
+
+def _coefficients_mode(factory_class: Type[ExerciseFactory]) -> bool:
+    # Records are converted by parse_coefficients into coefficients and relation codes taken by solve_batch
+    return (hasattr(factory_class, 'parse_coefficients') and hasattr(factory_class, 'solve_batch')
+            and 'relations' in inspect.signature(factory_class.solve_batch).parameters)
+
+
+def _draw(factory_class: Type[ExerciseFactory], level: int, amount: int,
+          seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Operands and solutions of amount exercises drawn from the random stream of seed."""
+    rng = np.random.default_rng(seed)
+    if _batch_mode(factory_class):
+        factory = factory_class()
+        operands = factory.generate_operands(level=level, amount=amount, rng=rng)
+        return operands, factory.solve_batch(operands)
+
+    factory = factory_class(seed=int(rng.integers(2 ** 63)))
+    coefficients, relations = factory.parse_coefficients(factory.generate(level=level, amount=amount, structured=True))
+    operands = np.empty(amount, dtype=[('coefficients', coefficients.dtype, coefficients.shape[1:]),
+                                       ('relation', relations.dtype)])
+    operands['coefficients'], operands['relation'] = coefficients, relations
+    return operands, factory.solve_batch(coefficients, relations)
+
+
+def _generate_shard(factory_class: Type[ExerciseFactory], level: int, start: int, stop: int,
+                    seed: np.random.SeedSequence, operands_buffer: tuple, solutions_buffer: tuple) -> None:
+    """Generates and solves exercises [start, stop) of the bank inside a worker process."""
+    operands_memory, operands = _attach(*operands_buffer)
+    solutions_memory, solutions = _attach(*solutions_buffer)
+    try:
+        operands[start:stop], solutions[start:stop] = _draw(factory_class, level, stop - start, seed)
+    finally:
+        del operands, solutions
+        operands_memory.close()
+        solutions_memory.close()
+
+
+def generate_parallel(factory_class: Type[ExerciseFactory], level: int, amount: int, seed: int | None = None,
+                      workers: int | None = None, shard_size: int = 100_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generates and solves `amount` exercises across a process pool.
+
+    Parameters:
+    - factory_class: Factory supporting batch mode (generate_operands and solve_batch), or a factory
+                     taking a seed whose records are solved by solve_batch(*parse_coefficients(records)).
+    - level (int): Difficulty level of the exercises.
+    - amount (int): The number of exercises to generate.
+    - seed (int): Seed of the whole bank, a random one is used if not given.
+    - workers (int): Number of worker processes, by default the number of CPUs.
+    - shard_size (int): Number of exercises generated by a single task. Changing it
+                        changes the bank produced by a given seed.
+
+    Returns:
+    - Operands array of shape (amount, components) and solutions array aligned with it.
+      Exercise strings can be rendered with factory.format_exercises(operands).
+      Operands of factories without batch mode are a structured array of coefficients
+      and relation codes, solved by factory.solve_batch(operands['coefficients'], operands['relation']).
+    """
+    if not _batch_mode(factory_class) and not _coefficients_mode(factory_class):
+        raise TypeError(f"{factory_class.__name__} does not support batch generation")
+
+    # Shapes and types of the buffers are taken from a tiny local batch
+    probe, probe_solutions = _draw(factory_class, level, 1, np.random.SeedSequence(0))
+    operands_shape = (amount,) + probe.shape[1:]
+
+    shards = math.ceil(amount / shard_size)
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+
+    operands_size = math.prod(operands_shape) * probe.dtype.itemsize
+    solutions_size = amount * probe_solutions.dtype.itemsize
+    # Shared memory cannot be empty, even for amount = 0
+    operands_memory = shared_memory.SharedMemory(create=True, size=max(1, operands_size))
+    solutions_memory = shared_memory.SharedMemory(create=True, size=max(1, solutions_size))
+    try:
+        # Whole dtypes are passed, their string form would drop fields of structured solutions
+        operands_buffer = (operands_memory.name, operands_shape, probe.dtype)
+        solutions_buffer = (solutions_memory.name, (amount,), probe_solutions.dtype)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_generate_shard, factory_class, level, shard * shard_size,
+                                min((shard + 1) * shard_size, amount), seeds[shard],
+                                operands_buffer, solutions_buffer)
+                for shard in range(shards)
+            ]
+            for future in futures:
+                future.result()
+
+        # Copy out of shared memory, so buffers can be released
+        operands = np.ndarray(operands_shape, dtype=probe.dtype, buffer=operands_memory.buf).copy()
+        solutions = np.ndarray((amount,), dtype=probe_solutions.dtype, buffer=solutions_memory.buf).copy()
+    finally:
+        operands_memory.close()
+        operands_memory.unlink()
+        solutions_memory.close()
+        solutions_memory.unlink()
+
+    return operands, solutions
+
+
+if __name__ == "__main__":
+    from MathGenerator.arithmetic.factories import AdditionFactory
+
+    operands, solutions = generate_parallel(AdditionFactory, level=3, amount=10, seed=2024, workers=2, shard_size=4)
+    print(f"Exercises: {AdditionFactory().format_exercises(operands)}")
+    print(f"Solutions: {solutions}")
@@ -0,0 +1,90 @@
+"""
+Indexes of exercises already generated, used by ExerciseFactory.generate_unique.
+
+HashIndex keeps the text of every exercise in a set and works for any factory.
+BitsetIndex keeps a single bit for every possible exercise of a level, which is far
+smaller than a set when many exercises are drawn from a small value space.
+"""
+from typing import Callable
+
+import numpy as np
+
+# Approximate memory of a single short exercise string kept in a set
+SET_ENTRY_BYTES = 100
+
+
+class HashIndex:
+    """Set of texts of exercises."""
+    # Indexes never take a new exercise for one already added, see MathGenerator.history.HistoryIndex
+    exact = True
+
+    def __init__(self):
+        self.seen = set()
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def add(self, exercises: list, limit: int | None = None) -> list:
+        """
+        Adds at most limit exercises which are not in the index yet, in order.
+        Returns flags of exercises added now, duplicates within exercises are added once.
+        """
+        limit = len(exercises) if limit is None else limit
+        added = []
+        for exercise in exercises:
+            key = str(exercise)
+            fresh = limit > 0 and key not in self.seen
+            if fresh:
+                self.seen.add(key)
+                limit -= 1
+            added.append(fresh)
+        return added
+
+
+class BitsetIndex:
+    """
+    Bitset over the value space of a level, one bit per possible exercise.
+
+    Parameters:
+    - size (int): Number of possible exercises, codes are in [0, size).
+    - codes (Callable): Maps a list of exercises into an array of their codes.
+    """
+    exact = True
+
+    def __init__(self, size: int, codes: Callable[[list], np.ndarray]):
+        self.size = size
+        self.codes = codes
+        self.bits = np.zeros((size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, exercises: list, limit: int | None = None) -> np.ndarray:
+        """Same as HashIndex.add, all exercises of the batch are checked at once."""
+        added = np.zeros(len(exercises), dtype=bool)
+        if not exercises:
+            return added
+        codes = np.asarray(self.codes(exercises), dtype=np.int64)
+        distinct, first = np.unique(codes, return_index=True)
+        fresh = (self.bits[distinct >> 3] & (1 << (distinct & 7))) == 0
+
+        # First occurrences of new codes, in the order of exercises
+        positions = np.sort(first[fresh])[:limit]
+        kept = codes[positions]
+        # Several codes may share a byte, so bits are set with unbuffered bitwise_or.at
+        np.bitwise_or.at(self.bits, kept >> 3, (1 << (kept & 7)).astype(np.uint8))
+        self.count += len(positions)
+        added[positions] = True
+        return added
+
+
+def create_index(amount: int, size: int | None = None,
+                 codes: Callable[[list], np.ndarray] | None = None) -> HashIndex | BitsetIndex:
+    """
+    Chooses index for amount exercises drawn from a value space of size exercises.
+    Bitset is used once it takes less memory than a set of amount exercises.
+    """
+    if size is not None and codes is not None and size // 8 <= amount * SET_ENTRY_BYTES:
+        return BitsetIndex(size, codes)
+    return HashIndex()
@@ -1,16 +1,27 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from datetime import datetime
+import logging
 import os
+import shutil
+import subprocess
+import tempfile
+import uuid
 
 from pylatex import (Document, StandAloneGraphic, LineBreak,
                      Section, PageStyle, Head, MiniPage,
-                     Foot, LargeText, Figure, NoEscape)
+                     Foot, LargeText, Figure, Center, NoEscape)
+from pylatex.errors import CompilerError
 from pylatex.utils import bold
 
 from PDFGenerator import constants as const
 from PDFGenerator import utils
 
+# Replace backslashes due to LaTeX Syntax
+PDF_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'PDFs').replace('\\', "/")
+
+logger = logging.getLogger(__name__)
+
 
 class PDFBuilder(ABC):
     """
@@ -19,14 +30,25 @@ class PDFBuilder(ABC):
     """
 
     geometry_settings = {"margin": "0.7in"}
-    header = PageStyle("header")
+    # Parent directory of workspaces, None for the system temporary directory
+    workspace_root = None
+    # Processes rendering plots of solutions, None for the number of CPUs, 0 for rendering in this process
+    plot_workers = None
+    # 'matplotlib' includes PNG plots, 'pgfplots' draws them with LaTeX from the coefficients
+    plot_backend = 'matplotlib'
 
     def __init__(self):
         self._setup_document()
+        # Images of plots rendered by prepare_solutions, by numerator
+        self.plots = {}
+        # Temporary directory of the document being built, created on first use
+        self._workspace = None
 
     def _setup_document(self):
         """Initializes the PDF file with template."""
         self.doc = Document(geometry_options=self.geometry_settings)
+        # Every document gets its own header, a shared one would collect the headers of all documents
+        self.header = PageStyle("header")
         with self.header.create(Head("L")):
             self.header.append(LargeText("Date: "))
             self.header.append(LargeText(datetime.now().strftime("%d.%b.%Y")))
@@ -69,16 +91,57 @@ class PDFBuilder(ABC):
         """Inserts a solution into the PDF."""
         pass
 
-    def generate(self, filename,
-                 filepath: str = os.path.join(
-                     # Replace backslashes due to LaTeX Syntax
-                     os.path.dirname(os.path.dirname(__file__)), 'PDFs').replace('\\', "/")
-                 ) -> None:
-        self.doc.generate_pdf(filepath=f"{filepath}/{filename}",
+    def prepare_solutions(self, solutions: dict) -> None:
+        """Called before solutions are inserted, builders with plots render all of them at once."""
+        pass
+
+    @property
+    def workspace(self) -> str:
+        """
+        Temporary directory of the document being built: images of plots, .tex and output files.
+        Builders running at once in threads or processes never share files, the directory is
+        removed by generate.
+        """
+        if self._workspace is None:
+            self._workspace = tempfile.mkdtemp(prefix='math-helper-', dir=self.workspace_root)
+        return self._workspace
+
+    def workspace_file(self, path: str) -> str:
+        """Links file into the workspace, so e.g. an image evicted from the plot cache stays until compiled."""
+        target = os.path.join(self.workspace, os.path.basename(path))
+        if not os.path.exists(target):
+            try:
+                os.link(path, target)
+            except OSError:
+                # Hard links fail across file systems
+                shutil.copyfile(path, target)
+        # Replace backslashes due to LaTeX Syntax
+        return target.replace('\\', "/")
+
+    def generate(self, filename, filepath: str = PDF_DIRECTORY) -> None:
+        """
+        Compiles the document in the workspace, then moves the PDF into filepath at once,
+        so a PDF of the same name built at the same time is replaced but never mixed with it.
+        """
+        try:
+            self._compile(filename)
+            os.makedirs(filepath, exist_ok=True)
+            output = os.path.join(filepath, f"{filename}.pdf")
+            temporary = f"{output}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(os.path.join(self.workspace, f"{filename}.pdf"), temporary)
+            os.replace(temporary, output)
+        finally:
+            shutil.rmtree(self.workspace, ignore_errors=True)
+            self._workspace = None
+            self._setup_document()
+            self.plots = {}
+            utils.Plot.close()
+
+    def _compile(self, filename: str) -> None:
+        """Writes and compiles the document into filename.pdf in the workspace."""
+        self.doc.generate_pdf(filepath=os.path.join(self.workspace, filename),
                               compiler='pdflatex',
                               clean_tex=True)
-        self._setup_document()
-        utils.Plot.remove()
 
 
 class ArithmeticPDFBuilder(PDFBuilder):
@@ -105,8 +168,74 @@ class ArithmeticPDFBuilder(PDFBuilder):
             pass
 
 
+class StreamingArithmeticPDFBuilder(ArithmeticPDFBuilder):
+    """
+    Arithmetic builder writing every exercise and solution straight into the .tex file
+    of the workspace, instead of keeping a pylatex Section of each until generate.
+    Memory does not grow with the number of exercises, pylatex renders the preamble only.
+    """
+    tex_name = 'document.tex'
+    # Sections as pylatex writes them, without the labels nothing refers to
+    _exercise_line = (r"\section*{{" + utils.EXERCISE_TEMPLATE + "}}%\n").format
+    _solution_line = (r"\section*{{" + utils.SOLUTION_TEMPLATE + "}}%\n").format
+    _tex = None
+
+    def _setup_document(self):
+        super()._setup_document()
+        if self._tex is not None:
+            self._tex.close()
+            self._tex = None
+
+    @property
+    def tex(self):
+        """The .tex file, opened with the preamble written on first use"""
+        if self._tex is None:
+            self._tex = open(os.path.join(self.workspace, self.tex_name), 'w', encoding='utf-8')
+            # Document without content ends with \end{document} alone, the rest is the preamble
+            self._tex.write(self.doc.dumps()[:-len(r"\end{document}")])
+        return self._tex
+
+    def insert_title(self, title: str) -> None:
+        title_page = MiniPage(align='c')
+        title_page.append(LargeText(bold(title)))
+        self.tex.write(title_page.dumps() + "%\n")
+
+    def insert_exercise(self, numerator: int, exercise: str) -> None:
+        self.tex.write(self._exercise_line(numerator=numerator, exercise=utils.latexify(str(exercise)), end_line="= ?"))
+
+    def insert_solution(self, numerator: int, exercise: str, solution) -> None:
+        self.tex.write(self._solution_line(numerator=numerator, exercise=utils.latexify(str(exercise)),
+                                           comparison_operator="=", solution=utils.latexify(solution)))
+
+    def finish_tex(self) -> str:
+        """Ends the document and closes the .tex file, returns its path."""
+        self.tex.write("\\end{document}\n")
+        self._tex.close()
+        self._tex = None
+        return os.path.join(self.workspace, self.tex_name)
+
+    def _compile(self, filename: str) -> None:
+        tex_path = self.finish_tex()
+        try:
+            subprocess.run(['pdflatex', '--interaction=nonstopmode', f"-jobname={filename}", tex_path],
+                           cwd=self.workspace, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True)
+        except FileNotFoundError:
+            raise CompilerError("pdflatex was not found, make sure it is installed") from None
+        except subprocess.CalledProcessError as e:
+            # Errors of the document are reported only in the output of pdflatex
+            logger.error(f'pdflatex failed to compile {filename}:\n{e.output.decode(errors="replace")}')
+            raise
+
+
 class QuadraticPDFBuilder(PDFBuilder):
 
+    def prepare_solutions(self, solutions: dict) -> None:
+        if self.plot_backend == 'pgfplots':
+            return
+        paths = utils.Plot.render_all('quadratic', list(solutions.items()), workers=self.plot_workers)
+        # Linked at once, before other builds may evict the images from the plot cache
+        self.plots = {numerator: self.workspace_file(path) for numerator, path in enumerate(paths, 1)}
+
     def insert_exercise(self, numerator: int, exercise: str) -> None:
         with self.doc.create(
             Section(utils.quadratic_exercise_string(numerator=numerator,exercise=exercise), numbering=False)
@@ -119,16 +248,28 @@ class QuadraticPDFBuilder(PDFBuilder):
         ):
             self.doc.append(utils.quadratic_solution_string(roots=solution['roots'],
                                                             delta=solution['delta']))
-            img_path = utils.Plot.path(numerator=numerator)
-            utils.Plot.quadratic(numerator=numerator,
-                                 exercise=exercise,
-                                 solution=solution)
-            with self.doc.create(Figure(position="h!")) as plot:
-                plot.add_image(img_path, width=NoEscape(rf'{const.QUADRATIC_TEXTWIDTH}\textwidth'))
+            width = NoEscape(rf'{const.QUADRATIC_TEXTWIDTH}\textwidth')
+            if self.plot_backend == 'pgfplots':
+                with self.doc.create(Center()):
+                    self.doc.append(utils.TikzPlot.quadratic(exercise=exercise, solution=solution, width=width))
+            else:
+                img_path = self.plots[numerator] if numerator in self.plots \
+                    else self.workspace_file(utils.Plot.quadratic(exercise=exercise, solution=solution))
+                with self.doc.create(Figure(position="h!")) as plot:
+                    plot.add_image(img_path, width=width)
 
 
 class LinearPDFBuilder(PDFBuilder):
 
+    def prepare_solutions(self, solutions: dict) -> None:
+        if self.plot_backend == 'pgfplots':
+            return
+        paths = utils.Plot.render_all('linear', [(solution,) for solution in solutions.values()],
+                                      workers=self.plot_workers)
+        # Linked at once, before other builds may evict the images from the plot cache
+        self.plots = {numerator: None if path is None else self.workspace_file(path)
+                      for numerator, path in enumerate(paths, 1)}
+
     def insert_exercise(self, numerator: int, exercise: str) -> None:
         with self.doc.create(
             Section(utils.linear_exercise_string(numerator=numerator, exercise=exercise), numbering=False)
@@ -140,12 +281,23 @@ class LinearPDFBuilder(PDFBuilder):
             Section(utils.linear_exercise_string(numerator=numerator, exercise=exercise), numbering=False)
         ):
             self.doc.append(utils.linear_solution_string(solution=solution))
-            if utils.Plot.linear(numerator=numerator, solution=solution):
-                img_path = utils.Plot.path(numerator=numerator)
-                with self.doc.create(Figure(position="h!")) as plot:
-                    plot.add_image(img_path, width=NoEscape(fr'{const.LINEAR_TEXTWIDTH}\textwidth'))
+            width = NoEscape(fr'{const.LINEAR_TEXTWIDTH}\textwidth')
+            # pgfplots code or path of the image, None for solutions without a plot
+            if self.plot_backend == 'pgfplots':
+                picture = utils.TikzPlot.linear(solution=solution, width=width)
+            elif numerator in self.plots:
+                picture = self.plots[numerator]
             else:
+                path = utils.Plot.linear(solution=solution)
+                picture = None if path is None else self.workspace_file(path)
+            if picture is None:
                 self.doc.append(NoEscape(fr"\vspace{{{const.LINEAR_NO_PLOT_BREAK}}}"))
+            elif self.plot_backend == 'pgfplots':
+                with self.doc.create(Center()):
+                    self.doc.append(picture)
+            else:
+                with self.doc.create(Figure(position="h!")) as plot:
+                    plot.add_image(picture, width=width)
 
 
 class Director:
@@ -166,7 +318,7 @@ class Director:
     def builder(self, builder: PDFBuilder) -> None:
         self._builder = builder
 
-    def build_exercises(self, title: str, exercises: list, filename: str) -> None:
+    def build_exercises(self, title: str, exercises: list, filename: str, filepath: str = PDF_DIRECTORY) -> None:
         """
         Constructs a PDF document with exercises, including
         a title, a series of exercises, and a header.
@@ -174,16 +326,18 @@ class Director:
         self.builder.insert_title(title=title)
         for i, exercise in enumerate(exercises, 1):
             self.builder.insert_exercise(numerator=i, exercise=exercise)
-        self.builder.generate(filename)
+        self.builder.generate(filename, filepath=filepath)
 
-    def build_solutions(self, title, exercises: dict, filename: str) -> None:
+    def build_solutions(self, title, exercises: dict, filename: str, filepath: str = PDF_DIRECTORY) -> None:
         """
         Constructs a PDF document with solutions, including a title, a series of exercises, and a header.
         """
         self.builder.insert_title(title=title)
+        # Plots of all solutions are rendered before the document is built
+        self.builder.prepare_solutions(exercises)
         for i, (exercise, solution) in enumerate(exercises.items(), 1):
             self.builder.insert_solution(numerator=i, exercise=exercise, solution=solution)
-        self.builder.generate(filename)
+        self.builder.generate(filename, filepath=filepath)
 
     def build_exam(self):
         pass
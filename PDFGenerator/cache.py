@@ -0,0 +1,132 @@
+"""
+Content-addressed cache of plot images, shared between documents and runs.
+
+Images are named by a hash of everything the plot is drawn from (figure, coefficients,
+operator, ...), so the same plot is rendered once and reused by every later document.
+Least recently used images are removed once the directory outgrows max_bytes. Use time
+is the mtime of the image, refreshed on every hit, so the order survives between runs.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    bytes: int
+
+
+class PlotCache:
+    """
+    Directory of PNG images of plots named by their keys.
+
+    Parameters:
+    - directory (str): Directory of the images, created on first use.
+    - max_bytes (int): Total size of images kept, has to hold at least the plots of a single document.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        # Sizes of images by key, the least recently used first
+        self._files = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(spec: tuple) -> str:
+        """Hash of the inputs of a plot, spec holds only numbers and strings so its repr is stable."""
+        return hashlib.blake2b(repr(spec).encode(), digest_size=16).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _scan(self) -> OrderedDict:
+        """Sizes of images in the directory by key, the least recently used first."""
+        os.makedirs(self.directory, exist_ok=True)
+        # Images used within one tick of the clock have the same mtime, they keep the order known here
+        known = {key: rank for rank, key in enumerate(self._files or ())}
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.png'):
+                key, stat = entry.name[:-len('.png')], entry.stat()
+                entries.append((stat.st_mtime_ns, known.get(key, -1), key, stat.st_size))
+        return OrderedDict((key, size) for _, _, key, size in sorted(entries))
+
+    def _index(self) -> OrderedDict:
+        if self._files is None:
+            self._files = self._scan()
+        return self._files
+
+    def lookup(self, keys: list) -> list:
+        """
+        Flags of keys with an image in the cache, the images found become the most recently used.
+        Counters are per key, so repeated key is a hit after its first occurrence, as it is rendered once.
+        """
+        found, counted = {}, set()
+        with self._lock:
+            files = self._index()
+            for key in keys:
+                if key not in found:
+                    try:
+                        # Images written or evicted by other processes are noticed here
+                        os.utime(self.path(key))
+                        files[key] = os.path.getsize(self.path(key))
+                        files.move_to_end(key)
+                        found[key] = True
+                    except FileNotFoundError:
+                        files.pop(key, None)
+                        found[key] = False
+                if found[key] or key in counted:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                counted.add(key)
+        return [found[key] for key in keys]
+
+    def store(self, keys: list) -> None:
+        """Registers images just written for keys, then evicts the least recently used other ones."""
+        if not keys:
+            return
+        with self._lock:
+            # Other processes write and evict images of the same directory, so it is read again
+            self._files = files = self._scan()
+            for key in keys:
+                files[key] = os.path.getsize(self.path(key))
+                files.move_to_end(key)
+
+            total = sum(files.values())
+            kept = set(keys)
+            for key in list(files):
+                if total <= self.max_bytes:
+                    break
+                if key in kept:
+                    continue
+                total -= files.pop(key)
+                self.evictions += 1
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+
+    def cache_info(self) -> CacheInfo:
+        """Counters of plots found and rendered, number and total size of images, like functools.lru_cache."""
+        with self._lock:
+            files = self._index()
+            return CacheInfo(self.hits, self.misses, self.evictions, len(files), sum(files.values()))
+
+    def clear(self) -> None:
+        """Removes all images and resets counters."""
+        with self._lock:
+            for key in self._index():
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+            self._files = OrderedDict()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,86 @@
+"""
+Matplotlib figures of PDFGenerator.utils.Plot, imported with the first plot rendered,
+so documents with pgfplots never import Matplotlib.
+"""
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class LinearFigure:
+    """Number line of a linear solution: point at x and arrows towards the solutions"""
+    savefig_kwargs = {'bbox_inches': 'tight'}
+    arrow_kwargs = {'linewidth': 2.5, 'head_width': 0.25, 'head_length': 0.5, 'fc': 'blue', 'ec': 'blue'}
+
+    def __init__(self):
+        self.figure = Figure(figsize=(6, 1))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+        # Limits of y stay the same, arrows stop working without them
+        self.ax.set_ylim(-1, 1)
+        self.ax.axes.yaxis.set_visible(False)
+        # Draw a line for the x-axis
+        self.ax.axhline(0, color='black', lw=1)
+        self.point = self.ax.scatter([0], [0], s=75, edgecolors='red', linewidths=1.5, marker='o')
+        # Arrows indicating the inequality, moved to the point of every plot
+        self.greater = self.ax.arrow(0.17, 0, 4, 0, **self.arrow_kwargs)
+        self.less = self.ax.arrow(-0.13, 0, -4, 0, **self.arrow_kwargs)
+        self.ax.set_xlabel('x')
+        self.ax.grid(False)
+
+    def draw(self, x_value: float, operator: str, closed: bool) -> Figure:
+        self.ax.set_xlim(x_value - 5, x_value + 5)
+        self.point.set_offsets([[x_value, 0]])
+        # Filled circle for the closed ends, empty for the open ones
+        self.point.set_facecolor('red' if closed else 'none')
+        self.greater.set_data(x=x_value + 0.17)
+        self.greater.set_visible('>' in operator)
+        self.less.set_data(x=x_value - 0.13)
+        self.less.set_visible('<' in operator)
+        return self.figure
+
+
+class QuadraticFigure:
+    """Parabola with its roots and the solutions of inequality filled"""
+    savefig_kwargs = {}
+
+    def __init__(self):
+        self.figure = Figure(figsize=(4, 3))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+        self.parabola, = self.ax.plot([], [], lw=2.5, color='blue')
+        self.ax.axhline(0, color='black', linewidth=1)
+        self.ax.axvline(0, color='black', linewidth=1)
+        self.ax.set_xlabel('x')
+        self.ax.set_ylabel('y')
+        self.ax.grid(False)
+        # Filled area of the previous plot, collections of fill_between cannot be updated before Matplotlib 3.10
+        self.fill = None
+        self.roots = self.ax.scatter([], [], zorder=5, s=35, edgecolors='red', linewidths=1.5)
+
+    def draw(self, coefficients: tuple, x_range: tuple, label: str, roots: tuple, relation: str) -> Figure:
+        a, b, c = coefficients
+        x = np.linspace(*x_range, 400)
+        y = a * x ** 2 + b * x + c
+        self.parabola.set_data(x, y)
+        self.parabola.set_label(label)
+
+        # Fill settings
+        if self.fill is not None:
+            self.fill.remove()
+            self.fill = None
+        fill = (y > 0) if '>' in relation else ((y < 0) if '<' in relation else None)
+        if fill is not None:
+            self.fill = self.ax.fill_between(x, y, 0, where=fill, color='gray', alpha=0.7, hatch='//')
+
+        self.roots.set_offsets(np.column_stack((roots, np.zeros(len(roots)))))
+        # = indicates that scatter must be filled
+        self.roots.set_facecolor('red' if '=' in relation else 'none')
+
+        # Limits follow the parabola and the axes, like for a new figure
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.legend()
+        return self.figure
@@ -1,11 +1,14 @@
 from fractions import Fraction
-import glob
 import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
-import numpy as np
-import matplotlib.pyplot as plt
 from pylatex import NoEscape
+from pylatex import tikz
+
+from MathGenerator.algebra import parser
+from PDFGenerator.cache import PlotCache
 
 
 def decimal_to_fraction(expression):
@@ -27,17 +30,22 @@ def decimal_to_fraction(expression):
     return expression
 
 
+def latex_number(number):
+    """Converts a single number into LaTeX formatted fraction"""
+    return decimal_to_fraction(str(number))
+
+
 def extract_quadratic_coefficients(exercise: str):
-    # Normalize exercise
-    exercise = re.split('=|<|>|<=|>=', exercise.replace(' ', ''))[0]
-    # Extraction coefficients a, b, c
-    coeffs = re.findall(r'(-?\d*\.?\d*)x\^2|(-?\d*\.?\d*)x|(-?\d*\.?\d+)', exercise)
-    a = int(coeffs[0][0] if coeffs[0][0] != '' and coeffs[0][0] != '+' and coeffs[0][0] != '-' else (
-        '1' if coeffs[0][0] == '' or coeffs[0][0] == '+' else '-1'))
-    b = int(coeffs[1][1] if coeffs[1][1] != '' and coeffs[1][1] != '+' and coeffs[1][1] != '-' else (
-        '1' if coeffs[1][1] == '' or coeffs[1][1] == '+' else '-1'))
-    c = float(coeffs[2][2] if coeffs[2][2] else 0)
-    return a, b, c
+    # Left side of exercise, the right one is always 0
+    left, _, _ = parser.parse_exercise(exercise)
+    a, b, c = parser.coefficients(left, degree=2)
+    return int(a), int(b), float(c)
+
+
+def quadratic_coefficients(exercise):
+    """Returns coefficients of exercise, structured records carry them and are not parsed"""
+    coefficients = getattr(exercise, 'coefficients', None)
+    return coefficients if coefficients is not None else extract_quadratic_coefficients(exercise)
 
 
 def latexify(text):
@@ -48,18 +56,26 @@ def latexify(text):
     return text.replace('%', '\\%')
 
 
+# Templates of exercise_string and solution_string, also formatted directly by builders writing LaTeX
+EXERCISE_TEMPLATE = r"{numerator}.~~~{exercise} {end_line}"
+SOLUTION_TEMPLATE = r"{numerator}.~~~{exercise} {comparison_operator} {solution}"
+
+
 def exercise_string(numerator, exercise, end_line):
-    return NoEscape(rf"{numerator}.~~~{latexify(exercise)} {end_line}")
+    return NoEscape(EXERCISE_TEMPLATE.format(numerator=numerator, exercise=latexify(str(exercise)), end_line=end_line))
 
 
 def solution_string(numerator, exercise, comparison_operator, solution):
-    return NoEscape(rf"{numerator}.~~~{latexify(exercise)} {comparison_operator} {latexify(solution)}")
+    return NoEscape(SOLUTION_TEMPLATE.format(numerator=numerator, exercise=latexify(str(exercise)),
+                                             comparison_operator=comparison_operator, solution=latexify(solution)))
 
 
 def linear_exercise_string(numerator, exercise):
-    exercise = exercise.replace('<=', r'\leq')
-    exercise = exercise.replace('>=', r'\geq')
-    return NoEscape(rf"{numerator}.~~~$${latexify(decimal_to_fraction(exercise))}$$")
+    # Structured records carry integers only, so there are no decimals to convert
+    text = decimal_to_fraction(exercise) if isinstance(exercise, str) else str(exercise)
+    text = text.replace('<=', r'\leq')
+    text = text.replace('>=', r'\geq')
+    return NoEscape(rf"{numerator}.~~~$${latexify(text)}$$")
 
 
 def linear_solution_string(solution):
@@ -79,10 +95,16 @@ def linear_solution_string(solution):
 
 
 def quadratic_exercise_string(numerator, exercise):
-    exercise = exercise.replace('<=', r'\leq')
-    exercise = exercise.replace('>=', r'\geq')
+    if not isinstance(exercise, str):
+        # Structured record renders its constant term as a fraction without parsing
+        text = exercise.render(number_format=latex_number)
+        text = text.replace('<=', r'\leq')
+        text = text.replace('>=', r'\geq')
+        return NoEscape(rf"{numerator}.~~~$${latexify(text)}$$")
     # TODO: Temporary solution. Parentheses must be implemented in generator
     a, b, c = extract_quadratic_coefficients(exercise)
+    exercise = exercise.replace('<=', r'\leq')
+    exercise = exercise.replace('>=', r'\geq')
     for coeff in [b, c]:
         exercise = exercise.replace(str(coeff), f"({coeff})") if coeff < 0 else exercise
     return NoEscape(rf"{numerator}.~~~$${latexify(decimal_to_fraction(exercise))}$$")
@@ -102,117 +124,211 @@ def quadratic_solution_string(roots, delta):
     return NoEscape(r'\begin{center}\Large $' + solution_text + r'$ \end{center}')
 
 
+def linear_plot_point(solution: str) -> tuple | None:
+    """Operator and the point of linear solution on a number line, None for solutions without a plot"""
+    match = re.match(r"x\s*([<>=]+)\s*([-+]?[\d.]+)", solution)
+    if match is None:
+        return None
+    return match.group(1), float(match.group(2))
+
+
+def quadratic_plot_range(a: float, b: float, solution: dict) -> tuple:
+    """Range of x plotted for quadratic solution and the roots marked on it"""
+    if isinstance(solution['roots'], tuple):
+        # If roots exist, use them to determine the x range for plotting
+        roots = solution['roots']
+        x_range = max(roots) - min(roots)
+        x_range = x_range if x_range != 0 else 2
+        return (min(roots) - 0.5 * x_range, max(roots) + 0.5 * x_range), roots
+    # If no real roots, use a default range centered at the vertex
+    vertex_x = -b / (2 * a)
+    return (vertex_x - 2, vertex_x + 2), ()
+
+
 class Plot:
+    """
+    Renders plots of solutions into PNG files of Plot.cache, named by a hash of the plot inputs,
+    so the same plot is rendered once for all documents and runs. Every plot type has a single
+    figure, created on first use and drawn again for every plot, until close.
+    Figures are not registered in pyplot, so no figure is left open.
+    """
+    cache = PlotCache(os.path.join(os.path.dirname(__file__), 'plots'))
+    _figures = {}
+    # Drawing changes the shared figure, so plots are rendered one at a time
+    _lock = threading.Lock()
+
+    @classmethod
+    def figure(cls, name: str):
+        """Figure of PDFGenerator.figures by class name, Matplotlib is imported with the first one."""
+        if name not in cls._figures:
+            from PDFGenerator import figures
+            cls._figures[name] = getattr(figures, name)()
+        return cls._figures[name]
 
     @staticmethod
-    def path(numerator):
-        return os.path.join(os.path.dirname(__file__), f'plot{numerator}.png')
+    def linear_spec(solution: str) -> tuple | None:
+        """Figure and the arguments of its draw for linear solution, None for solutions without a plot"""
+        point = linear_plot_point(solution)
+        if point is None:
+            return None
+        operator, x_value = point
+        return 'LinearFigure', x_value, operator, '=' in solution
 
     @staticmethod
-    def linear(numerator: int, solution: str) -> bool:
-        match = re.match(r"x\s*([<>=]+)\s*([-+]?[\d.]+)", solution)
-        if match:
-            operator = match.group(1)
-            x_value = float(match.group(2))
-        else:
-            return False
-
-        plt.figure(figsize=(6, 1))
-        ax = plt.gca()
-
-        # Adjust the limits and remove y-axis
-        plt.xlim(x_value - 5, x_value + 5)
-        plt.ylim(-1, 1)  # Seems to be useless, but arrows stops working without it
-        ax.axes.yaxis.set_visible(False)
-
-        # Draw a line for the x-axis
-        plt.axhline(0, color='black', lw=1)
-
-        scatter_kwargs = {
-            'x': x_value,
-            'y': 0,
-            's': 75,  # size of the marker
-            'edgecolors': 'red',
-            'facecolor': 'red' if '=' in solution else None,
-            'linewidths': 1.5,
-            'marker': 'o',
-        }
-        plt.scatter(**scatter_kwargs)  # Red circle no fill
-
-        arrow_kwargs = {'linewidth': 2.5, 'head_width': 0.25, 'head_length': 0.5, 'fc': 'blue', 'ec': 'blue'}
-        # Add arrows indicating the inequality
-        if '>' in operator:
-            plt.arrow(x_value + 0.17, 0, 4, 0, **arrow_kwargs)
-        if '<' in operator:
-            plt.arrow(x_value - 0.13, 0, -4, 0, **arrow_kwargs)
-        plt.xlabel('x')
-        plt.grid(False)
-        plt.savefig(Plot.path(numerator=numerator), bbox_inches='tight')
-        return True
+    def quadratic_spec(exercise, solution: dict) -> tuple:
+        a, b, c = map(float, quadratic_coefficients(exercise))
+        # Records carry their operator, for strings the whole exercise is searched.
+        # Only the symbols of relation change the plot, so nothing else of it is a part of the key.
+        relation = getattr(exercise, 'operator', exercise)
+        relation = ''.join(symbol for symbol in '<>=' if symbol in relation)
+        x_range, roots = quadratic_plot_range(a, b, solution)
+        return ('QuadraticFigure', (a, b, c), x_range, f'y = {a:.1f}x^2 + {b:.1f}x + {c:.1f}',
+                tuple(map(float, roots)), relation)
 
     @staticmethod
-    def quadratic(numerator: int, exercise: str, solution: dict):
-        a, b, c = extract_quadratic_coefficients(exercise)
+    def linear(solution: str) -> str | None:
+        """Path of the number line of linear solution, None for solutions without a plot"""
+        return Plot.render_all('linear', [(solution,)])[0]
 
-        # Define the quadratic function
-        def f(x):
-            return a * x ** 2 + b * x + c
+    @staticmethod
+    def quadratic(exercise, solution: dict) -> str:
+        """Path of the parabola of quadratic solution"""
+        return Plot.render_all('quadratic', [(exercise, solution)])[0]
 
-        # Determine the x range for plotting
-        if isinstance(solution['roots'], tuple):
-            # If roots exist, use them to determine the x range for plotting
-            x_range = max(solution['roots']) - min(solution['roots'])
-            x_range = x_range if x_range != 0 else 2
-            x = np.linspace(min(solution['roots']) - 0.5 * x_range, max(solution['roots']) + 0.5 * x_range, 400)
-        else:
-            # If no real roots, use a default range centered at the vertex
-            vertex_x = -b / (2 * a)
-            x = np.linspace(vertex_x - 2, vertex_x + 2, 400)
-        y = f(x)
-
-        # Generate the plot
-        plt.figure(figsize=(4, 3))
-        plt.plot(x, y, label=f'y = {a:.1f}x^2 + {b:.1f}x + {c:.1f}', lw=2.5, color='blue')
-        plt.axhline(0, color='black', linewidth=1)
-        plt.axvline(0, color='black', linewidth=1)
-        plt.xlabel('x')
-        plt.ylabel('y')
-        plt.grid(False)
-
-        # Fill settings
-        fill = (y > 0) if '>' in exercise else ((y < 0) if '<' in exercise else None)
-        fill_kwargs = {'where': fill, 'color': 'gray', 'alpha': 0.7, 'hatch': '//'}
-
-        # Scatter settings
-        color = 'red' if '=' in exercise else None  # = indicates that scatter must be filled
-        scatter_kwargs = {'facecolors': color, 'zorder': 5, 's': 35, 'edgecolors': 'red', 'linewidths': 1.5}
-
-        # Check for delta and apply the appropriate fill and scatter properties
-        if solution['delta'] > 0:
-            # When delta is positive, plot the roots
-            plt.scatter(solution['roots'], [0, 0], **scatter_kwargs)
-            if fill is not None:
-                plt.fill_between(x, y, 0, **fill_kwargs)
-        elif solution['delta'] == 0:
-            # When delta is zero, plot the single root
-            plt.scatter(solution['roots'], [0], **scatter_kwargs)
-            if fill is not None:
-                plt.fill_between(x, y, 0, **fill_kwargs)
+    @staticmethod
+    def render_all(kind: str, plots: list, workers: int | None = None) -> list:
+        """
+        Paths of plots of the kind ('linear' or 'quadratic'), every item of plots is a tuple
+        of arguments of that method. Plots missing in the cache are rendered once each, in a pool
+        of processes, as Matplotlib is not thread-safe, or in this process with workers=0.
+        """
+        specs = [getattr(Plot, f'{kind}_spec')(*arguments) for arguments in plots]
+        keys = [None if spec is None else Plot.cache.key(spec) for spec in specs]
+        drawn = [(key, spec) for key, spec in zip(keys, specs) if key is not None]
+        found = Plot.cache.lookup([key for key, _ in drawn])
+        missing = dict(item for item, hit in zip(drawn, found) if not hit)
+        paths = [Plot.cache.path(key) for key in missing]
+
+        if workers == 0 or len(missing) < 2:
+            for spec, path in zip(missing.values(), paths):
+                _render_plot(spec, path)
         else:
-            # When delta is negative, no real roots to plot, but the parabola still needs to be shown
-            if fill is not None:
-                plt.fill_between(x, y, 0, **fill_kwargs)
+            workers = workers or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Every worker renders chunks of plots on its own figures
+                chunksize = max(1, len(missing) // (4 * workers))
+                list(executor.map(_render_plot, missing.values(), paths, chunksize=chunksize))
+        Plot.cache.store(list(missing))
+        return [None if key is None else Plot.cache.path(key) for key in keys]
+
+    @staticmethod
+    def close():
+        """Drops the figures, the next plot creates them again."""
+        with Plot._lock:
+            for figure in Plot._figures.values():
+                figure.figure.clear()
+            Plot._figures.clear()
+
+
+class TikzPlot:
+    """
+    Draws plots of solutions as pgfplots code from the coefficients, compiled by pdflatex
+    along with the document. No image is written, so there is nothing to render in advance.
+    Returned pylatex objects bring the tikz and pgfplots packages into the preamble.
+    """
+    arrow = r"\draw[blue, line width=2.5pt, -stealth] (axis cs:{start:g},0) -- (axis cs:{end:g},0);"
+
+    @staticmethod
+    def _options(*options: str) -> list:
+        # Options are valid LaTeX already, escaping would break the minus signs
+        return [NoEscape(option) for option in options]
 
-        plt.legend()
-        plt.savefig(Plot.path(numerator=numerator))
+    @staticmethod
+    def _axis_line(start: tuple, end: tuple) -> tikz.Plot:
+        return tikz.Plot(coordinates=[tuple(round(value, 4) for value in point) for point in (start, end)],
+                         options=TikzPlot._options('black', 'thin', 'forget plot'))
 
     @staticmethod
-    def remove():
-        files_to_remove = glob.glob(os.path.join(os.path.dirname(__file__), 'plot*'))
+    def _marks(points: list, size: str, closed: bool) -> tikz.Plot:
+        # Filled circle for the closed ends, empty for the open ones
+        return tikz.Plot(coordinates=[(round(x, 4), 0) for x in points], options=TikzPlot._options(
+            'only marks', 'mark=*', f'mark size={size}', 'red', 'forget plot',
+            f"mark options={{fill={'red' if closed else 'white'}}}"))
+
+    @staticmethod
+    def linear(solution: str, width: str) -> tikz.TikZ | None:
+        """Number line of linear solution, None for solutions without a plot like LinearPDFBuilder expects"""
+        point = linear_plot_point(solution)
+        if point is None:
+            return None
+        operator, x_value = point
+
+        picture = tikz.TikZ()
+        with picture.create(tikz.Axis(options=TikzPlot._options(
+                f'width={width}', 'height=2.5cm', f'xmin={x_value - 5:g}', f'xmax={x_value + 5:g}',
+                'ymin=-1', 'ymax=1', r'ytick=\empty', 'xlabel=$x$'))) as axis:
+            axis.append(TikzPlot._axis_line((x_value - 5, 0), (x_value + 5, 0)))
+            # Arrows indicating the inequality, the same as of the PNG plots
+            if '>' in operator:
+                axis.append(NoEscape(TikzPlot.arrow.format(start=x_value + 0.17, end=x_value + 4.67)))
+            if '<' in operator:
+                axis.append(NoEscape(TikzPlot.arrow.format(start=x_value - 0.13, end=x_value - 4.63)))
+            axis.append(TikzPlot._marks([x_value], size='3pt', closed='=' in solution))
+        return picture
+
+    @staticmethod
+    def quadratic(exercise, solution: dict, width: str) -> tikz.TikZ:
+        a, b, c = quadratic_coefficients(exercise)
+        # Records carry their operator, for strings the whole exercise is searched
+        relation = getattr(exercise, 'operator', exercise)
+        (x_start, x_end), roots = quadratic_plot_range(a, b, solution)
+
+        def f(x):
+            return a * x ** 2 + b * x + c
 
-        for file_path in files_to_remove:
-            os.remove(file_path)
+        # pgfmath reads -x^2 as (-x)^2, so coefficients are parenthesized
+        function = f"({a})*x^2 + ({b})*x + ({c})"
+        # Limits cover the parabola and both axes with a margin, like autoscaled Matplotlib axes
+        vertex_x = -b / (2 * a)
+        ys = [f(x_start), f(x_end), 0] + ([f(vertex_x)] if x_start <= vertex_x <= x_end else [])
+        xs = [x_start, x_end, 0]
+        x_margin, y_margin = 0.05 * (max(xs) - min(xs)), 0.05 * (max(ys) - min(ys))
+        x_min, x_max = min(xs) - x_margin, max(xs) + x_margin
+        y_min, y_max = min(ys) - y_margin, max(ys) + y_margin
+
+        picture = tikz.TikZ()
+        with picture.create(tikz.Axis(options=TikzPlot._options(
+                f'width={width}', f'xmin={x_min:g}', f'xmax={x_max:g}', f'ymin={y_min:g}', f'ymax={y_max:g}',
+                'xlabel=$x$', 'ylabel=$y$'))) as axis:
+            # Solutions of inequality are filled between the parabola and the x-axis
+            if '<' in relation or '>' in relation:
+                bounds = sorted([x_start, x_end, *(root for root in roots if x_start < root < x_end)])
+                for left, right in zip(bounds, bounds[1:]):
+                    middle = f((left + right) / 2)
+                    if (middle > 0) if '>' in relation else (middle < 0):
+                        axis.append(NoEscape(
+                            rf"\addplot[draw=none, fill=gray, fill opacity=0.7, forget plot, "
+                            rf"domain={left:g}:{right:g}, samples=50] {{{function}}} \closedcycle;"))
+            axis.append(TikzPlot._axis_line((x_min, 0), (x_max, 0)))
+            axis.append(TikzPlot._axis_line((0, y_min), (0, y_max)))
+            axis.append(tikz.Plot(func=function, name=NoEscape(f'$y = {a:.1f}x^2 + {b:.1f}x + {c:.1f}$'),
+                                  options=TikzPlot._options('blue', 'very thick', f'domain={x_start:g}:{x_end:g}',
+                                                            'samples=100')))
+            if roots:
+                # = indicates that marks must be filled
+                axis.append(TikzPlot._marks(list(roots), size='2pt', closed='=' in relation))
+        return picture
+
+
+def _render_plot(spec: tuple, path: str) -> None:
+    name, *arguments = spec
+    # Written under another name first, so no other document or process reads a partial image
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with Plot._lock:
+        figure = Plot.figure(name)
+        figure.draw(*arguments).savefig(temporary, format='png', **figure.savefig_kwargs)
+    os.replace(temporary, path)
 
 
 if __name__ == "__main__":
-    Plot.linear(1, "x <= 2")
+    Plot.linear("x <= 2")
@@ -0,0 +1,46 @@
+"""
+Compares the exercise-by-exercise generate and solve methods of arithmetic
+factories with the NumPy batch mode.
+
+Usage: python -m benchmarks.bench_arithmetic [AMOUNT]
+"""
+import logging
+import sys
+import timeit
+
+from MathGenerator.arithmetic import factories as arithmetic
+
+logging.disable(logging.INFO)
+
+FACTORIES = [
+    arithmetic.AdditionFactory,
+    arithmetic.MultiplicationFactory,
+    arithmetic.DivisionFactory,
+    arithmetic.ExactDivisionFactory,
+    arithmetic.RemainderDivisionFactory,
+    arithmetic.FractionAdditionFactory,
+    arithmetic.PercentAdditionFactory,
+]
+
+
+def report(name: str, loop: float, batch: float) -> None:
+    print(f"{name:<40}{loop:>10.3f}{batch:>12.3f}{loop / batch:>9.1f}x")
+
+
+def main(amount: int = 100_000, level: int = 5) -> None:
+    print(f"{'benchmark':<40}{'loop [s]':>10}{'batch [s]':>12}{'speedup':>10}")
+    for factory_class in FACTORIES:
+        factory = factory_class()
+        loop = min(timeit.repeat(lambda: factory.generate(level=level, amount=amount), number=1, repeat=3))
+        batch = min(timeit.repeat(lambda: factory.generate_batch(level=level, amount=amount), number=1, repeat=3))
+        report(f"{factory_class.__name__}.generate", loop, batch)
+
+        exercises = factory.generate_batch(level=level, amount=amount)
+        operands = factory.parse_operands(exercises)
+        loop = min(timeit.repeat(lambda: factory.solve(exercises), number=1, repeat=3))
+        batch = min(timeit.repeat(lambda: factory.solve_batch(operands), number=1, repeat=3))
+        report(f"{factory_class.__name__}.solve", loop, batch)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
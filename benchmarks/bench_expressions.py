@@ -0,0 +1,35 @@
+"""
+Benchmark of mixed-operator expressions: compiling into postfix Programs, and evaluating
+them one by one against the batch stack machine (ExpressionFactory.solve_batch).
+
+Usage: python -m benchmarks.bench_expressions [AMOUNT]
+"""
+import logging
+import sys
+import timeit
+
+from MathGenerator.arithmetic import expressions
+from MathGenerator.arithmetic.expressions import ExpressionFactory
+
+logging.disable(logging.INFO)
+
+
+def main(amount: int = 100_000) -> None:
+    print(f"{amount} expressions [s]")
+    print(f"{'level':<8}{'compile':>10}{'solve':>10}{'batch':>10}{'speedup':>10}{'from text':>12}")
+    for level in (2, 4, 6):
+        factory = ExpressionFactory(seed=level)
+        records = factory.generate(level=level, amount=amount, structured=True)
+        exercises = [str(record) for record in records]
+        uncached = expressions.compile_expression.__wrapped__
+
+        compile_time = min(timeit.repeat(lambda: [uncached(e) for e in exercises], number=1, repeat=3))
+        # Records carry compiled Programs, so solving them measures evaluation only
+        loop = min(timeit.repeat(lambda: factory.solve(records), number=1, repeat=3))
+        batch = min(timeit.repeat(lambda: factory.solve_batch(records), number=1, repeat=3))
+        from_text = min(timeit.repeat(lambda: factory.solve_batch(exercises), number=1, repeat=3))
+        print(f"{level:<8}{compile_time:>10.3f}{loop:>10.3f}{batch:>10.3f}{loop / batch:>9.1f}x{from_text:>12.3f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,39 @@
+"""
+Benchmark of the vectorized linear solver (SingleLinearFactory.solve_batch)
+against solving exercise by exercise.
+
+Usage: python -m benchmarks.bench_linear [AMOUNT]
+"""
+import logging
+import sys
+import timeit
+
+import numpy as np
+
+from MathGenerator.algebra import parser
+from MathGenerator.algebra.linear import SingleLinearFactory, LinearExercise
+
+logging.disable(logging.INFO)
+
+
+def main(amount: int = 1_000_000) -> None:
+    factory = SingleLinearFactory()
+    rng = np.random.default_rng(0)
+    coefficients = rng.integers(-15, 15, size=(amount, 4), endpoint=True)
+    relations = rng.integers(0, len(parser.RELATIONS), size=amount).astype(np.int8)
+
+    batch = min(timeit.repeat(lambda: factory.solve_batch(coefficients, relations), number=1, repeat=3))
+
+    # Scalar solve on a sample of records, so no time is spent on parsing
+    sample = min(amount, 100_000)
+    records = [LinearExercise(*row, parser.RELATIONS[relation])
+               for row, relation in zip(coefficients[:sample].tolist(), relations[:sample].tolist())]
+    loop = min(timeit.repeat(lambda: factory.solve(records), number=1, repeat=3)) * amount / sample
+
+    print(f"{amount} exercises")
+    print(f"solve (estimated from {sample}): {loop:.3f} s")
+    print(f"solve_batch: {batch:.3f} s ({loop / batch:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of the shared tokenizer (MathGenerator.algebra.parser) against
+the per-module regex parsing it replaced. Results of both are compared first.
+
+Usage: python -m benchmarks.bench_parser [AMOUNT]
+"""
+import logging
+import re
+import sys
+import timeit
+
+from MathGenerator.algebra import parser
+from MathGenerator.algebra.linear import SingleLinearFactory
+from MathGenerator.algebra.quadratic import QuadraticFactory
+
+logging.disable(logging.INFO)
+
+
+def regex_linear_coefficients(exercise: str):
+    """Former linear.extract_coefficients applied to both sides of exercise"""
+    operator = re.search(r"(<=|>=|<|>|=)", exercise).group(0)
+    sides = []
+    for expression in exercise.split(f" {operator} "):
+        expression = expression.replace(' ', '')
+        coeffs = re.findall(r'([+-]?\d*\.?\d*)x|([+-]?\d+\.?\d*)', expression)
+        a, b, found_x = 0, 0, False
+        for coeff_pair in coeffs:
+            if 'x' in expression and coeff_pair[0] != '':
+                a = a - 1 if coeff_pair[0] == '-' else a + float(coeff_pair[0])
+                found_x = True
+            if coeff_pair[1]:
+                b += float(coeff_pair[1])
+        if 'x' in expression and not found_x:
+            a = 1
+        sides.append((a, b))
+    return (*sides[0], operator, *sides[1])
+
+
+def regex_quadratic_coefficients(exercise: str):
+    """Former QuadraticFactory._extract_coefficients"""
+    clean_exercise = re.split(r'<=|>=|<|>|=', exercise.replace(" ", ""))[0]
+    coeffs = re.findall(r'(-?\d*\.?\d+|[-+]?)x\^2|(-?\d*\.?\d+|[-+]?)x|(-?\d*\.?\d+)', clean_exercise)
+
+    def coefficient(value):
+        return 1.0 if value in ['', '+'] else -1.0 if value == '-' else float(value)
+
+    return coefficient(coeffs[0][0]), coefficient(coeffs[1][1]), float(coeffs[2][2]) if coeffs[2][2] else 0.0
+
+
+def tokenizer_linear_coefficients(exercise: str, parse=parser.parse_exercise):
+    left, operator, right = parse(exercise)
+    return (*parser.coefficients(left, 1), operator, *parser.coefficients(right, 1))
+
+
+def tokenizer_quadratic_coefficients(exercise: str, parse=parser.parse_exercise):
+    left, _, _ = parse(exercise)
+    return tuple(float(coefficient) for coefficient in parser.coefficients(left, 2))
+
+
+def compare(name, exercises, regex_function, tokenizer_function):
+    assert [regex_function(e) for e in exercises] == [tokenizer_function(e) for e in exercises], name
+    uncached = parser.parse_exercise.__wrapped__
+
+    regex = min(timeit.repeat(lambda: [regex_function(e) for e in exercises], number=1, repeat=5))
+    cold = min(timeit.repeat(lambda: [tokenizer_function(e, uncached) for e in exercises], number=1, repeat=5))
+    [tokenizer_function(e) for e in exercises]
+    warm = min(timeit.repeat(lambda: [tokenizer_function(e) for e in exercises], number=1, repeat=5))
+    print(f"{name:<12}{regex:>12.3f}{cold:>16.3f}{warm:>16.3f}")
+
+
+def main(amount: int = 50_000) -> None:
+    linear = SingleLinearFactory(seed=0).generate(level=5, amount=amount)
+    quadratic = QuadraticFactory(seed=0).generate(level=5, amount=amount)
+
+    print(f"{amount} exercises [s]")
+    print(f"{'parser':<12}{'regex':>12}{'tokenizer':>16}{'cached':>16}")
+    compare("linear", linear, regex_linear_coefficients, tokenizer_linear_coefficients)
+    compare("quadratic", quadratic, regex_quadratic_coefficients, tokenizer_quadratic_coefficients)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,60 @@
+"""
+Writes the .tex of a solutions worksheet with the pylatex object tree of ArithmeticPDFBuilder
+and with StreamingArithmeticPDFBuilder, reporting time and peak memory traced while building.
+The documents are not compiled, so pdflatex is not needed.
+
+Usage: python -m benchmarks.bench_pdf_builders [AMOUNT]
+"""
+import logging
+import os
+import shutil
+import sys
+import time
+import tracemalloc
+
+from MathGenerator.arithmetic.factories import AdditionFactory
+from PDFGenerator.builder import ArithmeticPDFBuilder, StreamingArithmeticPDFBuilder
+
+logging.disable(logging.INFO)
+
+
+def build(builder, solutions: dict) -> None:
+    builder.insert_title(title="Solutions")
+    for numerator, (exercise, solution) in enumerate(solutions.items(), 1):
+        builder.insert_solution(numerator=numerator, exercise=exercise, solution=solution)
+
+
+def pylatex_tex(solutions: dict) -> str:
+    builder = ArithmeticPDFBuilder()
+    build(builder, solutions)
+    path = os.path.join(builder.workspace, 'solutions')
+    builder.doc.generate_tex(path)
+    return f"{path}.tex"
+
+
+def streaming_tex(solutions: dict) -> str:
+    builder = StreamingArithmeticPDFBuilder()
+    build(builder, solutions)
+    return builder.finish_tex()
+
+
+def main(amount: int = 10_000) -> None:
+    factory = AdditionFactory()
+    exercises = factory.generate(level=3, amount=amount)
+    solutions = dict(zip(exercises, factory.solve_batch(exercises).tolist()))
+
+    print(f"{amount} solutions")
+    print(f"{'builder':<16}{'time [s]':>10}{'peak [MB]':>12}{'.tex [kB]':>12}")
+    for name, write in (('pylatex', pylatex_tex), ('streaming', streaming_tex)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        path = write(solutions)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<16}{elapsed:>10.3f}{peak / 2 ** 20:>12.1f}{os.path.getsize(path) / 1024:>12.0f}")
+        shutil.rmtree(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,63 @@
+"""
+Wall time of rendering plots of a whole solutions PDF by QuadraticPDFBuilder.prepare_solutions
+and inserting the solutions, for different numbers of plot workers (0 renders in this process),
+every time into an empty plot cache. The last row builds the same PDF again from the warm cache.
+The document is not compiled, so pdflatex is not needed.
+
+Usage: python -m benchmarks.bench_pdf_plots [AMOUNT]
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from MathGenerator.algebra.quadratic import QuadraticFactory
+from PDFGenerator import utils
+from PDFGenerator.builder import QuadraticPDFBuilder
+from PDFGenerator.cache import PlotCache
+
+logging.disable(logging.INFO)
+
+
+def build(solutions: dict, workers: int) -> float:
+    builder = QuadraticPDFBuilder()
+    builder.plot_workers = workers
+    start = time.perf_counter()
+    builder.prepare_solutions(solutions)
+    for numerator, (exercise, solution) in enumerate(solutions.items(), 1):
+        builder.insert_solution(numerator=numerator, exercise=exercise, solution=solution)
+    return time.perf_counter() - start
+
+
+def cold_build(solutions: dict, workers: int) -> float:
+    utils.Plot.cache = PlotCache(tempfile.mkdtemp())
+    elapsed = build(solutions, workers)
+    shutil.rmtree(utils.Plot.cache.directory)
+    return elapsed
+
+
+def main(amount: int = 200) -> None:
+    factory = QuadraticFactory(seed=0)
+    exercises = factory.generate(level=3, amount=amount, structured=True)
+    solutions = factory.solve(exercises)
+
+    print(f"{amount} plots, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'time [s]':>10}{'speedup':>10}")
+    baseline = cold_build(solutions, workers=0)
+    print(f"{0:>8}{baseline:>10.3f}{1:>9.1f}x")
+    for workers in (1, 2, 4, 8):
+        elapsed = cold_build(solutions, workers=workers)
+        print(f"{workers:>8}{elapsed:>10.3f}{baseline / elapsed:>9.1f}x")
+
+    utils.Plot.cache = PlotCache(tempfile.mkdtemp())
+    build(solutions, workers=0)
+    elapsed = build(solutions, workers=0)
+    print(f"{'cached':>8}{elapsed:>10.3f}{baseline / elapsed:>9.1f}x")
+    print(utils.Plot.cache.cache_info())
+    shutil.rmtree(utils.Plot.cache.directory)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,94 @@
+"""
+Renders solution plots with the pooled Agg figures of PDFGenerator.utils.Plot
+and with a new pyplot figure per plot (never closed), as Plot used to do.
+Every renderer runs in a fresh process, so peak RSS is measured separately.
+
+Usage: python -m benchmarks.bench_plots [AMOUNT]
+"""
+import logging
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+logging.disable(logging.INFO)
+
+
+def pyplot_plots(exercises: list, solutions: dict) -> None:
+    """Former Plot.quadratic: a new pyplot figure for every plot"""
+    import warnings
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from PDFGenerator.utils import Plot, quadratic_coefficients
+
+    # pyplot warns about every figure above 20 kept open
+    warnings.simplefilter('ignore')
+    for numerator, exercise in enumerate(exercises):
+        solution = solutions[exercise]
+        a, b, c = quadratic_coefficients(exercise)
+        roots = solution['roots'] if isinstance(solution['roots'], tuple) else ()
+        if roots:
+            x_range = (max(roots) - min(roots)) or 2
+            x = np.linspace(min(roots) - 0.5 * x_range, max(roots) + 0.5 * x_range, 400)
+        else:
+            x = np.linspace(-b / (2 * a) - 2, -b / (2 * a) + 2, 400)
+        y = a * x ** 2 + b * x + c
+
+        plt.figure(figsize=(4, 3))
+        plt.plot(x, y, label=f'y = {a:.1f}x^2 + {b:.1f}x + {c:.1f}', lw=2.5, color='blue')
+        plt.axhline(0, color='black', linewidth=1)
+        plt.axvline(0, color='black', linewidth=1)
+        plt.xlabel('x')
+        plt.ylabel('y')
+        plt.scatter(roots, [0] * len(roots), zorder=5, s=35, edgecolors='red', linewidths=1.5)
+        if '<' in exercise.operator or '>' in exercise.operator:
+            plt.fill_between(x, y, 0, where=(y > 0) if '>' in exercise.operator else (y < 0),
+                             color='gray', alpha=0.7, hatch='//')
+        plt.legend()
+        plt.savefig(os.path.join(Plot.cache.directory, f'plot{numerator}.png'))
+
+
+def pooled_plots(exercises: list, solutions: dict) -> None:
+    from PDFGenerator.utils import Plot
+
+    for exercise in exercises:
+        Plot.quadratic(exercise=exercise, solution=solutions[exercise])
+    Plot.close()
+
+
+def measure(renderer: str, amount: int) -> tuple:
+    """Runs in a fresh process, returns time of the plots and peak RSS of the process."""
+    from MathGenerator.algebra.quadratic import QuadraticFactory
+    from PDFGenerator.cache import PlotCache
+    from PDFGenerator.utils import Plot
+
+    # Images go to an empty cache, so every plot is rendered
+    Plot.cache = PlotCache(tempfile.mkdtemp())
+    factory = QuadraticFactory(seed=0)
+    exercises = factory.generate(level=3, amount=amount, structured=True)
+    solutions = factory.solve(exercises)
+    start = time.perf_counter()
+    globals()[renderer](exercises, solutions)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(Plot.cache.directory)
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(amount: int = 1_000) -> None:
+    print(f"{'renderer':<20}{'time [s]':>10}{'plots/s':>10}{'peak RSS [MB]':>16}")
+    for renderer in ('pyplot_plots', 'pooled_plots'):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            elapsed, rss = executor.submit(measure, renderer, amount).result()
+        print(f"{renderer:<20}{elapsed:>10.3f}{amount / elapsed:>10.1f}{rss:>16.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,33 @@
+"""
+Benchmark of the batched polynomial solver (PolynomialFactory.solve_batch), which computes
+eigenvalues of stacked companion matrices at once, against numpy.roots per polynomial.
+
+Usage: python -m benchmarks.bench_polynomial [AMOUNT]
+"""
+import logging
+import sys
+import timeit
+
+import numpy as np
+
+from MathGenerator.algebra.polynomial import PolynomialFactory
+
+logging.disable(logging.INFO)
+
+
+def main(amount: int = 100_000) -> None:
+    print(f"{amount} polynomials [s]")
+    print(f"{'degree':<8}{'np.roots':>12}{'solve_batch':>14}")
+    for degree in (3, 4):
+        factory = PolynomialFactory(degree=degree, seed=0)
+        coefficients, _ = factory.generate_coefficients(level=5, amount=amount)
+
+        batch = min(timeit.repeat(lambda: factory.solve_batch(coefficients), number=1, repeat=3))
+        sample = min(amount, 10_000)
+        loop = min(timeit.repeat(lambda: [np.roots(row) for row in coefficients[:sample]],
+                                 number=1, repeat=3)) * amount / sample
+        print(f"{degree:<8}{loop:>12.3f}{batch:>14.3f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
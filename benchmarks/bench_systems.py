@@ -0,0 +1,39 @@
+"""
+Benchmark of the batched linear system solver (LinearSystemFactory.solve_batch)
+against solving systems one by one with numpy.linalg.solve.
+
+Usage: python -m benchmarks.bench_systems [AMOUNT] [SIZE]
+"""
+import logging
+import sys
+import timeit
+
+import numpy as np
+
+from MathGenerator.algebra.linear import LinearSystemFactory
+
+logging.disable(logging.INFO)
+
+
+def main(amount: int = 100_000, size: int = 3) -> None:
+    factory = LinearSystemFactory(size=size, seed=0)
+
+    generate = min(timeit.repeat(lambda: factory.generate_systems(level=5, amount=amount), number=1, repeat=3))
+    matrices, constants, expected = factory.generate_systems(level=5, amount=amount)
+
+    solutions, _ = factory.solve_batch(matrices, constants)
+    assert np.array_equal(solutions, expected)
+    batch = min(timeit.repeat(lambda: factory.solve_batch(matrices, constants), number=1, repeat=3))
+
+    sample = min(amount, 10_000)
+    loop = min(timeit.repeat(lambda: [np.linalg.solve(a, b) for a, b in zip(matrices[:sample], constants[:sample])],
+                             number=1, repeat=3)) * amount / sample
+
+    print(f"{amount} systems {size}x{size}")
+    print(f"generate_systems: {generate:.3f} s")
+    print(f"solve one by one (estimated from {sample}): {loop:.3f} s")
+    print(f"solve_batch: {batch:.3f} s ({loop / batch:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
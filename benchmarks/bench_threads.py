@@ -0,0 +1,38 @@
+"""
+Stress benchmark of a single SingleLinearFactory instance shared by a thread pool.
+Throughput scales with threads only on free-threaded CPython (3.13t and newer).
+
+Usage: python -m benchmarks.bench_threads [AMOUNT_PER_TASK]
+"""
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from MathGenerator.algebra.linear import SingleLinearFactory
+
+logging.disable(logging.INFO)
+
+TASKS = 32
+
+
+def run(factory: SingleLinearFactory, amount: int) -> int:
+    return len(factory.solve(factory.generate(level=3, amount=amount)))
+
+
+def main(amount: int = 5_000) -> None:
+    gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'threads':>8}{'time [s]':>10}{'exercises/s':>14}")
+
+    factory = SingleLinearFactory(seed=0)
+    for threads in (1, 2, 4, 8):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(run, [factory] * TASKS, [amount] * TASKS))
+        elapsed = time.perf_counter() - start
+        print(f"{threads:>8}{elapsed:>10.3f}{TASKS * amount / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -1,8 +1,14 @@
 import argparse
+import itertools
 from MathGenerator.arithmetic import factories as arithmetic
+from MathGenerator.arithmetic import expressions
+from MathGenerator.bank import ExerciseBank
+from MathGenerator.cache import SolutionCache
+from MathGenerator.history import ExerciseHistory
 import MathGenerator.algebra.quadratic as quadratic
 import MathGenerator.algebra.linear as linear
-from PDFGenerator.builder import Director, ArithmeticPDFBuilder, QuadraticPDFBuilder, LinearPDFBuilder
+from PDFGenerator.builder import (Director, QuadraticPDFBuilder, LinearPDFBuilder, StreamingArithmeticPDFBuilder,
+                                  PDF_DIRECTORY)
 
 
 class Factory:
@@ -20,16 +26,20 @@ class Factory:
         - An instance of the requested factory class.
         """
         factories = {
-            'addition': (arithmetic.AdditionFactory, ArithmeticPDFBuilder),
-            'subtraction': (arithmetic.SubtractionFactory, ArithmeticPDFBuilder),
-            'multiplication': (arithmetic.MultiplicationFactory, ArithmeticPDFBuilder),
-            'division': (arithmetic.DivisionFactory, ArithmeticPDFBuilder),
-            'faddition': (arithmetic.FractionAdditionFactory, ArithmeticPDFBuilder),
-            'fsubtraction': (arithmetic.FractionSubtractionFactory, ArithmeticPDFBuilder),
-            'fmultiplication': (arithmetic.FractionMultiplicationFactory, ArithmeticPDFBuilder),
-            'fdivision': (arithmetic.FractionDivisionFactory, ArithmeticPDFBuilder),
-            'paddition': (arithmetic.PercentAdditionFactory, ArithmeticPDFBuilder),
-            'psubtraction': (arithmetic.PercentSubtractionFactory, ArithmeticPDFBuilder),
+            'addition': (arithmetic.AdditionFactory, StreamingArithmeticPDFBuilder),
+            'subtraction': (arithmetic.SubtractionFactory, StreamingArithmeticPDFBuilder),
+            'multiplication': (arithmetic.MultiplicationFactory, StreamingArithmeticPDFBuilder),
+            'division': (arithmetic.DivisionFactory, StreamingArithmeticPDFBuilder),
+            'edivision': (arithmetic.ExactDivisionFactory, StreamingArithmeticPDFBuilder),
+            'rdivision': (arithmetic.RemainderDivisionFactory, StreamingArithmeticPDFBuilder),
+            'faddition': (arithmetic.FractionAdditionFactory, StreamingArithmeticPDFBuilder),
+            'fsubtraction': (arithmetic.FractionSubtractionFactory, StreamingArithmeticPDFBuilder),
+            'fmultiplication': (arithmetic.FractionMultiplicationFactory, StreamingArithmeticPDFBuilder),
+            'fdivision': (arithmetic.FractionDivisionFactory, StreamingArithmeticPDFBuilder),
+            'paddition': (arithmetic.PercentAdditionFactory, StreamingArithmeticPDFBuilder),
+            'psubtraction': (arithmetic.PercentSubtractionFactory, StreamingArithmeticPDFBuilder),
+            'pmultiplication': (arithmetic.PercentMultiplicationFactory, StreamingArithmeticPDFBuilder),
+            'expression': (expressions.ExpressionFactory, StreamingArithmeticPDFBuilder),
             'quadratic': (quadratic.QuadraticFactory, QuadraticPDFBuilder),
             'qequation': (quadratic.QuadraticEquationFactory, QuadraticPDFBuilder),
             'qinequationl': (quadratic.QuadraticInequalityLessFactory, QuadraticPDFBuilder),
@@ -47,6 +57,27 @@ class Factory:
         return factory_class(), builder_class()
 
 
+def stream(factory, level: int, amount: int, output: str, chunk_size: int, unique: bool = False,
+           index=None) -> None:
+    """
+    Writes exercises with their solutions into a text file chunk by chunk,
+    so memory usage does not depend on amount of exercises.
+    """
+    chunks = factory.iter_generate(level=level, chunk_size=chunk_size, amount=amount, unique=unique, index=index,
+                                   structured=True)
+    # Solutions are keyed by exercise, so repeated exercises are written from their own copy of the stream,
+    # which holds at most the chunk being solved
+    solving, writing = itertools.tee(itertools.chain.from_iterable(chunks))
+
+    with open(output, 'w') as file:
+        numerator = 1
+        for solutions in factory.iter_solve(solving, chunk_size=chunk_size):
+            exercises = list(itertools.islice(writing, chunk_size))
+            file.writelines(f"{numerator + i}. {exercise} -> {solutions[exercise]}\n"
+                            for i, exercise in enumerate(exercises))
+            numerator += len(exercises)
+
+
 def main():
     """
     Main function to handle command-line arguments and
@@ -62,12 +93,16 @@ def main():
         'subtraction',
         'multiplication',
         'division',
+        'edivision',
+        'rdivision',
         'faddition',
         'fsubtraction',
         'fmultiplication',
         'fdivision',
         'paddition',
         'psubtraction',
+        'pmultiplication',
+        'expression',
         'quadratic',
         'qequation',
         'qinequationl',
@@ -83,31 +118,82 @@ def main():
                         required=True, help='Type of operation')
     parser.add_argument('-level', type=int, required=True, help='Difficulty level of the exercises')
     parser.add_argument('-amount', type=int, required=True, help='Amount of exercises to generate')
+    parser.add_argument('-output', type=str, help='Stream exercises with solutions into text file instead of PDFs')
+    parser.add_argument('-chunk', type=int, default=10_000, help='Amount of exercises generated at once by -output')
+    parser.add_argument('-cache', type=str, help='SQLite file keeping solutions between runs')
+    parser.add_argument('-unique', action='store_true', help='Generate no exercise more than once')
+    parser.add_argument('-history', type=str, help='File with exercises handed out before, none of them is repeated')
+    parser.add_argument('-student', type=str, default='default', help='Student or class of -history')
+    parser.add_argument('-bloom', action='store_true', help='Keep -history in Bloom filters, -history is a directory')
+    parser.add_argument('-bank', type=str, help='Directory of exercise banks, worksheets are sampled from the bank')
+    parser.add_argument('-fill', action='store_true', help='Append -amount exercises to the -bank instead of PDFs')
+    parser.add_argument('-pdfs', type=str, default=PDF_DIRECTORY, help='Directory of the generated PDFs')
+    parser.add_argument('-plots', choices=['matplotlib', 'pgfplots'], default='matplotlib',
+                        help='Render plots of solutions into images, or draw them with pgfplots in LaTeX')
 
     args = parser.parse_args()
 
     # Initialize Factory based on passed argument
     factory, builder = Factory.create(operation=args.operation)
-
-    # Generate {args.amount} exercises
-    exercises = factory.generate(level=args.level, amount=args.amount)
-
-    # Solve above generated exercises
-    solutions = factory.solve(exercises=exercises)
-
-    # Initialize Director and his PDFBuilder
-    director = Director()
-    director.builder = builder
-
-    # Create PDF based on generated exercises
-    director.build_exercises(title=f"Exercises from {factory.__class__.__name__}",
-                             exercises=exercises,
-                             filename="exercises")
-
-    # Create PDF based on solutions of above exercises
-    director.build_solutions(title=f"Solutions from {factory.__class__.__name__}",
-                             exercises=solutions,
-                             filename=f"solutions")
+    name = factory.__class__.__name__
+    # Worksheets are sampled from a bank filled in advance
+    bank = ExerciseBank(args.bank, factory, args.level) if args.bank else None
+    if bank is not None and args.fill:
+        bank.fill(args.amount, chunk_size=args.chunk)
+        return
+    # Exercises handed out in previous sessions are skipped
+    history = ExerciseHistory(args.history, bloom=args.bloom) if args.history else None
+    index = history.index(factory, args.level, args.student) if history else None
+    # Solutions of exercises solved in previous runs are reused
+    if args.cache:
+        factory = SolutionCache(factory, path=args.cache)
+
+    try:
+        # Large amounts are written incrementally, without building PDFs
+        if args.output:
+            stream(factory=factory, level=args.level, amount=args.amount, output=args.output, chunk_size=args.chunk,
+                   unique=args.unique, index=index)
+            if history:
+                history.commit()
+            return
+
+        # Generate {args.amount} exercises, or sample them with solutions from the bank
+        if bank is not None:
+            exercises, solutions = bank.sample(args.amount, structured=True)
+        elif args.unique or history:
+            exercises = factory.generate_unique(level=args.level, amount=args.amount, index=index, structured=True)
+        else:
+            exercises = factory.generate(level=args.level, amount=args.amount, structured=True)
+
+        # Solve above generated exercises
+        if bank is None:
+            solutions = factory.solve(exercises=exercises)
+
+        # Initialize Director and his PDFBuilder
+        director = Director()
+        builder.plot_backend = args.plots
+        director.builder = builder
+
+        # Create PDF based on generated exercises
+        director.build_exercises(title=f"Exercises from {name}",
+                                 exercises=exercises,
+                                 filename="exercises",
+                                 filepath=args.pdfs)
+
+        # Create PDF based on solutions of above exercises
+        director.build_solutions(title=f"Solutions from {name}",
+                                 exercises=solutions,
+                                 filename=f"solutions",
+                                 filepath=args.pdfs)
+        # Exercises count as handed out only once their PDFs are written
+        if history:
+            history.commit()
+    finally:
+        # Databases are closed even if building PDFs fails, exercises not committed are dropped from history
+        if history:
+            history.close()
+        if args.cache:
+            factory.close()
 
 
 if __name__ == "__main__":
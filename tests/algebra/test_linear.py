@@ -1,8 +1,17 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pytest
 
-from MathGenerator.algebra.linear import (SingleLinearEquationFactory,
+from MathGenerator.algebra import parser
+from MathGenerator.algebra import linear
+from MathGenerator.algebra.linear import (LinearExercise,
+                                          LinearSystemExercise,
+                                          LinearSystemFactory,
+                                          solution_string,
+                                          SingleLinearFactory,
+                                          SingleLinearEquationFactory,
                                           SingleLinearInequalityLessFactory,
                                           SingleLinearInequalityGreaterFactory,
                                           SingleLinearEqualLessFactory,
@@ -65,3 +74,142 @@ def test_linear_solve(factory, exercises, expected):
     factory = factory()
     solutions = factory.solve(exercises)
     assert solutions == expected, f"Test failed for {factory.__class__.__name__}"
+
+
+@pytest.mark.parametrize("factory", [
+    SingleLinearEquationFactory,
+    SingleLinearInequalityLessFactory,
+    SingleLinearEqualGreaterFactory,
+])
+def test_linear_structured(factory):
+    factory = factory()
+    records = factory.generate(level=3, amount=20, structured=True)
+
+    assert all(isinstance(record, LinearExercise) for record in records)
+
+    solutions = factory.solve(records)
+    text_solutions = factory.solve([str(record) for record in records])
+    assert [solutions[record] for record in records] == [text_solutions[str(record)] for record in records]
+
+
+def test_linear_record():
+    record = LinearExercise(-1, 4, 1, 0, '<')
+
+    assert str(record) == '-x + 4 < x'
+    assert SingleLinearInequalityLessFactory().solve([record]) == {record: 'x > 2.0'}
+
+
+def test_linear_seed():
+    assert SingleLinearFactory(seed=3).generate(level=4, amount=30) == \
+           SingleLinearFactory(seed=3).generate(level=4, amount=30)
+    assert SingleLinearEquationFactory(seed=3).generate(level=4, amount=30) == \
+           SingleLinearEquationFactory(seed=3).generate(level=4, amount=30)
+
+
+def test_linear_thread_safety():
+    factory = SingleLinearFactory(seed=1)
+    exercises = factory.generate(level=3, amount=400)
+    expected = SingleLinearFactory().solve(exercises)
+
+    # Generating and solving concurrently on the same instance
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        generated = list(executor.map(lambda _: factory.generate(level=2, amount=50), range(8)))
+        solved = list(executor.map(factory.solve, [exercises[i::8] for i in range(8)]))
+
+    assert all(len(chunk) == 50 for chunk in generated)
+    for chunk in solved:
+        for exercise, solution in chunk.items():
+            assert solution == expected[exercise]
+
+
+@pytest.mark.parametrize("factory", [
+    SingleLinearFactory,
+    SingleLinearEquationFactory,
+    SingleLinearEqualLessFactory,
+])
+def test_linear_solve_batch(factory):
+    factory = factory(seed=4)
+    for exercises in (factory.generate(level=4, amount=300), factory.generate(level=2, amount=300, structured=True)):
+        expected = factory.solve(exercises)
+        solutions = factory.solve_batch(exercises)
+
+        assert solutions.shape == (len(exercises),)
+        assert [solution_string(solution) for solution in solutions] == [expected[e] for e in exercises]
+
+
+def test_linear_solve_batch_arrays():
+    factory = SingleLinearFactory()
+    coefficients = np.array([[1, -3, 2, -8], [2, 1, 2, 1], [2, 1, 2, 5], [-3, -3, -2, -3]])
+    relations = parser.relation_codes(['=', '<', '>=', '<='])
+    solutions = factory.solve_batch(coefficients, relations)
+
+    assert solutions['identity'].tolist() == [False, True, False, False]
+    assert solutions['no_solution'].tolist() == [False, False, True, False]
+    assert solutions['x'][[0, 3]].tolist() == [5.0, 0.0]
+    assert [parser.RELATIONS[code] for code in solutions['relation'][[0, 3]]] == ['=', '>=']
+
+
+@pytest.mark.parametrize("size, level", [(2, 1), (3, 3), (4, 5), (6, 2)])
+def test_linear_system_generate(size, level):
+    factory = LinearSystemFactory(size=size, seed=size)
+    matrices, constants, solutions = factory.generate_systems(level=level, amount=200)
+
+    assert matrices.shape == (200, size, size)
+    assert np.allclose(np.abs(np.linalg.det(matrices)), 1)
+    assert np.array_equal(np.einsum('mij,mj->mi', matrices, solutions), constants)
+    assert np.all(np.abs(solutions) <= 3 * level)
+
+
+@pytest.mark.parametrize("size", [2, 3, 5])
+def test_linear_system_solve(size):
+    factory = LinearSystemFactory(size=size, seed=7)
+    exercises = factory.generate(level=3, amount=100)
+    records = LinearSystemFactory(size=size, seed=7).generate(level=3, amount=100, structured=True)
+
+    assert exercises == [str(record) for record in records]
+    assert len(exercises[0].split(', ')) == size
+    for exercise, record in zip(exercises, records):
+        matrix, constants = np.array(record.matrix), np.array(record.constants)
+        solution = list(factory.solve([exercise])[exercise].values())
+        assert factory.solve([record])[record] == factory.solve([exercise])[exercise]
+        assert np.allclose(matrix @ solution, constants)
+        assert all(float(value).is_integer() for value in solution)
+
+
+def test_linear_system_seed():
+    assert LinearSystemFactory(size=3, seed=1).generate(2, 20) == LinearSystemFactory(size=3, seed=1).generate(2, 20)
+
+
+@pytest.mark.parametrize("exercise, expected", [
+    ('x + y = 2, x - y = 0', {'x': 1.0, 'y': 1.0}),
+    ('2x = 1, -x + 3y = 1', {'x': 0.5, 'y': 0.5}),
+    ('x + y = 2, 2x + 2y = 4', 'infinitely many solutions'),
+    ('x + y = 2, 2x + 2y = 5', 'no solution'),
+    # Constant terms on the left side are moved to the right one
+    ('x + 1 = 3, y - 2 = 0', {'x': 2.0, 'y': 2.0}),
+])
+def test_linear_system_solve_singular(exercise, expected):
+    assert LinearSystemFactory().solve([exercise]) == {exercise: expected}
+
+
+@pytest.mark.parametrize("exercise", ['x + z = 3, y = 2', 'x + y = 3', 'x = 1, y = 2, x + y = 3', 'x + y, y = 2',
+                                      'x + 2.5.1y = 1, y = 2'])
+def test_linear_system_invalid(exercise):
+    with pytest.raises(ValueError, match="Invalid linear system format"):
+        LinearSystemFactory().parse_systems([exercise])
+
+
+def test_linear_system_solve_batch():
+    matrices = np.array([[[1, 1], [1, -1]], [[1, 2], [2, 4]], [[1, 2], [2, 4]], [[0, 0], [0, 0]]])
+    constants = np.array([[3, 1], [1, 2], [1, 3], [0, 0]])
+    solutions, statuses = LinearSystemFactory.solve_batch(matrices, constants)
+
+    assert solutions[0].tolist() == [2.0, 1.0]
+    assert np.isnan(solutions[1:]).all()
+    assert statuses.tolist() == [linear.UNIQUE, linear.INFINITE, linear.INCONSISTENT, linear.INFINITE]
+
+
+def test_linear_system_record():
+    record = LinearSystemExercise(((2, -1), (0, 1)), (3, -2))
+    assert str(record) == '2x - y = 3, y = -2'
+    assert record == LinearSystemExercise(((2, -1), (0, 1)), (3, -2))
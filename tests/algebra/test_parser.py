@@ -0,0 +1,38 @@
+import pytest
+
+from MathGenerator.algebra import parser
+
+
+@pytest.mark.parametrize("exercise, expected", [
+    ('x - 3 = 2x - 8', ((-3, 1), '=', (-8, 2))),
+    ('-x + 4 < 8', ((4, -1), '<', (8,))),
+    ('3x + 6 <= 9', ((6, 3), '<=', (9,))),
+    ('10x - 20 >= 8x', ((-20, 10), '>=', (0, 8))),
+    ('-2x^2 + 10x + -8 = 0', ((-8, 10, -2), '=', (0,))),
+    ('x^2 - 2x + 1.5 > 0', ((1.5, -2, 1), '>', (0,))),
+    ('-x^2 - x - .25 < 0', ((-0.25, -1, -1), '<', (0,))),
+    ('x^3 - x', ((0, -1, 0, 1), None, ())),
+    ('5 - - 3', ((8,), None, ())),
+])
+def test_parse_exercise(exercise, expected):
+    assert parser.parse_exercise(exercise) == expected
+
+
+@pytest.mark.parametrize("exercise", ['2 ^ x', 'a = 2', '5 = = 2', '2x3 = 1', '3x -', 'x^-2'])
+def test_parse_exercise_invalid(exercise):
+    with pytest.raises(ValueError):
+        parser.parse_exercise(exercise)
+
+
+def test_parse_polynomial():
+    assert parser.parse_polynomial('2x - 3') == (-3, 2)
+    with pytest.raises(ValueError):
+        parser.parse_polynomial('2x - 3 = 0')
+
+
+def test_coefficients():
+    assert parser.coefficients((-3, 2), degree=2) == (0, 2, -3)
+    assert parser.coefficients((1, 0, 0), degree=1) == (0, 1)
+    assert parser.coefficients(parser.subtract((1, 2, 3), (1, 2)), degree=2) == (3, 0, 0)
+    with pytest.raises(ValueError):
+        parser.coefficients((1, 2, 3), degree=1)
@@ -0,0 +1,91 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from MathGenerator.algebra.polynomial import (PolynomialExercise,
+                                              PolynomialFactory,
+                                              CubicFactory,
+                                              QuarticFactory,
+                                              format_polynomial)
+
+
+@pytest.mark.parametrize("coefficients, expected", [
+    ((1, 0, -2, 3), 'x^3 - 2x + 3'),
+    ((-1, 1, -1, 1, 0), '-x^4 + x^3 - x^2 + x'),
+    ((2, -6, 0, 0, 1), '2x^4 - 6x^3 + 1'),
+    ((0, 0), '0'),
+])
+def test_format_polynomial(coefficients, expected):
+    assert format_polynomial(coefficients) == expected
+
+
+@pytest.mark.parametrize("degree, level, real_roots", [
+    (3, 1, None), (3, 4, 1), (4, 2, None), (4, 5, 2), (4, 3, 0), (5, 6, 3),
+])
+def test_polynomial_generate_roots(degree, level, real_roots):
+    factory = PolynomialFactory(degree=degree, seed=level)
+    coefficients, chosen = factory.generate_coefficients(level=level, amount=2000, real_roots=real_roots)
+    roots, multiplicities = factory.solve_batch(coefficients)
+
+    assert coefficients.shape == (2000, degree + 1)
+    assert np.all(np.abs(chosen) <= level)
+    for row in range(len(coefficients)):
+        expected = sorted(Counter(chosen[row].tolist()).items())
+        found = [(root, count) for root, count in zip(roots[row].tolist(), multiplicities[row].tolist()) if count]
+        assert found == [(float(root), count) for root, count in expected]
+
+
+def test_polynomial_generate_invalid_real_roots():
+    with pytest.raises(ValueError):
+        QuarticFactory().generate(level=2, amount=1, real_roots=3)
+
+
+def test_polynomial_generate_invalid_level():
+    with pytest.raises(ValueError, match="Level"):
+        CubicFactory().generate(level=0, amount=1)
+
+
+@pytest.mark.parametrize("factory", [CubicFactory, QuarticFactory])
+def test_polynomial_solve(factory):
+    exercises = factory(seed=3).generate(level=3, amount=200)
+    records = factory(seed=3).generate(level=3, amount=200, structured=True)
+
+    assert exercises == [str(record) for record in records]
+    solutions = factory().solve(exercises)
+    assert list(solutions.values()) == list(factory().solve(records).values())
+    for exercise, record in zip(exercises, records):
+        solution = solutions[exercise]
+        assert sum(solution["multiplicities"]) == len(record.coefficients) - 1
+        assert np.allclose(np.polyval(record.coefficients, solution["roots"]), 0)
+
+
+@pytest.mark.parametrize("exercise, expected", [
+    ('x^3 - 6x^2 + 11x - 6 = 0', {'roots': (1.0, 2.0, 3.0), 'multiplicities': (1, 1, 1)}),
+    ('x^3 - 3x^2 + 3x - 1 = 0', {'roots': (1.0,), 'multiplicities': (3,)}),
+    ('x^3 + x = 0', {'roots': (0.0,), 'multiplicities': (1,)}),
+    ('2x^3 - x^2 = 0', {'roots': (0.0, 0.5), 'multiplicities': (2, 1)}),
+    ('x^3 = 8', {'roots': (2.0,), 'multiplicities': (1,)}),
+])
+def test_cubic_solve_exercises(exercise, expected):
+    assert CubicFactory().solve([exercise]) == {exercise: expected}
+
+
+def test_quartic_solve_no_real_roots():
+    exercise = 'x^4 + 2x^2 + 1 = 0'
+    assert QuarticFactory().solve([exercise])[exercise]["multiplicities"] == ()
+
+
+def test_polynomial_solve_invalid():
+    with pytest.raises(ValueError):
+        CubicFactory().solve(['x^2 - 1 = 0'])
+
+
+def test_polynomial_seed():
+    assert CubicFactory(seed=5).generate(4, 50) == CubicFactory(seed=5).generate(4, 50)
+
+
+def test_polynomial_record():
+    record = PolynomialExercise((1, -3, 3, -1))
+    assert str(record) == 'x^3 - 3x^2 + 3x - 1 = 0'
+    assert record == PolynomialExercise((1, -3, 3, -1))
@@ -1,8 +1,11 @@
 import pytest
 import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-from MathGenerator.algebra import quadratic as q
+import numpy as np
+
+from MathGenerator.algebra import quadratic as q, tables
 
 
 @pytest.mark.parametrize("factory_class, level", [
@@ -58,3 +61,141 @@ def test_quadratic_solve(factory, exercises, expected):
     results = factory.solve(exercises)
     for equation in exercises:
         assert results[equation] == expected[equation], f"Failed for equation: {equation}"
+
+
+@pytest.mark.parametrize("factory_class", [
+    q.QuadraticFactory,
+    q.QuadraticEquationFactory,
+    q.QuadraticEqualGreaterFactory,
+])
+def test_quadratic_structured(factory_class):
+    factory = factory_class()
+    records = factory.generate(level=3, amount=20, structured=True)
+
+    assert all(isinstance(record, q.QuadraticExercise) for record in records)
+
+    solutions = factory.solve(records)
+    for record in records:
+        assert "error" not in solutions[record], f"Failed for record: {record}"
+        assert solutions[record] == factory.solve([str(record)])[str(record)]
+
+
+def test_quadratic_record():
+    record = q.QuadraticExercise(-1, 4, -3.0, '>')
+
+    assert str(record) == '-x^2 + 4x - 3.0 > 0'
+    assert record.render(number_format=lambda c: f"({c})") == '-x^2 + 4x - (3.0) > 0'
+    assert q.QuadraticInequalityGreaterFactory().solve([record])[record] == \
+           {"roots": (1, 3), "parabola_direction": "down", "delta": 4}
+
+
+@pytest.mark.parametrize("factory_class", [q.QuadraticFactory, q.QuadraticEqualLessFactory])
+def test_quadratic_seed(factory_class):
+    assert factory_class(seed=5).generate(level=6, amount=20) == factory_class(seed=5).generate(level=6, amount=20)
+
+
+def test_quadratic_thread_safety():
+    # Random operator factory used to keep the operator of the last exercise on instance
+    factory = q.QuadraticFactory(seed=1)
+    exercises = factory.generate(level=3, amount=400)
+    expected = {exercise: q.QuadraticFactory().solve([exercise])[exercise] for exercise in exercises}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        chunks = list(executor.map(factory.solve, [exercises[i::8] for i in range(8)]))
+
+    for chunk in chunks:
+        for exercise, solution in chunk.items():
+            assert "error" not in solution, f"Failed for {exercise}"
+            assert solution == expected[exercise]
+
+
+@pytest.mark.parametrize("roots, level", [('integer', 3), ('integer', 12), ('rational', 6)])
+def test_quadratic_generate_roots(roots, level):
+    factory = q.QuadraticFactory(seed=level)
+    exercises = factory.generate(level=level, amount=50, roots=roots)
+    solutions = factory.solve(exercises)
+
+    for exercise in exercises:
+        assert '-0.0' not in exercise, f"Negative zero in {exercise}"
+        solution = solutions[exercise]
+        assert isinstance(solution["roots"], tuple), f"No real roots of {exercise}"
+        assert round(solution["delta"] ** 0.5) ** 2 == solution["delta"]
+        if roots == 'integer':
+            assert all(root == int(root) for root in solution["roots"]), f"Roots of {exercise}"
+
+
+def test_quadratic_generate_high_level():
+    # Deltas of high levels come from a table built once per level
+    exercises = q.QuadraticEquationFactory().generate(level=300, amount=2000)
+
+    assert len(exercises) == 2000
+    assert tables.delta_table(300) is tables.delta_table(300)
+
+
+@pytest.mark.parametrize("roots", ['integer', 'rational'])
+def test_quadratic_generate_roots_high_level(roots):
+    # Table of integer roots holds only the valid combinations, rational roots need none
+    factory = q.QuadraticEquationFactory(seed=0)
+    solutions = factory.solve(factory.generate(level=300, amount=200, roots=roots))
+
+    assert all(isinstance(solution["roots"], tuple) for solution in solutions.values())
+    assert len(tables.roots_table(300)) < 10 ** 6
+
+
+@pytest.mark.parametrize("level", [1, 4, 7])
+def test_roots_table(level):
+    a, b, s = np.meshgrid(np.arange(-level, level + 1), np.arange(-3 * level, 3 * level + 1),
+                          np.arange(level + 3), indexing='ij')
+    combinations = np.column_stack((a.ravel(), b.ravel(), s.ravel()))
+    a, b, s = combinations.T
+    integer = (a != 0) & ((-b + s) % (2 * a + (a == 0)) == 0) & ((-b - s) % (2 * a + (a == 0)) == 0)
+
+    assert np.array_equal(tables.roots_table(level), combinations[integer])
+
+
+def test_roots_table_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(tables, 'CACHE_DIR', str(tmp_path))
+    table = tables.roots_table.__wrapped__(4)
+
+    assert (tmp_path / 'quadratic_integer_level4.npy').exists()
+    assert (tables.roots_table.__wrapped__(4) == table).all()
+    with pytest.raises(ValueError):
+        q.QuadraticFactory().generate(level=4, amount=1, roots='irrational')
+
+
+@pytest.mark.parametrize("level", [2, 5, 8])
+def test_quadratic_solve_batch(level):
+    factory = q.QuadraticFactory(seed=level)
+    exercises = factory.generate(level=level, amount=300)
+    records = factory.generate(level=level, amount=300, structured=True)
+
+    for batch in (exercises, records):
+        expected = factory.solve(batch)
+        solutions = factory.solve_batch(batch)
+
+        assert solutions.shape == (len(batch),)
+        for exercise, solution in zip(batch, solutions):
+            scalar = expected[exercise]
+            assert solution['delta'] == pytest.approx(scalar['delta'], abs=1e-9)
+            assert solution['direction'] == (1 if scalar['parabola_direction'] == "up" else -1)
+            roots = [solution['x1'], solution['x2']][:solution['roots']]
+            assert roots == pytest.approx(sorted(scalar['roots']) if isinstance(scalar['roots'], tuple) else [])
+
+
+@pytest.mark.parametrize("exercise, expected", [
+    ('x^2 + x - 6 < 0', '-3.0 < x < 2.0'),
+    ('-x^2 + 4x - 3 >= 0', '1.0 <= x <= 3.0'),
+    ('x^2 + x - 6 > 0', 'x < -3.0 or x > 2.0'),
+    ('-x^2 + 4x - 3 <= 0', 'x <= 1.0 or x >= 3.0'),
+    ('x^2 - 2x + 1 > 0', 'x != 1.0'),
+    ('x^2 - 2x + 1 <= 0', 'x = 1.0'),
+    ('x^2 - 2x + 1 >= 0', 'all x'),
+    ('x^2 - 2x + 1 < 0', 'no solution'),
+    ('x^2 - 1 = 0', 'x = -1.0 or x = 1.0'),
+    ('x^2 + 4x + 5 = 0', 'no solution'),
+    ('-x^2 - 1 < 0', 'all x'),
+    ('-x^2 - 1 >= 0', 'no solution'),
+])
+def test_quadratic_solution_set(exercise, expected):
+    solution = q.QuadraticFactory().solve_batch([exercise])[0]
+    assert q.solution_set_string(solution) == expected
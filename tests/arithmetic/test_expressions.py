@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from MathGenerator.arithmetic.expressions import (ExpressionExercise,
+                                                  ExpressionFactory,
+                                                  Program,
+                                                  compile_expression,
+                                                  evaluate,
+                                                  evaluate_batch,
+                                                  render,
+                                                  PUSH, ADD, SUB, MUL, DIV, NEG)
+
+
+@pytest.mark.parametrize("expression, program", [
+    ('2 * (3 + 4)', Program((PUSH, PUSH, PUSH, ADD, MUL), (2, 3, 4))),
+    ('2 * 3 + 4', Program((PUSH, PUSH, MUL, PUSH, ADD), (2, 3, 4))),
+    ('8 - 4 - 2', Program((PUSH, PUSH, SUB, PUSH, SUB), (8, 4, 2))),
+    ('8/(4/2)', Program((PUSH, PUSH, PUSH, DIV, DIV), (8, 4, 2))),
+    ('-(1.5 + 2) * -3', Program((PUSH, PUSH, ADD, NEG, PUSH, NEG, MUL), (1.5, 2, 3))),
+])
+def test_compile_expression(expression, program):
+    assert compile_expression(expression) == program
+
+
+@pytest.mark.parametrize("expression", ['2 +', '(2 + 3', '2 + 3)', '* 3', '2 x 3', '()', '1..2 + 3', '2 3', '2 (3)'])
+def test_compile_expression_invalid(expression):
+    with pytest.raises(ValueError):
+        compile_expression(expression)
+
+
+@pytest.mark.parametrize("expression, rendered", [
+    ('(2 * 3) + 4', '2 * 3 + 4'),
+    ('2 * (3 + 4)', '2 * (3 + 4)'),
+    ('(8 - 4) - 2', '8 - 4 - 2'),
+    ('8 - (4 - 2)', '8 - (4 - 2)'),
+    ('1 + (2 + 3)', '1 + (2 + 3)'),
+    ('-(2 + 3) * 4', '-(2 + 3) * 4'),
+])
+def test_render(expression, rendered):
+    assert render(compile_expression(expression)) == rendered
+
+
+@pytest.mark.parametrize("expression, result", [
+    ('2 * (3 + 4)', 14),
+    ('7 - 2 * 3 + 8 / 4', 3.0),
+    ('8 / (4 / 2)', 4.0),
+    ('-3 - -2', -1),
+    ('1 / (2 - 2)', np.nan),
+])
+def test_evaluate(expression, result):
+    program = compile_expression(expression)
+    np.testing.assert_equal(evaluate(program), result)
+    np.testing.assert_equal(evaluate_batch([program]), [result])
+
+
+def test_evaluate_batch_mixed_lengths():
+    programs = [compile_expression(expression) for expression in ['7', '1 + 2', '(1 + 2) * -3', '4 / 0']]
+    np.testing.assert_equal(evaluate_batch(programs), [7, 3, -9, np.nan])
+    assert evaluate_batch([]).shape == (0,)
+
+
+@pytest.mark.parametrize("level", [1, 2, 4, 7])
+def test_expression_generate(level):
+    records = ExpressionFactory(seed=level).generate(level=level, amount=300, structured=True)
+    exercises = ExpressionFactory(seed=level).generate(level=level, amount=300)
+
+    assert exercises == [str(record) for record in records]
+    for exercise, record in zip(exercises, records):
+        # Rendered text compiles back into the very same Program
+        assert compile_expression(exercise) == record.program
+        assert record.program.code.count(PUSH) == level + 1
+        assert max(record.program.constants) <= 10 * level
+
+
+@pytest.mark.parametrize("operators", ['+-', '*/', '+-*/'])
+def test_expression_operators(operators):
+    records = ExpressionFactory(operators=operators, seed=0).generate(level=4, amount=100, structured=True)
+    used = {opcode for record in records for opcode in record.program.code if opcode != PUSH}
+    assert used == {{'+': ADD, '-': SUB, '*': MUL, '/': DIV}[symbol] for symbol in operators}
+
+
+@pytest.mark.parametrize("level", [1, 3, 6])
+def test_expression_solve_batch(level):
+    factory = ExpressionFactory(seed=10 + level)
+    exercises = factory.generate(level=level, amount=500)
+    records = factory.generate(level=level, amount=500, structured=True)
+
+    for batch in (exercises, records):
+        expected = factory.solve(batch)
+        solutions = factory.solve_batch(batch)
+        assert solutions.shape == (len(batch),)
+        assert solutions.tolist() == [expected[exercise] for exercise in batch]
+    assert not np.isnan(factory.solve_batch(exercises)).any()
+
+
+@pytest.mark.parametrize("operators", ['+-*', '+-*/'])
+def test_expression_solve_batch_high_level(operators):
+    # Products of 21 numbers up to 200 exceed 2 ** 53, where float64 loses integers
+    factory = ExpressionFactory(operators=operators, seed=5)
+    exercises = factory.generate(level=20, amount=200)
+    expected = factory.solve(exercises)
+
+    assert factory.solve_batch(exercises).tolist() == [expected[exercise] for exercise in exercises]
+    assert max(abs(result) for result in expected.values()) > 2 ** 53
+
+
+def test_evaluate_batch_exact_integers():
+    programs = [compile_expression('9007199254740993 * 1'), compile_expression('2 * 3')]
+    results = evaluate_batch(programs)
+
+    assert results.dtype == object and results.tolist() == [2 ** 53 + 1, 6]
+
+
+def test_expression_solve():
+    exercises = ['(12 + 7) * 3 - 48 / 6', '22 / 9 - (7 + 12)', '2 - 3 * (4 - 5)']
+    assert ExpressionFactory().solve(exercises) == {
+        '(12 + 7) * 3 - 48 / 6': 49.0,
+        '22 / 9 - (7 + 12)': -16.556,
+        '2 - 3 * (4 - 5)': 5,
+    }
+
+
+def test_expression_record():
+    record = ExpressionExercise(compile_expression('2 * (3 + 4)'))
+    assert str(record) == '2 * (3 + 4)'
+    assert record == ExpressionExercise(Program((PUSH, PUSH, PUSH, ADD, MUL), (2, 3, 4)))
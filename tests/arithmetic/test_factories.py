@@ -1,6 +1,9 @@
 import logging
 import pytest
 import random
+
+import numpy as np
+
 from MathGenerator.arithmetic import factories as f
 
 logger = logging.getLogger(__name__)
@@ -149,3 +152,223 @@ def test_arithmetic_solve(factory, exercises_results):
         result = factory.solve([exercise])[exercise]
         assert result == expected_result, f"Failed at {exercise}: got {result}, expected {expected_result}"
 
+
+@pytest.mark.parametrize("factory, level, expected_component_amount", [
+    (f.AdditionFactory(), 5, 3),
+    (f.SubtractionFactory(), 3, 2),
+    (f.MultiplicationFactory(), 5, 3),
+    (f.DivisionFactory(), 3, 2),
+    (f.DivisionFactory(), 5, 2),
+    (f.FractionAdditionFactory(), 4, 2),
+    (f.FractionMultiplicationFactory(), 5, 3),
+    (f.FractionDivisionFactory(), 4, 2),
+    (f.PercentAdditionFactory(), 5, 3),
+    (f.PercentSubtractionFactory(), 2, 2),
+])
+def test_arithmetic_generate_batch(factory, level, expected_component_amount):
+    amount = random.randint(1, 1000)
+    exercises = factory.generate_batch(level=level, amount=amount)
+    reference = factory.generate(level=level, amount=1)[0]
+
+    assert len(exercises) == amount, \
+        f"Number of exercises {len(exercises)}, Expected: {amount}"
+
+    for exercise in exercises:
+        components = exercise.split(factory.operator_symbol)
+        assert len(components) == expected_component_amount, \
+            f"Number of components: {len(components)}, Expected: {expected_component_amount}"
+        # Batch exercises must be rendered exactly like the ones from generate
+        assert all(c.strip('%').replace('.', '', 1).isdigit() for c in components), \
+            f"Component of {exercise} is not a valid number"
+        assert ('.' in exercise) == ('.' in reference), f"{exercise} formatted differently than {reference}"
+
+    # Batch exercises are solvable by the regular solve method
+    assert len(factory.solve(exercises)) == len(set(exercises))
+
+
+@pytest.mark.parametrize("factory, level, max_number", [
+    (f.AdditionFactory(), 3, 10 ** 3),
+    (f.MultiplicationFactory(), 3, (10 ** 3) / 5 + 9),
+    (f.FractionAdditionFactory(), 3, (10 ** 3) / 100),
+    (f.FractionMultiplicationFactory(), 3, (10 ** 3) / 10),
+    (f.PercentAdditionFactory(), 3, 100),
+])
+def test_arithmetic_generate_operands(factory, level, max_number):
+    operands = factory.generate_operands(level=level, amount=500, rng=np.random.default_rng(0))
+
+    assert operands.shape == (500, 2)
+    assert operands.max() <= max_number, f"Operand {operands.max()} > {max_number}"
+    assert operands.min() > 0
+    # Same generator state gives the same operands
+    assert (operands == factory.generate_operands(level=level, amount=500, rng=np.random.default_rng(0))).all()
+
+
+@pytest.mark.parametrize("level, divisor_range", [(3, (1, 9)), (4, (11, 99))])
+def test_division_generate_operands(level, divisor_range):
+    operands = f.DivisionFactory().generate_operands(level=level, amount=500)
+
+    assert operands.shape == (500, 2)
+    assert operands[:, 0].min() >= 1 and operands[:, 0].max() <= 10 ** level
+    assert operands[:, 1].min() >= divisor_range[0] and operands[:, 1].max() <= divisor_range[1]
+
+
+@pytest.mark.parametrize("level", [1, 3, 4, 6])
+def test_exact_division_generate(level):
+    factory = f.ExactDivisionFactory()
+    divisor_range = (1, 9) if level < 4 else (11, 99)
+    operands = np.vstack((factory.parse_operands(factory.generate(level=level, amount=300)),
+                          factory.generate_operands(level=level, amount=300)))
+
+    assert (operands[:, 0] % operands[:, 1] == 0).all()
+    assert operands[:, 0].min() >= 1 and operands[:, 0].max() <= max(10 ** level, divisor_range[1])
+    assert operands[:, 1].min() >= divisor_range[0] and operands[:, 1].max() <= divisor_range[1]
+
+    solutions = factory.solve_batch(operands)
+    assert solutions.dtype.kind == 'i'
+    assert (solutions * operands[:, 1] == operands[:, 0]).all()
+
+
+@pytest.mark.parametrize("level", [2, 5])
+def test_remainder_division(level):
+    factory = f.RemainderDivisionFactory()
+    exercises = factory.generate(level=level, amount=200) + factory.generate_batch(level=level, amount=200)
+    solutions = factory.solve(exercises)
+    batch = factory.solve_batch(exercises)
+    operands = factory.parse_operands(exercises)
+
+    assert (batch['quotient'] * operands[:, 1] + batch['remainder'] == operands[:, 0]).all()
+    assert (batch['remainder'] < operands[:, 1]).all()
+    # Dividends stay in the range of the other division factories
+    assert operands[:, 0].max() <= 10 ** level
+    assert [solutions[e] for e in exercises] == [f"{q} r {r}" for q, r in batch.tolist()]
+
+
+def test_remainder_division_capacity():
+    factory = f.RemainderDivisionFactory()
+    operands = factory.generate_operands(level=1, amount=5000, rng=np.random.default_rng(0))
+    # Every pair of divisor from [1, 9] and dividend from [divisor, 10]
+    assert len(set(map(tuple, operands.tolist()))) == factory.capacity(level=1) == 54
+
+
+def test_remainder_division_solve():
+    assert f.RemainderDivisionFactory().solve(['17 / 5', '12 / 4']) == {'17 / 5': '3 r 2', '12 / 4': '3 r 0'}
+
+
+@pytest.mark.parametrize("factory, level", [
+    (f.AdditionFactory(), 5),
+    (f.SubtractionFactory(), 3),
+    (f.MultiplicationFactory(), 4),
+    (f.DivisionFactory(), 3),
+    (f.DivisionFactory(), 5),
+    (f.FractionSubtractionFactory(), 5),
+    (f.FractionMultiplicationFactory(), 3),
+    (f.FractionDivisionFactory(), 4),
+    (f.PercentAdditionFactory(), 1),
+    (f.PercentSubtractionFactory(), 5),
+    (f.PercentMultiplicationFactory(), 3),
+    (f.PercentMultiplicationFactory(), 6),
+])
+def test_arithmetic_solve_batch(factory, level):
+    exercises = factory.generate_batch(level=level, amount=200)
+    expected = [factory.solve([exercise])[exercise] for exercise in exercises]
+    if isinstance(factory, f.PercentFactory):
+        expected = [float(solution.strip('%')) for solution in expected]
+
+    # Both operands array and list of exercises are accepted
+    from_strings = factory.solve_batch(exercises)
+    from_operands = factory.solve_batch(factory.parse_operands(exercises))
+
+    assert from_strings.shape == (len(exercises),)
+    assert np.allclose(from_strings, expected, rtol=0, atol=1e-9)
+    assert (from_strings == from_operands).all()
+    if isinstance(factory, f.FixedPointFactory):
+        # Both engines are exact, so they agree to the last bit
+        assert from_strings.tolist() == expected
+
+
+@pytest.mark.parametrize("factory, exercises_results", [
+    # Exact results are rounded half to even, 2.675 is not 2.67499... as a float
+    (f.FractionMultiplicationFactory(), {'2.675 * 1': 2.675, '0.5 * 0.125': 0.062, '0.5 * 0.375': 0.188}),
+    (f.FractionDivisionFactory(), {'0.1 / 1.6': 0.062, '-0.1 / 1.6': -0.062, '1 / -1.6': -0.625}),
+    (f.FractionAdditionFactory(), {'0.1 + 0.2': 0.3, '-1.01 + 2.02': 1.01}),
+    # Products of three 5-digit percentages exceed int64 and are computed with Python ints
+    (f.PercentMultiplicationFactory(), {'99.99999% * 99.99999% * 99.99999%': '99.99997%',
+                                        '0.5% * 0.5% * 100.0%': '0.002%'}),
+])
+def test_fixed_point_solve(factory, exercises_results):
+    exercises = list(exercises_results)
+    solutions = factory.solve(exercises)
+    batch = factory.solve_batch(exercises)
+
+    assert solutions == exercises_results
+    assert batch.tolist() == [float(str(result).strip('%')) for result in exercises_results.values()]
+
+
+def test_percent_decimal_places():
+    factory = f.PercentAdditionFactory()
+    operands = factory.parse_operands(['87.8% + 45.0%', '68.87% + 44.0618%', '50% + 50%'])
+
+    assert factory.decimal_places(operands).tolist() == [1, 4, 0]
+    assert factory.solve_batch(operands).tolist() == [132.8, 112.9318, 100.0]
+
+
+@pytest.mark.parametrize("factory, level", [
+    (f.AdditionFactory(), 5),
+    (f.DivisionFactory(), 3),
+    (f.FractionMultiplicationFactory(), 4),
+    (f.PercentSubtractionFactory(), 3),
+])
+def test_arithmetic_structured(factory, level):
+    records = factory.generate(level=level, amount=20, structured=True)
+    records += factory.generate_batch(level=level, amount=20, structured=True)
+
+    assert all(isinstance(record, f.ArithmeticExercise) for record in records)
+
+    # Records are solved without parsing and give the same results as their text
+    solutions = factory.solve(records)
+    text_solutions = factory.solve([str(record) for record in records])
+    assert [solutions[record] for record in records] == [text_solutions[str(record)] for record in records]
+    assert (factory.parse_operands(records) == factory.parse_operands([str(r) for r in records])).all()
+
+
+def test_arithmetic_record():
+    record = f.ArithmeticExercise((87.8, 45.0), '+', '%')
+
+    assert str(record) == '87.8% + 45.0%'
+    assert record == f.ArithmeticExercise((87.8, 45.0), '+', '%')
+    assert len({record, f.ArithmeticExercise((87.8, 45.0), '+', '%')}) == 1
+    assert f.PercentAdditionFactory().solve([record]) == {record: '132.8%'}
+
+
+@pytest.mark.parametrize("factory, level", [
+    (f.AdditionFactory(), 1),
+    (f.MultiplicationFactory(), 1),
+    (f.DivisionFactory(), 1),
+    (f.ExactDivisionFactory(), 1),
+    (f.RemainderDivisionFactory(), 1),
+    (f.FractionMultiplicationFactory(), 1),
+    (f.FractionDivisionFactory(), 1),
+    (f.PercentSubtractionFactory(), 1),
+])
+def test_arithmetic_capacity(factory, level):
+    capacity = factory.capacity(level)
+    exercises = factory.generate_unique(level=level, amount=capacity)
+
+    # All distinct exercises of the level are drawn, each of them once and inside the operand space
+    assert len(set(exercises)) == capacity
+    codes = factory.exercise_codes(level, exercises)
+    assert len(np.unique(codes)) == capacity
+    assert set(exercises) >= set(factory.generate(level=level, amount=1000))
+
+    with pytest.raises(ValueError, match=f"only {capacity} distinct exercises"):
+        factory.generate_unique(level=level, amount=capacity + 1)
+
+
+def test_arithmetic_unique_chunks():
+    factory = f.SubtractionFactory()
+    chunks = list(factory.iter_generate(level=1, chunk_size=30, amount=81, unique=True, structured=True))
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 21]
+    assert len({exercise for chunk in chunks for exercise in chunk}) == 81
+    with pytest.raises(ValueError):
+        next(factory.iter_generate(level=1, chunk_size=30, amount=82, unique=True))
@@ -0,0 +1,39 @@
+import itertools
+
+import pytest
+
+from MathGenerator.arithmetic import factories as f
+
+
+@pytest.mark.parametrize("amount, chunk_size, expected_chunks", [
+    (10, 3, [3, 3, 3, 1]),
+    (6, 3, [3, 3]),
+    (2, 5, [2]),
+    (0, 5, []),
+])
+def test_iter_generate(amount, chunk_size, expected_chunks):
+    factory = f.AdditionFactory()
+    chunks = list(factory.iter_generate(level=2, chunk_size=chunk_size, amount=amount))
+
+    assert [len(chunk) for chunk in chunks] == expected_chunks
+
+
+def test_iter_generate_endless():
+    factory = f.DivisionFactory()
+    chunks = factory.iter_generate(level=2, chunk_size=4, structured=True)
+
+    for chunk in itertools.islice(chunks, 100):
+        assert len(chunk) == 4
+        assert all(isinstance(exercise, f.ArithmeticExercise) for exercise in chunk)
+
+
+def test_iter_solve():
+    factory = f.SubtractionFactory()
+    exercises = itertools.chain.from_iterable(factory.iter_generate(level=3, chunk_size=7, amount=25))
+    solutions = list(factory.iter_solve(exercises, chunk_size=10))
+
+    assert len(solutions) == 3
+    for chunk in solutions:
+        for exercise, solution in chunk.items():
+            minuend, subtrahend = map(int, exercise.split(' - '))
+            assert solution == minuend - subtrahend
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from MathGenerator.algebra.linear import SingleLinearFactory
+from MathGenerator.algebra.quadratic import QuadraticFactory
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.arithmetic.expressions import ExpressionFactory
+from MathGenerator.bank import ExerciseBank, append_npy, truncate_npy
+
+
+def test_append_npy(tmp_path):
+    path = str(tmp_path / 'column.npy')
+    append_npy(path, np.arange(6).reshape(3, 2))
+    append_npy(path, np.arange(6, 10).reshape(2, 2))
+    # First dimension grows past the digits written in the original header
+    append_npy(path, np.zeros((10 ** 5, 2), dtype=int))
+
+    column = np.load(path, mmap_mode='r')
+    assert column.shape == (5 + 10 ** 5, 2)
+    assert column[:5].tolist() == [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+    with pytest.raises(ValueError):
+        append_npy(path, np.zeros((1, 3), dtype=int))
+
+    truncate_npy(path, 4)
+    assert np.load(path).tolist() == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+
+@pytest.mark.parametrize("factory, level", [
+    (f.AdditionFactory(), 2),
+    (f.MultiplicationFactory(), 5),
+    (f.DivisionFactory(), 3),
+    (f.RemainderDivisionFactory(), 2),
+    (f.FractionDivisionFactory(), 2),
+    (f.PercentMultiplicationFactory(), 3),
+    (QuadraticFactory(seed=2), 3),
+    (SingleLinearFactory(seed=2), 2),
+    (ExpressionFactory(seed=2), 3),
+])
+def test_bank_sample(tmp_path, factory, level):
+    bank = ExerciseBank(str(tmp_path), factory, level, seed=5)
+    bank.fill(150, chunk_size=64)
+    bank.fill(50)
+
+    assert len(bank) == 200
+    exercises, solutions = bank.sample(100, structured=True)
+    assert len(exercises) == 100
+    # Precomputed solutions are the same as solve gives
+    expected = factory.solve(exercises)
+    assert all(solutions[exercise] == expected[exercise] or np.isnan(expected[exercise]) for exercise in exercises)
+
+    # Whole bank can be read in parts
+    head = bank.exercises(bank.rows(slice(0, 150)))
+    assert len(head) == 150 and all(isinstance(exercise, str) for exercise in head)
+    with pytest.raises(ValueError):
+        bank.sample(201)
+
+
+@pytest.mark.parametrize("factory_class", [
+    f.AdditionFactory,
+    QuadraticFactory,
+    SingleLinearFactory,
+    ExpressionFactory,
+])
+def test_bank_seed(tmp_path, factory_class):
+    first, second = (ExerciseBank(str(tmp_path / name), factory_class(), 3, seed=7) for name in ('first', 'second'))
+    for bank in (first, second):
+        bank.fill(100, chunk_size=30)
+
+    assert first.exercises(first.rows(slice(None))) == second.exercises(second.rows(slice(None)))
+    assert first.sample(20) == second.sample(20)
+
+
+@pytest.mark.parametrize("factory_class", [QuadraticFactory, SingleLinearFactory, ExpressionFactory])
+def test_bank_fill_keeps_factory_random(tmp_path, factory_class):
+    factory = factory_class(seed=1)
+    ExerciseBank(str(tmp_path), factory, 3, seed=7).fill(50)
+
+    assert factory.generate(level=3, amount=20) == factory_class(seed=1).generate(level=3, amount=20)
+
+
+def test_bank_interrupted_fill(tmp_path):
+    factory = f.SubtractionFactory()
+    bank = ExerciseBank(str(tmp_path), factory, 2)
+    bank.fill(10)
+    # Operands of another chunk were written, but its solutions were not
+    append_npy(f"{bank.path}/operands.npy", factory.generate_operands(level=2, amount=5))
+
+    reopened = ExerciseBank(str(tmp_path), factory, 2)
+    assert len(reopened) == 10
+    reopened.fill(5)
+    assert len(ExerciseBank(str(tmp_path), factory, 2)) == 15
+
+
+def test_bank_unsupported_factory(tmp_path):
+    from MathGenerator.algebra.polynomial import CubicFactory
+
+    with pytest.raises(TypeError):
+        ExerciseBank(str(tmp_path), CubicFactory(), 2)
@@ -0,0 +1,118 @@
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pylatex import Document
+
+from MathGenerator.algebra.linear import SingleLinearFactory
+from PDFGenerator import utils
+from PDFGenerator.builder import ArithmeticPDFBuilder, Director, LinearPDFBuilder, StreamingArithmeticPDFBuilder
+from PDFGenerator.cache import PlotCache
+
+
+@pytest.fixture
+def compiled(tmp_path, monkeypatch):
+    """pdflatex is replaced by writing the .tex as the PDF, along with the files it includes"""
+    documents = []
+
+    def generate_pdf(self, filepath, **kwargs):
+        self.generate_tex(filepath)
+        workspace = os.path.dirname(filepath)
+        documents.append((workspace, sorted(os.listdir(workspace))))
+        os.replace(f"{filepath}.tex", f"{filepath}.pdf")
+
+    monkeypatch.setattr(Document, 'generate_pdf', generate_pdf)
+    monkeypatch.setattr(utils.Plot, 'cache', PlotCache(str(tmp_path / 'plots')))
+    return documents
+
+
+def build(output: str, exercises: list) -> None:
+    director = Director()
+    director.builder = ArithmeticPDFBuilder()
+    director.build_exercises(title=output, exercises=exercises, filename="exercises", filepath=output)
+    director.build_exercises(title=output, exercises=exercises, filename="exercises", filepath=output)
+
+
+def test_documents_have_single_header(tmp_path, compiled):
+    build(str(tmp_path), ['1 + 2'])
+    with open(tmp_path / 'exercises.pdf') as file:
+        assert file.read().count(r'\fancyhead[L]') == 1
+
+
+def test_concurrent_builds_use_own_workspaces(tmp_path, compiled):
+    outputs = [str(tmp_path / f'job{job}') for job in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(build, outputs, [[f'{job} + {job}'] for job in range(8)]))
+
+    for job, output in enumerate(outputs):
+        with open(os.path.join(output, 'exercises.pdf')) as file:
+            assert f'{job} + {job}' in file.read()
+    workspaces = [workspace for workspace, _ in compiled]
+    assert len(set(workspaces)) == 16
+    assert not any(os.path.exists(workspace) for workspace in workspaces)
+
+
+def test_plots_are_linked_into_workspace(tmp_path, compiled):
+    factory = SingleLinearFactory(seed=0)
+    solutions = factory.solve(factory.generate(level=1, amount=3))
+    builder = LinearPDFBuilder()
+    builder.plot_workers = 0
+    director = Director()
+    director.builder = builder
+    director.build_solutions(title="Solutions", exercises=solutions, filename="solutions", filepath=str(tmp_path))
+
+    (workspace, files), = compiled
+    images = [os.path.basename(path) for path in utils.Plot.render_all('linear', [(s,) for s in solutions.values()])
+              if path is not None]
+    assert set(images) <= set(files) and 'solutions.tex' in files
+    with open(tmp_path / 'solutions.pdf') as file:
+        tex = file.read()
+    assert images and all(f"{workspace}/{image}" in tex for image in images)
+
+
+def test_streaming_builder_writes_pylatex_document():
+    builders = ArithmeticPDFBuilder(), StreamingArithmeticPDFBuilder()
+    for builder in builders:
+        builder.insert_title(title="Solutions")
+        builder.insert_exercise(numerator=1, exercise='1 + 2')
+        builder.insert_solution(numerator=2, exercise='10% + 5%', solution=0.15)
+    expected, path = builders[0].doc.dumps(), builders[1].finish_tex()
+    with open(path) as file:
+        streamed = file.read()
+    shutil.rmtree(builders[1].workspace)
+    # Labels of sections are not written, nothing refers to them
+    expected = re.sub(r"\\label\{.*\}%\n\n%\n", "", expected) + "\n"
+    preamble, body = streamed.split(r"\begin{document}")
+    expected_preamble, expected_body = expected.split(r"\begin{document}")
+    # Packages of pylatex documents are a set, so their order differs
+    assert body == expected_body and sorted(preamble.splitlines()) == sorted(expected_preamble.splitlines())
+
+
+def test_prepared_plots_survive_eviction(tmp_path, compiled):
+    factory = SingleLinearFactory(seed=1)
+    solutions = factory.solve(factory.generate(level=1, amount=3))
+    builder = LinearPDFBuilder()
+    builder.plot_workers = 0
+    builder.prepare_solutions(solutions)
+    # Another build evicts every image before the solutions are inserted
+    utils.Plot.cache.clear()
+    for numerator, (exercise, solution) in enumerate(solutions.items(), 1):
+        builder.insert_solution(numerator=numerator, exercise=exercise, solution=solution)
+    builder.generate("solutions", filepath=str(tmp_path))
+
+    assert os.path.exists(tmp_path / 'solutions.pdf')
+
+
+def test_streaming_builder_logs_pdflatex_output(monkeypatch, caplog):
+    def run(args, **kwargs):
+        raise subprocess.CalledProcessError(1, args, output="! Undefined control sequence.".encode())
+
+    monkeypatch.setattr(subprocess, 'run', run)
+    builder = StreamingArithmeticPDFBuilder()
+    builder.insert_exercise(numerator=1, exercise='1 + 2')
+    with pytest.raises(subprocess.CalledProcessError):
+        builder.generate("exercises")
+    assert "Undefined control sequence" in caplog.text
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from MathGenerator.algebra import parser
+from MathGenerator.algebra.linear import LinearSystemFactory, SingleLinearFactory
+from MathGenerator.algebra.polynomial import CubicFactory
+from MathGenerator.algebra.quadratic import QuadraticFactory
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.arithmetic.expressions import ExpressionFactory
+from MathGenerator.cache import CacheInfo, SolutionCache
+
+
+@pytest.mark.parametrize("factory, first, second", [
+    (f.AdditionFactory(), '2 + 3 + 4', '4 + 2 + 3'),
+    (f.MultiplicationFactory(), '7 * 8', '8 * 7'),
+    (f.PercentAdditionFactory(), '1.5% + 2.25%', '2.25% + 1.5%'),
+    (SingleLinearFactory(), '3 + 2x = 5', '2x + 3 = 5'),
+    (QuadraticFactory(), 'x^2 - 3x + 2 = 0', '2 + x^2 - 3x = 0'),
+    (CubicFactory(), 'x^3 - 1 = 0', '-1 + x^3 = 0'),
+    (ExpressionFactory(), '(2 * 3) + 4', '2*3 + 4'),
+])
+def test_canonical_form_equal(factory, first, second):
+    assert factory.canonical_form(first) == factory.canonical_form(second)
+
+
+@pytest.mark.parametrize("factory, first, second", [
+    (f.SubtractionFactory(), '5 - 3', '3 - 5'),
+    (f.DivisionFactory(), '8 / 2', '2 / 8'),
+    (f.PercentAdditionFactory(), '1.5% + 2%', '1.5% + 2.0%'),
+    (SingleLinearFactory(), '2x = 4', '2x < 4'),
+    (ExpressionFactory(), '8 - 4 - 2', '8 - (4 - 2)'),
+])
+def test_canonical_form_different(factory, first, second):
+    assert factory.canonical_form(first) != factory.canonical_form(second)
+
+
+def test_parser_canonical_form():
+    assert parser.canonical_form('3 + 2x = 5') == parser.canonical_form('2.0x+3 = 5.0') == '3.0,2.0 = 5.0'
+    assert parser.canonical_form('x^2 - 1') == '-1.0,0.0,1.0'
+
+
+@pytest.mark.parametrize("factory, level", [
+    (f.AdditionFactory(), 1),
+    (f.FractionDivisionFactory(), 1),
+    (SingleLinearFactory(seed=0), 1),
+    (QuadraticFactory(seed=0), 1),
+    (ExpressionFactory(seed=0), 1),
+])
+def test_cache_solve(factory, level):
+    cache = SolutionCache(factory)
+    exercises = factory.generate(level=level, amount=300)
+    exercises += factory.generate(level=level, amount=20, structured=True)
+
+    assert cache.solve(exercises) == factory.solve(exercises)
+    info = cache.cache_info()
+    assert info.hits + info.misses == len(exercises)
+    # Small levels have tiny value spaces, so exercises repeat
+    assert info.misses == info.size < len(exercises)
+
+    assert cache.solve(exercises) == factory.solve(exercises)
+    assert cache.cache_info() == CacheInfo(info.hits + len(exercises), 0, info.misses, info.size)
+
+
+def test_cache_lru():
+    cache = SolutionCache(f.AdditionFactory(), maxsize=2)
+    cache.solve(['1 + 1', '1 + 2', '1 + 3'])
+    cache.solve(['1 + 2'])
+
+    assert cache.cache_info() == CacheInfo(hits=1, disk_hits=0, misses=3, size=2)
+    cache.solve(['1 + 1'])
+    assert cache.cache_info().misses == 4
+
+
+def test_cache_disk(tmp_path):
+    path = str(tmp_path / "solutions.db")
+    exercises = ['x^2 - 3x + 2 = 0', 'x^2 + 1 < 0']
+    with SolutionCache(QuadraticFactory(), path=path) as cache:
+        expected = cache.solve(exercises)
+
+    with SolutionCache(QuadraticFactory(), path=path) as cache:
+        assert cache.solve(['2 - 3x + x^2 = 0', 'x^2 + 1 < 0']) == {
+            '2 - 3x + x^2 = 0': expected['x^2 - 3x + 2 = 0'],
+            'x^2 + 1 < 0': expected['x^2 + 1 < 0'],
+        }
+        assert cache.cache_info() == CacheInfo(hits=0, disk_hits=2, misses=0, size=2)
+
+    # Keys include the factory, so another one does not reuse the solutions
+    with SolutionCache(CubicFactory(), path=path) as cache:
+        cache.solve(['x^3 - 1 = 0'])
+        assert cache.cache_info().disk_hits == 0
+
+
+@pytest.mark.parametrize("factory", [
+    f.RemainderDivisionFactory(),
+    f.FractionDivisionFactory(),
+    LinearSystemFactory(seed=0),
+    QuadraticFactory(seed=0),
+    CubicFactory(seed=0),
+])
+def test_cache_disk_solutions(tmp_path, factory):
+    path = str(tmp_path / "solutions.db")
+    exercises = factory.generate(level=2, amount=50)
+    with SolutionCache(factory, path=path) as cache:
+        expected = cache.solve(exercises)
+    with SolutionCache(factory, path=path) as cache:
+        assert cache.solve(exercises) == expected
+        assert cache.cache_info().misses == 0
+
+
+def test_cache_invalid_exercise():
+    cache = SolutionCache(QuadraticFactory())
+    assert cache.solve(['x^3 = 0']) == QuadraticFactory().solve(['x^3 = 0'])
+
+
+def test_cache_factory_attributes():
+    cache = SolutionCache(f.AdditionFactory())
+    exercises = cache.generate(level=1, amount=50, structured=True)
+    chunks = list(cache.iter_solve(exercises, chunk_size=20))
+
+    assert len(chunks) == 3
+    assert all(chunk[exercise] == sum(exercise.operands) for chunk in chunks for exercise in chunk)
+    assert sum(cache.cache_info()[:3]) == 50
+
+
+def test_cache_threads():
+    factory = SingleLinearFactory(seed=3)
+    exercises = factory.generate(level=1, amount=400)
+    cache = SolutionCache(factory)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(cache.solve, [exercises[i::8] for i in range(8)]))
+
+    expected = factory.solve(exercises)
+    assert all(solution == expected[exercise] for chunk in results for exercise, solution in chunk.items())
+    assert sum(cache.cache_info()[:3]) == len(exercises)
@@ -0,0 +1,32 @@
+import sys
+
+import pytest
+
+import cli
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.cache import SolutionCache
+
+
+@pytest.mark.parametrize("factory", [f.AdditionFactory(), SolutionCache(f.AdditionFactory())])
+def test_stream_writes_every_exercise(tmp_path, factory):
+    output = str(tmp_path / 'exercises.txt')
+    # Level 1 has only 81 exercises, so chunks repeat some of them
+    cli.stream(factory=factory, level=1, amount=250, output=output, chunk_size=100)
+
+    with open(output) as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 250
+    for number, line in enumerate(lines, 1):
+        numerator, exercise, solution = line.replace('. ', ' -> ', 1).split(' -> ')
+        assert int(numerator) == number
+        assert int(solution) == sum(int(operand) for operand in exercise.split(' + '))
+
+
+def test_main_output(tmp_path, monkeypatch):
+    output = tmp_path / 'exercises.txt'
+    monkeypatch.setattr(sys, 'argv', ['cli.py', '-operation', 'subtraction', '-level', '2', '-amount', '25',
+                                      '-chunk', '10', '-output', str(output), '-history', str(tmp_path / 'history.db')])
+    cli.main()
+
+    lines = output.read_text().splitlines()
+    assert len(lines) == 25 and lines[-1].startswith('25. ')
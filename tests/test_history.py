@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from MathGenerator.algebra.quadratic import QuadraticFactory
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.history import ExerciseHistory, BloomIndex, exercise_keys
+
+
+@pytest.fixture(params=[False, True], ids=['sqlite', 'bloom'])
+def history_path(request, tmp_path):
+    return str(tmp_path / 'history'), request.param
+
+
+def test_exercise_keys():
+    keys = exercise_keys(['2 + 3', '3 + 2', '2 + 3'])
+
+    assert keys.dtype == np.uint64
+    assert keys[0] == keys[2] != keys[1]
+    # Keys do not depend on the session, unlike the built-in hash of strings
+    assert int(keys[0]) == int(exercise_keys(['2 + 3'])[0])
+
+
+def test_history_no_repeats(history_path):
+    path, bloom = history_path
+    factory = f.SubtractionFactory()
+    handed_out = set()
+    for _ in range(4):
+        with ExerciseHistory(path, bloom=bloom, capacity=1000) as history:
+            exercises = factory.generate_unique(level=1, amount=15, index=history.index(factory, 1, 'class-4b'))
+        assert not handed_out & set(exercises)
+        handed_out.update(exercises)
+
+    with ExerciseHistory(path, bloom=bloom) as history:
+        assert len(history.index(factory, 1, 'class-4b')) == 60
+        # Other students and levels have their own history
+        assert len(history.index(factory, 1, 'class-4c')) == 0
+        assert len(history.index(factory, 2, 'class-4b')) == 0
+        with pytest.raises(ValueError, match="only 81 distinct exercises"):
+            factory.generate_unique(level=1, amount=22, index=history.index(factory, 1, 'class-4b'))
+
+
+def test_history_canonical_forms(history_path):
+    path, bloom = history_path
+    factory = f.AdditionFactory()
+    with ExerciseHistory(path, bloom=bloom) as history:
+        index = history.index(factory, 1)
+        assert list(index.add(['2 + 3', '3 + 2', '4 + 5'])) == [True, False, True]
+        assert not index.add(['5 + 4']).any()
+        assert len(set(map(factory.canonical_form, factory.generate_unique(level=1, amount=20, index=index)))) == 20
+        assert len(index) == 22
+
+        # Level 1 has 81 sums of numbers from 2 to 10, but only 45 of them differ in more than the order of terms
+        index.add([f"{a} + {b}" for a in range(2, 11) for b in range(2, 11)])
+        assert len(index) == 45
+        with pytest.raises(ValueError, match="No new exercise"):
+            factory.generate_unique(level=1, amount=1, index=index)
+
+
+def test_history_pending_until_commit(history_path):
+    path, bloom = history_path
+    factory = f.AdditionFactory()
+    with pytest.raises(RuntimeError):
+        with ExerciseHistory(path, bloom=bloom) as history:
+            factory.generate_unique(level=2, amount=10, index=history.index(factory, 2))
+            raise RuntimeError("Building PDFs failed")
+
+    history = ExerciseHistory(path, bloom=bloom)
+    index = history.index(factory, 2)
+    assert len(index) == 0
+    index.add(['2 + 3'])
+    history.close()
+    with ExerciseHistory(path, bloom=bloom) as history:
+        index = history.index(factory, 2)
+        assert len(index) == 0
+        index.add(['2 + 3'])
+        history.commit()
+        assert len(index) == 1 and not index.add(['3 + 2']).any()
+    with ExerciseHistory(path, bloom=bloom) as history:
+        assert len(history.index(factory, 2)) == 1
+
+
+def test_history_iter_generate(history_path):
+    path, bloom = history_path
+    factory = QuadraticFactory(seed=3)
+    with ExerciseHistory(path, bloom=bloom) as history:
+        index = history.index(factory, 2, 'student')
+        first = [exercise for chunk in factory.iter_generate(level=2, chunk_size=7, amount=30, index=index)
+                 for exercise in chunk]
+        second = factory.generate_unique(level=2, amount=30, index=index)
+
+    assert len(set(first + second)) == 60
+    assert len(index) == 60
+
+
+def test_bloom_size(tmp_path):
+    index = BloomIndex(str(tmp_path / 'filter.bloom'), capacity=10 ** 5, error_rate=0.01)
+
+    # About 9.6 bits and 7 hashes per exercise for 1% of false positives
+    assert index.hashes == 7
+    assert index.size == pytest.approx(9.59 * 10 ** 5, rel=0.01)
+    exercises = [f"{number} + 1" for number in range(10 ** 5)]
+    assert index.add(exercises).all()
+    assert not index.add(exercises).any()
+    assert index.add([f"{number} + 2" for number in range(10 ** 4)]).mean() > 0.97
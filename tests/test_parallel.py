@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.parallel import generate_parallel
+from MathGenerator.algebra.linear import LinearSystemFactory, SingleLinearFactory
+from MathGenerator.algebra.polynomial import CubicFactory
+from MathGenerator.algebra.quadratic import QuadraticFactory
+
+
+@pytest.mark.parametrize("factory_class, level", [
+    (f.AdditionFactory, 5),
+    (f.DivisionFactory, 3),
+    (f.RemainderDivisionFactory, 4),
+    (f.FractionMultiplicationFactory, 3),
+    (f.PercentSubtractionFactory, 2),
+])
+def test_generate_parallel(factory_class, level):
+    operands, solutions = generate_parallel(factory_class, level=level, amount=250, seed=7, workers=2, shard_size=64)
+    factory = factory_class()
+
+    assert operands.shape[0] == solutions.shape[0] == 250
+    assert (solutions == factory.solve_batch(operands)).all()
+    # Every shard draws different exercises
+    assert len(set(factory.format_exercises(operands))) > 1
+
+
+def test_generate_parallel_deterministic():
+    kwargs = dict(level=4, amount=300, seed=2024, shard_size=50)
+    single = generate_parallel(f.MultiplicationFactory, workers=1, **kwargs)
+    multiple = generate_parallel(f.MultiplicationFactory, workers=3, **kwargs)
+    other_seed = generate_parallel(f.MultiplicationFactory, workers=3, **{**kwargs, 'seed': 2025})
+
+    assert all((a == b).all() for a, b in zip(single, multiple))
+    assert not (single[0] == other_seed[0]).all()
+
+
+@pytest.mark.parametrize("factory_class, level", [(SingleLinearFactory, 3), (QuadraticFactory, 6)])
+def test_generate_parallel_records(factory_class, level):
+    # Factories without batch mode generate records with factories seeded from the shards
+    kwargs = dict(level=level, amount=150, seed=11, shard_size=40)
+    operands, solutions = generate_parallel(factory_class, workers=2, **kwargs)
+    single = generate_parallel(factory_class, workers=1, **kwargs)
+
+    assert operands.shape == solutions.shape == (150,)
+    expected = factory_class().solve_batch(operands['coefficients'], operands['relation'])
+    # Solutions hold NaN for missing roots, so they are compared bit by bit
+    assert solutions.tobytes() == expected.tobytes()
+    assert (operands == single[0]).all() and len(np.unique(operands['coefficients'], axis=0)) > 1
+
+
+@pytest.mark.parametrize("factory_class", [LinearSystemFactory, CubicFactory])
+def test_generate_parallel_unsupported(factory_class):
+    with pytest.raises(TypeError):
+        generate_parallel(factory_class, level=1, amount=10)
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from MathGenerator.algebra.quadratic import QuadraticExercise
+from PDFGenerator import utils
+from PDFGenerator.cache import CacheInfo, PlotCache
+
+
+def write(cache: PlotCache, key: str, size: int) -> None:
+    with open(cache.path(key), 'wb') as file:
+        file.write(b'\0' * size)
+
+
+@pytest.fixture
+def plot_cache(tmp_path, monkeypatch):
+    cache = PlotCache(str(tmp_path / 'plots'))
+    monkeypatch.setattr(utils.Plot, 'cache', cache)
+    return cache
+
+
+def test_key_follows_inputs():
+    assert PlotCache.key(('LinearFigure', 2.0, '<=', True)) == PlotCache.key(('LinearFigure', 2.0, '<=', True))
+    assert PlotCache.key(('LinearFigure', 2.0, '<=', True)) != PlotCache.key(('LinearFigure', 2.0, '<', False))
+
+
+def test_lookup_counts_repeats_as_hits(tmp_path):
+    cache = PlotCache(str(tmp_path))
+    write(cache, 'a', 10)
+    assert cache.lookup(['a', 'b', 'b']) == [True, False, False]
+    assert cache.cache_info() == CacheInfo(hits=2, misses=1, evictions=0, size=1, bytes=10)
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    cache = PlotCache(str(tmp_path), max_bytes=25)
+    for key in 'abc':
+        cache.lookup([key])
+        write(cache, key, 10)
+        cache.store([key])
+    assert not os.path.exists(cache.path('a'))
+    assert cache.lookup(['b', 'c']) == [True, True]
+
+    # Hit makes b the most recently used, so c goes next
+    cache.lookup(['b'])
+    write(cache, 'd', 10)
+    cache.store(['d'])
+    assert [os.path.exists(cache.path(key)) for key in 'bcd'] == [True, False, True]
+    assert cache.cache_info().evictions == 2
+
+
+def test_images_of_stored_keys_are_kept(tmp_path):
+    cache = PlotCache(str(tmp_path), max_bytes=5)
+    write(cache, 'a', 10)
+    write(cache, 'b', 10)
+    cache.store(['a', 'b'])
+    assert cache.lookup(['a', 'b']) == [True, True]
+
+
+def test_cache_shared_between_instances(tmp_path):
+    first, second = PlotCache(str(tmp_path)), PlotCache(str(tmp_path))
+    first.lookup(['a'])
+    write(first, 'a', 10)
+    first.store(['a'])
+    assert second.lookup(['a']) == [True]
+    second.clear()
+    assert first.lookup(['a']) == [False]
+
+
+def test_eviction_counts_images_of_other_processes(tmp_path):
+    first, second = PlotCache(str(tmp_path), max_bytes=25), PlotCache(str(tmp_path), max_bytes=25)
+    first.lookup(['a'])
+    write(first, 'a', 10)
+    first.store(['a'])
+    # Images stored by another process after the index of first was read
+    for key in 'bc':
+        write(second, key, 10)
+        second.store([key])
+    write(first, 'd', 10)
+    first.store(['d'])
+
+    assert sum(os.path.getsize(first.path(key)) for key in 'abcd' if os.path.exists(first.path(key))) <= 25
+
+
+def test_render_all_reuses_plots(plot_cache):
+    exercise = QuadraticExercise(1, 0, -4.0, '>=')
+    solution = {'roots': (2.0, -2.0), 'parabola_direction': 'up', 'delta': 16}
+    paths = utils.Plot.render_all('quadratic', [(exercise, solution), ('x^2 - 4 >= 0', solution)], workers=0)
+    assert paths[0] == paths[1] and os.path.exists(paths[0])
+    assert utils.Plot.quadratic(exercise, solution) == paths[0]
+    assert utils.Plot.linear('identity all x') is None
+    assert plot_cache.cache_info() == CacheInfo(hits=2, misses=1, evictions=0, size=1,
+                                                bytes=os.path.getsize(paths[0]))
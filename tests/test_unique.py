@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from MathGenerator.algebra.quadratic import QuadraticFactory
+from MathGenerator.arithmetic import factories as f
+from MathGenerator.unique import HashIndex, BitsetIndex, create_index
+
+
+@pytest.mark.parametrize("index", [
+    HashIndex(),
+    BitsetIndex(100, lambda exercises: np.array([int(exercise) for exercise in exercises])),
+])
+def test_index_add(index):
+    assert list(index.add(['3', '5', '3', '99'])) == [True, True, False, True]
+    assert list(index.add(['5', '7', '8', '7', '0'], limit=2)) == [False, True, True, False, False]
+    assert list(index.add([])) == []
+    assert len(index) == 5
+
+
+def test_create_index():
+    codes = lambda exercises: np.zeros(len(exercises), dtype=int)
+
+    assert isinstance(create_index(1000, 10 ** 4, codes), BitsetIndex)
+    assert isinstance(create_index(10, 10 ** 9, codes), HashIndex)
+    assert isinstance(create_index(1000), HashIndex)
+
+
+def test_generate_unique_large_space():
+    factory = f.AdditionFactory()
+    exercises = factory.generate_unique(level=6, amount=2000)
+
+    assert len(set(exercises)) == 2000
+    assert isinstance(factory.unique_index(level=6, amount=2000), HashIndex)
+
+
+def test_generate_unique_unknown_capacity():
+    factory = QuadraticFactory(seed=1)
+
+    assert factory.capacity(1) is None
+    assert len(set(factory.generate_unique(level=1, amount=100))) == 100
+    # Level 1 is exhausted long before, so generation stops instead of looping forever
+    with pytest.raises(ValueError, match="No new exercise"):
+        factory.generate_unique(level=1, amount=10 ** 6)